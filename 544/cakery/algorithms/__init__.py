@@ -1,22 +1,34 @@
-from cakery.algorithms.austin_moving_knife import AustinMovingKnife
-from cakery.algorithms.banach_knaster import BanachKnaster
-from cakery.algorithms.inverse_banach_knaster import InverseBanachKnaster
-from cakery.algorithms.divide_and_choose import DivideAndChoose
-from cakery.algorithms.dubins_spanier import DubinsSpanier
-from cakery.algorithms.inverse_dubins_spanier import InverseDubinsSpanier
-from cakery.algorithms.sealed_bids_auction import SealedBidsAuction
-from cakery.algorithms.inverse_divide_and_choose import InverseDivideAndChoose
-from cakery.algorithms.lone_chooser import LoneChooser
-from cakery.algorithms.inverse_lone_chooser import InverseLoneChooser
-from cakery.algorithms.alternation import AlternatingChoice
-from cakery.algorithms.inverse_alternation import InverseAlternatingChoice
-from cakery.algorithms.balanced_alternation import BalancedAlternatingChoice
-from cakery.algorithms.inverse_balanced_alternation import InverseBalancedAlternatingChoice
-from cakery.algorithms.knaster_sealed_bids import KnasterSealedBids
-from cakery.algorithms.adjusted_winner import AdjustedWinner
-from cakery.algorithms.one_cut_suffices import OneCutSuffices
-from cakery.algorithms.guy_conway_selfridge import GuyConwaySelfridge
-from cakery.algorithms.inverse_guy_conway_selfridge import InverseGuyConwaySelfridge
-from cakery.algorithms.lens_epstein_points import LensEpsteinPoints
-from cakery.algorithms.salter_points import SalterPoints
-from cakery.algorithms.taylor_rst import TaylorRst
+'''
+The algorithms are imported lazily: each algorithm module is
+only imported when the algorithm is first accessed as an
+attribute of this package (see `cakery.algorithms.registry`).
+'''
+import sys
+from types import ModuleType
+from cakery.algorithms.registry import registry
+from cakery.algorithms.registry import get_algorithm, get_capabilities
+from cakery.algorithms.registry import find_algorithms, select_algorithm
+
+
+class _LazyModule(ModuleType):
+    ''' A package that imports its algorithms on access '''
+
+    def __getattr__(self, name):
+        if name not in registry:
+            raise AttributeError("module %s has no attribute %s" % (self.__name__, name))
+        factory = get_algorithm(name)
+        setattr(self, name, factory)
+        return factory
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(registry))
+
+
+__all__ = sorted(registry) + [
+    "get_algorithm", "get_capabilities", "find_algorithms", "select_algorithm",
+]
+
+_module = _LazyModule(__name__, __doc__)
+_module.__dict__.update(sys.modules[__name__].__dict__)
+_module._original = sys.modules[__name__]   # keep the module globals alive
+sys.modules[__name__] = _module
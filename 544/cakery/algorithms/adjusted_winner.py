@@ -18,6 +18,16 @@ class AdjustedWinner(FairDivider):
     7. Propose an object to exchange to make values equal
     '''
 
+    capabilities = {
+        'users':        2,
+        'envy-free':    True,
+        'proportional': True,
+        'equitable':    True,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake, strategy=None):
         ''' Initializes a new instance of the algorithm
 
@@ -29,21 +39,6 @@ class AdjustedWinner(FairDivider):
         self.cake  = cake
         self.strategy = strategy or AlternationStrategy.balanced
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        2,
-            'envy-free':    True,
-            'proportional': True,
-            'equitable':    True,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division. This algorithm also returns a dictionary of
@@ -61,33 +56,37 @@ class AdjustedWinner(FairDivider):
         '''
         slices  = defaultdict(list)                     # we will return N pieces per cutter
         pieces  = self.cake.as_collection()             # flatten the collection into choices
+        matrix  = ValuationMatrix(self.users, pieces)   # value every piece once for each user
+        engine  = PickEngine(matrix, pieces)            # keep each user's heap of the pieces
         cutters = self.strategy(self.users, pieces)     # create our alternation strategy
         contest = []                                    # initialize the contested pieces
 
-        while any(pieces):                              # distribute the un-contested pieces
-            choices = list_best_pieces(self.users, pieces)   # find each user's best piece
+        while engine:                                   # distribute the un-contested pieces
+            choices = dict((u, engine.peek(u)) for u in self.users) # find each user's best piece
             settled = all_unique(choices.values())      # are any choices the same
             for cutter, piece in choices.items():       # if not assign, else put in contested
                 if settled: slices[cutter].append(piece)
-                elif piece not in pieces: continue      # this piece has already been contested
+                elif piece not in engine: continue      # this piece has already been contested
                 else: contest.append(piece)             # both users want this piece
-                pieces.remove(piece)                    # remove these from the choosing
+                engine.remove(piece)                    # remove these from the choosing
 
-        while any(contest):                             # distribute the contested pieces
+        engine = PickEngine(matrix, contest)            # keep each user's heap of the contest
+        while engine:                                   # distribute the contested pieces
             for cutter in cutters():                    # change users based on our strategy
-                piece = choose_best_piece(cutter, contest)
+                piece = engine.pick(cutter)
                 slices[cutter].append(piece)            # give that user their next best piece
-                if not any(contest): break              # exit early in case of odd pieces
+                if not engine: break                    # exit early in case of odd pieces
                                                         # find a piece to resolve envy with
-        totals = {u: get_total_value(u, cs) for u, cs in slices.items()} # see what everyone got
+        totals = {u: get_total_value(u, cs, matrix) for u, cs in slices.items()} # see what everyone got
         loser  = min((v, u) for u, v in totals.items())[1] # find the loser of the bidding
         winner = max((v, u) for u, v in totals.items())[1] # find the winner of the bidding
-        shared = min((winner.value_of(v) / loser.value_of(v), v) for v in slices[winner])[1]
-        rate = (totals[winner] - totals[loser]) / (loser.value_of(shared) + winner.value_of(shared))
+        value  = matrix.value_of                        # read the values from the matrix
+        shared = min((value(winner, v) / value(loser, v), v) for v in slices[winner])[1]
+        rate = (totals[winner] - totals[loser]) / (value(loser, shared) + value(winner, shared))
 
         return slices, {
             'shared_item': shared,  # the contested item that should be shared
             'shared_rate': rate,    # the rate at which the item should be shared
-            'winner(%s)' % winner : rate * -winner.value_of(shared), # how much the winner loses of shared
-            'loser(%s)'  % loser  : rate * loser.value_of(shared),   # how much the loser gets of shared
+            'winner(%s)' % winner : rate * -value(winner, shared), # how much the winner loses of shared
+            'loser(%s)'  % loser  : rate * value(loser, shared),     # how much the loser gets of shared
         }
@@ -7,6 +7,16 @@ class AustinMovingKnife(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        2,
+        'envy-free':    True,
+        'proportional': True,
+        'equitable':    True,
+        'optimal':      True,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake, value=F(1, 2), shift=None):
         ''' Initializes a new instance of the algorithm
 
@@ -23,21 +33,6 @@ class AustinMovingKnife(FairDivider):
         if value <= 0:
             raise ValueError("cannot split resource to less than 0 value")
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        2,
-            'envy-free':    True,
-            'proportional': True,
-            'equitable':    True,
-            'optimal':      True,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
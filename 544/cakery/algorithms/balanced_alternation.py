@@ -17,6 +17,16 @@ class BalancedAlternatingChoice(FairDivider):
     6. Now run the simple alternation choice on the contested pile
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake, strategy=None):
         ''' Initializes a new instance of the algorithm
 
@@ -28,21 +38,6 @@ class BalancedAlternatingChoice(FairDivider):
         self.cake  = cake
         self.strategy = strategy or AlternationStrategy.balanced
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': False,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
@@ -51,21 +46,24 @@ class BalancedAlternatingChoice(FairDivider):
         '''
         slices  = defaultdict(list)                     # we will return N pieces per cutter
         pieces  = self.cake.as_collection()             # flatten the collection into choices
+        matrix  = ValuationMatrix(self.users, pieces)   # value every piece once for each user
+        engine  = PickEngine(matrix, pieces)            # keep each user's heap of the pieces
         cutters = self.strategy(self.users, pieces)     # create our alternation strategy
         contest = []                                    # initialize the contested pieces
 
-        while any(pieces):                              # distribute the un-contested pieces
-            choices = list_best_pieces(self.users, pieces)   # find each user's best piece
+        while engine:                                   # distribute the un-contested pieces
+            choices = dict((u, engine.peek(u)) for u in self.users) # find each user's best piece
             settled = all_unique(choices.values())      # are any choices the same
             for cutter, piece in choices.items():       # check all the chosen items
                 if settled: slices[cutter].append(piece)# if not contested, give each user that piece
-                elif piece not in pieces: continue      # this piece has already been contested
+                elif piece not in engine: continue      # this piece has already been contested
                 else: contest.append(piece)             # both users want this piece
-                pieces.remove(piece)                    # remove these from the choosing
+                engine.remove(piece)                    # remove these from the choosing
 
-        while any(contest):                             # distribute the contested pieces
+        engine = PickEngine(matrix, contest)            # keep each user's heap of the contest
+        while engine:                                   # distribute the contested pieces
             for cutter in cutters():                    # change users based on our strategy
-                piece = choose_best_piece(cutter, contest)
+                piece = engine.pick(cutter)
                 slices[cutter].append(piece)            # give that user their next best piece
-                if not any(contest): break              # exit early in case of odd pieces
+                if not engine: break                    # exit early in case of odd pieces
         return slices
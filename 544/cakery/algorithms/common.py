@@ -1,13 +1,157 @@
-from cakery.utilities import all_same
+import numpy as np
+from cakery.numeric import get_backend
 from cakery.algorithms.utilities import get_total_value
 
 
+# ------------------------------------------------------------
+# reports
+# ------------------------------------------------------------
+class DivisionReport(object):
+    ''' A summary of the fairness of a proposed division. The
+    value that every user places on every share is computed
+    once into a users x shares matrix (row i is the view of
+    user i, column j is the share of user j) and each of the
+    fairness properties is then read from that matrix.
+
+    .. attribute:: values
+
+       The users x shares matrix of values
+
+    .. attribute:: tolerance
+
+       The amount two values may differ by and still be equal
+    '''
+
+    def __init__(self, slices, fair=None, tolerance=0):
+        ''' Initializes a new instance of the report
+
+        :param slices: The proposed division of {user: share}
+        :param fair: The fair share value (defaults to 1/n of each user's total)
+        :param tolerance: The tolerance used for the comparisons
+        '''
+        self.users  = list(slices.keys())
+        self.shares = [slices[user] for user in self.users]
+        self.tolerance = tolerance
+        self.values = np.array([[get_total_value(user, share) for share in self.shares]
+            for user in self.users])
+        self.values = self.values.reshape(len(self.users), len(self.shares))
+        self.owned  = self.values.diagonal()
+        if fair is None:
+            fair = self.values.sum(axis=1) / len(self.users)
+        self.fair = fair
+
+    def value_of(self, user):
+        ''' Return the value a user places on their own share
+
+        :param user: The user to get the share value for
+        :returns: The value of the user's share to that user
+        '''
+        return self.owned[self.users.index(user)]
+
+    @property
+    def envy(self):
+        ''' The most that each user envies another share
+
+        :returns: The list of envy per user (0 for none)
+        '''
+        if not self.users: return []
+        return [max(e, 0) for e in self.values.max(axis=1) - self.owned]
+
+    @property
+    def max_envy(self):
+        ''' The most that any user envies another share
+
+        :returns: The largest amount of envy in the division
+        '''
+        return max(self.envy or [0])
+
+    @property
+    def utilitarian_welfare(self):
+        ''' The total value each user places on their own share
+
+        :returns: The sum of the owned share values
+        '''
+        return sum(self.owned)
+
+    @property
+    def egalitarian_welfare(self):
+        ''' The value of the least valued owned share
+
+        :returns: The minimum of the owned share values
+        '''
+        return min(self.owned) if self.users else 0
+
+    @property
+    def is_proportional(self):
+        ''' Test that every user values every share at
+        no less than their fair share.
+
+        :returns: True if proportional, False otherwise
+        '''
+        fair = np.reshape(self.fair, (-1, 1)) if np.ndim(self.fair) else self.fair
+        return bool(np.all(self.values >= fair - self.tolerance))
+
+    @property
+    def is_equitable(self):
+        ''' Test that every user values every share the
+        same as their own share.
+
+        :returns: True if equitable, False otherwise
+        '''
+        owned = self.owned.reshape(-1, 1)
+        return bool(np.all(abs(self.values - owned) <= self.tolerance))
+
+    @property
+    def is_envy_free(self):
+        ''' Test that no user values another share more
+        than their own share.
+
+        :returns: True if envy-free, False otherwise
+        '''
+        return bool(self.max_envy <= self.tolerance)
+
+    def summary(self):
+        ''' Return a dictionary summary of the report
+
+        :returns: A dictionary of the fairness properties
+        '''
+        return {
+            'proportional':        self.is_proportional,
+            'equitable':           self.is_equitable,
+            'envy-free':           self.is_envy_free,
+            'max envy':            self.max_envy,
+            'utilitarian welfare': self.utilitarian_welfare,
+            'egalitarian welfare': self.egalitarian_welfare,
+        }
+
+
 # ------------------------------------------------------------
 # interfaces
 # ------------------------------------------------------------
 class FairDivider(object):
     ''' Base class of all fair division algorithms
+
+    .. attribute:: numeric
+
+       The numeric backend (see :mod:`cakery.numeric`) whose
+       tolerance is used by the validation checks. If this is
+       not set, the globally active backend is used.
+
+    .. attribute:: capabilities
+
+       The dictionary of the algorithm features, which every
+       algorithm defines on its class (so that the features can
+       be read without creating the algorithm).
     '''
+    numeric = None
+    capabilities = None
+
+    def get_numeric(self):
+        ''' Retrieve the numeric backend used by this divider
+
+        :returns: The numeric backend to compare values with
+        '''
+        return self.numeric or get_backend()
 
     def is_valid(self):
         ''' Test that the parameters are valid for
@@ -22,22 +166,34 @@ class FairDivider(object):
         if settings['users'] != 'n':
             if len(self.users) != settings['users']:
                 raise ValueError("algorithm only works for % users" % settings['users'])
-        if not all_same(u.value_of(self.cake) for u in self.users):
+        numeric = self.get_numeric()
+        values  = [u.value_of(self.cake) for u in self.users]
+        if not numeric.is_close(min(values), max(values)):
             raise ValueError("users don't all see unit value on the resource")
         return True
 
+    def report(self, slices, tolerance=None):
+        ''' Create a report of the fairness of the proposed
+        division. The values are computed once, so this should
+        be preferred to the individual checks when more than
+        one property is needed.
+
+        :param slices: The proposed division of the resource
+        :param tolerance: The tolerance to compare with (defaults to the backend epsilon)
+        :returns: The DivisionReport for the division
+        '''
+        if tolerance is None:
+            tolerance = self.get_numeric().epsilon
+        fair = self.users[0].value_of(self.cake) / len(self.users)
+        return DivisionReport(slices, fair, tolerance)
+
     def is_proportional(self, slices):
         ''' Test that the proposed division is proportional
 
         :param slices: The proposed division of the resource
         :returns: True if proportional, False otherwise
         '''
-        share  = slices.keys()[0].value_of(self.cake) / len(self.users)
-        pieces = slices.values()
-        for user, _ in slices.items():
-            if not all(get_total_value(user, p) >= share for p in pieces):
-                return False
-        return True
+        return self.report(slices).is_proportional
 
     def is_equitable(self, slices):
         ''' Test that the proposed division is equitable
@@ -45,12 +201,7 @@ class FairDivider(object):
         :param slices: The proposed division of the resource
         :returns: True if equitable, False otherwise
         '''
-        pieces = slices.values()
-        for user, piece in slices.items():
-            value = get_total_value(user, piece)
-            if not all(get_total_value(user, p) == value for p in pieces):
-                return False
-        return True
+        return self.report(slices).is_equitable
 
     def is_envy_free(self, slices):
         ''' Test that the proposed division is envy-free
@@ -58,12 +209,7 @@ class FairDivider(object):
         :param slices: The proposed division of the resource
         :returns: True if envy-free, False otherwise
         '''
-        pieces = slices.values()
-        for user, piece in slices.items():
-            envied = max(get_total_value(user, p) for p in pieces)
-            if envied > get_total_value(user, piece):
-                return False
-        return True
+        return self.report(slices).is_envy_free
 
     def is_optimal(self, slices):
         ''' Test that the proposed division is optimal
@@ -78,7 +224,9 @@ class FairDivider(object):
 
         :returns: A dictionary of the algorithm features
         '''
-        raise NotImplementedError("settings")
+        if self.capabilities is None:
+            raise NotImplementedError("settings")
+        return dict(self.capabilities)
 
     def divide(self):
         ''' Run the algorithm to perform a suggested
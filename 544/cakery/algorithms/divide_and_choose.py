@@ -13,6 +13,16 @@ class DivideAndChoose(FairDivider):
     5. The cutter gets the remaining piece
     '''
 
+    capabilities = {
+        'users':        2,
+        'envy-free':    True,
+        'proportional': True,
+        'equitable':    True,
+        'optimal':      True,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake):
         ''' Initializes a new instance of the algorithm
 
@@ -22,21 +32,6 @@ class DivideAndChoose(FairDivider):
         self.users = users[:2]
         self.cake  = cake
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        2,
-            'envy-free':    True,
-            'proportional': True,
-            'equitable':    True,
-            'optimal':      True,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
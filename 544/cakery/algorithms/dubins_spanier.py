@@ -1,4 +1,5 @@
-from fractions import Fraction as F
+from cakery.numeric import get_backend
+from cakery.resource import ContinuousResource, IntervalResource
 from cakery.algorithms.utilities import *
 from cakery.algorithms.common import FairDivider
 
@@ -7,6 +8,16 @@ class DubinsSpanier(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake, value=None):
         ''' Initializes a new instance of the algorithm
 
@@ -16,22 +27,7 @@ class DubinsSpanier(FairDivider):
         '''
         self.users = users
         self.cake = cake
-        self.value = value or F(1, len(users))
-
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    True,
-            'proportional': True,
-            'equitable':    True,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
+        self.value = value or get_backend().fraction(1, len(users))
 
     def divide(self):
         ''' Run the algorithm to perform a suggested
@@ -42,6 +38,14 @@ class DubinsSpanier(FairDivider):
         slices = {}
         users  = randomize_items(self.users)
         cake   = self.cake.clone()
+        if isinstance(cake, (ContinuousResource, IntervalResource)):
+            knife = MovingKnife(users, cake, self.value)
+            while len(knife.users) > 1:     # single user shouldn't divide
+                (cutter, piece) = knife.next()
+                slices[cutter]  = piece     # user that said stop gets the piece
+            slices[knife.users.pop()] = cake
+            return slices
+
         while len(users) > 1:               # single user shouldn't divide
             (cutter, piece) = choose_next_piece(users, cake, self.value)
             slices[cutter]  = piece         # user that said stop gets the piece
@@ -0,0 +1,150 @@
+import numpy as np
+from collections import defaultdict
+from cakery.algorithms.utilities import *
+from cakery.algorithms.common import FairDivider
+
+
+class EnvyCycleElimination(FairDivider):
+    ''' This is an implementation of the envy cycle elimination
+    algorithm of Lipton et al, which divides indivisible items
+    so that the division is envy-free up to one item (EF1): no
+    user envies another bundle once their favorite item in it
+    is removed. It works as follows:
+
+    1. Each item is given to a user that nobody envies
+    2. If everybody is envied, the envy graph has a cycle
+    3. Each user on the cycle takes the bundle they envy
+    4. Repeat at 1 until every item has been given
+
+    The value of every bundle to every user is kept in a users x
+    bundles matrix that is updated as items are given, so a
+    rotation only changes which user owns which bundle. The
+    envy graph (and the number of users envying each user) is
+    updated in O(n) for each item, and only recomputed after a
+    rotation, which always removes at least one envy edge.
+    '''
+
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
+    def __init__(self, users, cake):
+        ''' Initializes a new instance of the algorithm
+
+        :param users: The users to operate with
+        :param cake: The cake to divide
+        '''
+        self.users = users
+        self.cake  = cake
+
+    def divide(self):
+        ''' Run the algorithm to perform a suggested
+        division.
+
+        :returns: A dictionary of divisions of {user: piece}
+        '''
+        users   = randomize_items(self.users)               # create a safe copy of the users
+        pieces  = self.cake.as_collection()                 # project the cake into a collection
+        matrix  = ValuationMatrix(users, pieces)            # every item is valued once
+        graph   = EnvyGraph(len(users), matrix.values.dtype) # bundle i starts with user i
+        bundles = [[] for _ in users]                       # the items in each bundle
+        order   = np.argsort(-matrix.values.max(axis=0), kind='mergesort')
+
+        for item in order.tolist():                         # the most wanted items first
+            values = matrix.values[:, item]
+            while not graph.unenvied().size:                # everybody is envied
+                graph.rotate(graph.find_cycle())            # so rotate the bundles on a cycle
+            unenvied = graph.unenvied()
+            cutter   = int(unenvied[np.argmax(values[unenvied])])
+            bundles[graph.owner[cutter]].append(item)
+            graph.add(cutter, values)                       # give the item to this user
+
+        slices = defaultdict(list, ((u, []) for u in users))
+        for user, bundle in enumerate(graph.owner.tolist()):
+            slices[users[user]] = [pieces[item] for item in bundles[bundle]]
+        return slices
+
+
+class EnvyGraph(object):
+    ''' The envy graph between users that each own a bundle.
+    An edge i -> j means that user i values the bundle of
+    user j more than their own bundle.
+    '''
+
+    def __init__(self, count, dtype=float):
+        ''' Initializes a new instance of the graph
+
+        :param count: The number of users (and bundles)
+        :param dtype: The type of the values (object for exact values)
+        '''
+        self.owner  = np.arange(count)                      # the bundle owned by each user
+        self.values = np.zeros((count, count), dtype=dtype) # the value of each bundle to each user
+        self.envy   = np.zeros((count, count), dtype=bool)
+        self.envied = np.zeros(count, dtype=int)            # the number of users envying each user
+
+    def own_values(self):
+        ''' Return the value of each user's own bundle
+
+        :returns: The array of the value of each own bundle
+        '''
+        return self.values[np.arange(len(self.owner)), self.owner]
+
+    def unenvied(self):
+        ''' Return the users that nobody envies
+
+        :returns: The array of the unenvied users
+        '''
+        return np.flatnonzero(self.envied == 0)
+
+    def add(self, user, values):
+        ''' Add an item to the bundle of the supplied user,
+        updating the envy edges into and out of that user.
+
+        :param user: The user to give the item to
+        :param values: The value of the item to each user
+        '''
+        bundle = self.owner[user]
+        self.values[:, bundle] += values
+        own = self.own_values()
+
+        row = self.values[user, self.owner] > own[user]     # who the user now envies
+        self.envied += row.astype(int) - self.envy[user]
+        self.envy[user] = row
+
+        column = self.values[:, bundle] > own               # who now envies the user
+        column[user] = False
+        self.envy[:, user] = column
+        self.envied[user] = column.sum()
+
+    def find_cycle(self):
+        ''' Find a cycle of envy, assuming every user is envied
+        (so walking from any user to somebody who envies them
+        must eventually return to a user already visited).
+
+        :returns: The users on the cycle, each envied by the next
+        '''
+        seen, path, user = {}, [], 0
+        while user not in seen:
+            seen[user] = len(path)
+            path.append(user)
+            user = int(np.argmax(self.envy[:, user]))       # somebody who envies this user
+        return path[seen[user]:]
+
+    def rotate(self, cycle):
+        ''' Give each user on the cycle the bundle of the user
+        that they envy, then rebuild the envy graph.
+
+        :param cycle: The users on the cycle, each envied by the next
+        '''
+        bundles = self.owner[cycle]
+        self.owner[np.roll(cycle, -1)] = bundles             # the next user takes this bundle
+        own = self.own_values()
+        self.envy = self.values[:, self.owner] > own[:, None]
+        np.fill_diagonal(self.envy, False)
+        self.envied = self.envy.sum(axis=0)
@@ -0,0 +1,131 @@
+from multiprocessing import Pool
+from cakery.numeric import get_backend
+from cakery.algorithms.utilities import *
+from cakery.algorithms.common import FairDivider
+
+
+# ------------------------------------------------------------
+# worker helpers
+# ------------------------------------------------------------
+_problems = []  # the sub-problems a worker process can solve
+
+
+def _initialize(problems):
+    ''' Initialize a worker process with the sub-problems
+    to be solved. As the workers are forked, the problems are
+    inherited instead of pickled (the preferences may not be
+    picklable), and only the results are sent back.
+
+    :param problems: The list of (users, cake) to solve
+    '''
+    global _problems
+    _problems = problems
+
+
+def _solve(problem):
+    ''' Solve the sub-problem at the supplied index.
+
+    :param problem: The index of the sub-problem to solve
+    :returns: A list of (user index, piece)
+    '''
+    users, cake = _problems[problem]
+    return [(users.index(u), p) for u, p in EvenPaz.split(users, cake)]
+
+
+# ------------------------------------------------------------
+# algorithm
+# ------------------------------------------------------------
+class EvenPaz(FairDivider):
+    ''' This is an implementation of the Even-Paz divide and
+    conquer algorithm, which needs O(n log n) cut queries
+    (compared with the O(n^2) of Banach-Knaster, Dubins-Spanier,
+    and Lone Chooser). It works as follows:
+
+    1. If there is a single user, they receive the cake
+    2. Let k be half of the n users (rounded down)
+    3. Each user marks the piece from the left that they value
+       at k/n of their value of the cake
+    4. The cake is cut at the k-th smallest mark
+    5. The k users with the smallest marks recurse on the left
+    6. The remaining n - k users recurse on the right
+
+    The two halves of each cut are independent, so they can
+    be solved in parallel worker processes.
+    '''
+
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     False,
+        'continuous':   True,
+    }
+
+    def __init__(self, users, cake, processes=None):
+        ''' Initializes a new instance of the algorithm
+
+        :param users: The users to operate with
+        :param cake: The cake to divide
+        :param processes: The number of worker processes to use (None for serial)
+        '''
+        self.users = users
+        self.cake  = cake
+        self.processes = processes
+
+    @staticmethod
+    def cut(users, cake):
+        ''' Cut the supplied cake at the median mark of the
+        supplied users.
+
+        :param users: The users to divide the cake between
+        :param cake: The cake to divide (this will be modified)
+        :returns: ((left users, left cake), (right users, right cake))
+        '''
+        count  = len(users) // 2
+        weight = get_backend().fraction(count, len(users))
+        marks  = [cake.find_piece(u, u.value_of(cake) * weight) for u in users]
+        order  = sorted(range(len(users)), key=lambda i: (marks[i], i))
+        piece  = marks[order[count - 1]]            # the k-th smallest mark
+        cake.remove(piece)
+        lefts  = [users[i] for i in order[:count]]
+        rights = [users[i] for i in order[count:]]
+        return (lefts, piece), (rights, cake)
+
+    @staticmethod
+    def split(users, cake):
+        ''' Recursively divide the cake among the users.
+
+        :param users: The users to divide the cake between
+        :param cake: The cake to divide (this will be modified)
+        :returns: A list of (user, piece)
+        '''
+        if len(users) == 1:
+            return [(users[0], cake)]
+        left, right = EvenPaz.cut(users, cake)
+        return EvenPaz.split(*left) + EvenPaz.split(*right)
+
+    def divide(self):
+        ''' Run the algorithm to perform a suggested
+        division.
+
+        :returns: A dictionary of divisions of {user: piece}
+        '''
+        users = randomize_items(self.users)
+        cake  = self.cake.clone()
+        if not self.processes or self.processes < 2:
+            return dict(EvenPaz.split(users, cake))
+
+        problems = [(users, cake)]                  # split until every worker has a problem
+        while len(problems) < self.processes and any(len(u) > 1 for u, _ in problems):
+            index = max(range(len(problems)), key=lambda i: len(problems[i][0]))
+            problems.extend(EvenPaz.cut(*problems.pop(index)))
+
+        pool = Pool(min(self.processes, len(problems)), _initialize, (problems,))
+        try: results = pool.map(_solve, range(len(problems)))
+        finally:
+            pool.close()
+            pool.join()
+        return dict((problems[n][0][i], piece)
+            for n, result in enumerate(results) for i, piece in result)
@@ -7,6 +7,16 @@ class GuyConwaySelfridge(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        3,
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake):
         ''' Initializes a new instance of the algorithm
 
@@ -17,21 +27,6 @@ class GuyConwaySelfridge(FairDivider):
         self.cake  = cake
         self.count = len(self.users)
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': True,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
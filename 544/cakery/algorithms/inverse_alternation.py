@@ -11,6 +11,16 @@ class InverseAlternatingChoice(FairDivider):
     defaults to ordinal.
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake, strategy=None):
         ''' Initializes a new instance of the algorithm
 
@@ -22,21 +32,6 @@ class InverseAlternatingChoice(FairDivider):
         self.cake  = cake
         self.strategy = strategy or AlternationStrategy.ordinal
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': False,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
@@ -45,10 +40,12 @@ class InverseAlternatingChoice(FairDivider):
         '''
         slices  = defaultdict(list)                 # initialize each user to an empty list
         pieces  = self.cake.as_collection()         # project our collection to a list
+        matrix  = ValuationMatrix(self.users, pieces) # value every piece once for each user
+        engine  = PickEngine(matrix, pieces, best=False) # keep each user's heap of the pieces
         cutters = self.strategy(self.users, pieces) # initialize our alternation strategy
-        while any(pieces):                          # while there are still pieces
+        while engine:                               # while there are still pieces
             for cutter in cutters():                # choose users based on our strategy
-                piece = choose_worst_piece(cutter, pieces)   # they remove their worst piece
+                piece = engine.pick(cutter)         # they remove their worst piece
                 slices[cutter].append(piece)        # and add it to their list
-                if not any(pieces): break           # exit early in case of odd piece
+                if not engine: break                # exit early in case of odd piece
         return slices
@@ -14,6 +14,16 @@ class InverseBanachKnaster(FairDivider):
     5. This continues until all the players have exited the division
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake, weight=None):
         ''' Initializes a new instance of the algorithm
 
@@ -24,21 +34,6 @@ class InverseBanachKnaster(FairDivider):
         self.cake = cake
         self.weight = weight or cake.actual_value() / len(users)
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': True,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
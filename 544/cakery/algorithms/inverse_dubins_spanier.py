@@ -1,4 +1,4 @@
-from fractions import Fraction as F
+from cakery.numeric import get_backend
 from cakery.algorithms.utilities import *
 from cakery.algorithms.common import FairDivider
 
@@ -7,6 +7,16 @@ class InverseDubinsSpanier(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake, value=None):
         ''' Initializes a new instance of the algorithm
 
@@ -16,22 +26,7 @@ class InverseDubinsSpanier(FairDivider):
         '''
         self.users = users
         self.cake = cake
-        self.value = value or F(1, len(users))
-
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    True,
-            'proportional': True,
-            'equitable':    True,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
+        self.value = value or get_backend().fraction(1, len(users))
 
     def divide(self):
         ''' Run the algorithm to perform a suggested
@@ -15,6 +15,16 @@ class InverseLoneChooser(FairDivider):
     6. Repeat at 2 for each new player
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake):
         ''' Initializes a new instance of the algorithm
 
@@ -24,21 +34,6 @@ class InverseLoneChooser(FairDivider):
         self.users = users
         self.cake  = cake
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': True,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
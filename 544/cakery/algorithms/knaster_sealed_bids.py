@@ -1,3 +1,4 @@
+import numpy as np
 from collections import defaultdict
 from cakery.algorithms.utilities import *
 from cakery.algorithms.common import FairDivider
@@ -10,6 +11,16 @@ class KnasterSealedBids(FairDivider):
     equal.
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake):
         ''' Initializes a new instance of the algorithm
 
@@ -19,21 +30,6 @@ class KnasterSealedBids(FairDivider):
         self.users = users
         self.cake  = cake
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': True,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
@@ -41,23 +37,25 @@ class KnasterSealedBids(FairDivider):
         :returns: A dictionary of divisions of {user: piece}
         '''
         N      = len(self.users)                                # The number of users competing
-        slices = defaultdict(list)                              # initialize the user's assignments
         users  = randomize_items(self.users)                    # create a safe copy of the users
-        fairs  = {u: u.value_of(self.cake) / N for u in users}  # each users fair share view of the cake
-                                                                # simply run a sealed bids auction
-        for piece in self.cake.as_collection():                 # project the cake into a collection
-            cutter = choose_highest_bidder(users, piece)        # find the highest bidder for this piece
-            slices[cutter].append(piece)                        # user that bid the most, gets the piece
-
-        assign  = {u: get_total_value(u, slices[u]) for u in users}  # how much value each user got
-        excess  = {u: assign[u] - fairs[u] for u in users}      # how much in excess of fair share we got
-        surplus = sum(v for v in excess.values()) / N           # the total surplus share of value for each user
-        adjusts = {u: fairs[u] + surplus for u in users}        # each user's assigned value adjusted by surplus
-        settled = {u: assign[u] - adjusts[u] for u in users}    # how much each user should give and get from the pot
+        slices = defaultdict(list, ((u, []) for u in users))    # initialize the user's assignments
+        pieces = self.cake.as_collection()                      # project the cake into a collection
+        matrix = ValuationMatrix(users, pieces)                 # every bid is valued once
+        owners = matrix.winners()                               # simply run a sealed bids auction
+        for piece, cutter in zip(pieces, owners):               # find the highest bidder for each piece
+            slices[users[cutter]].append(piece)                 # user that bid the most, gets the piece
+
+        fairs   = np.array([u.value_of(self.cake) for u in users]) / N # each users fair share view of the cake
+        assign  = matrix.assigned_totals(owners)                # how much value each user got
+        excess  = assign - fairs                                # how much in excess of fair share we got
+        surplus = excess.sum() / N                              # the total surplus share of value for each user
+        adjusts = fairs + surplus                               # each user's assigned value adjusted by surplus
+        settled = assign - adjusts                              # how much each user should give and get from the pot
+        by_user = lambda values: dict(zip(users, values.tolist()))
         return slices, {                                        # return the assignments and settlements
-            'settlements': settled,
-            'excesses'   : excess,
-            'assignments': assign,
-            'adjustments': adjusts,
-            'surplus'    : surplus,
+            'settlements': by_user(settled),
+            'excesses'   : by_user(excess),
+            'assignments': by_user(assign),
+            'adjustments': by_user(adjusts),
+            'surplus'    : np.asarray(surplus).tolist(),
         }
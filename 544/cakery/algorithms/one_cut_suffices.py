@@ -11,6 +11,16 @@ class OneCutSuffices(FairDivider):
     by using only one item division.
     '''
 
+    capabilities = {
+        'users':        1,
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake, value=None):
         ''' Initializes a new instance of the algorithm
 
@@ -22,21 +32,6 @@ class OneCutSuffices(FairDivider):
         self.cake  = cake
         self.value = value or self.users[0].value_of(cake) * F(1, 2)
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        1,
-            'envy-free':    False,
-            'proportional': False,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
@@ -0,0 +1,182 @@
+'''
+------------------------------------------------------------
+Algorithm Registry
+------------------------------------------------------------
+
+The capabilities of every algorithm are listed here so that
+they can be queried without importing (or instantiating) the
+algorithm. The module of an algorithm is only imported when
+the algorithm is first requested::
+
+    factory = get_algorithm('DubinsSpanier')
+    factory = select_algorithm(5, 'continuous', requires=['envy-free'])
+
+Each algorithm also lists its expected number of queries for
+n users and m items, so the selector can choose the cheapest
+of the algorithms that meet the requirements. The features
+listed here mirror the `capabilities` of each algorithm class
+(which the tests check, so the two cannot drift apart).
+'''
+from collections import namedtuple
+from importlib import import_module
+from math import ceil, log
+
+
+# ------------------------------------------------------------
+# registry
+# ------------------------------------------------------------
+Entry = namedtuple('Entry', 'name module settings cost')
+
+registry = {}
+
+
+def register(name, module, users, features, cost):
+    ''' Register the capabilities of an algorithm.
+
+    :param name: The name of the algorithm class
+    :param module: The name of the module that defines it
+    :param users: The number of users it works for ('n' for any)
+    :param features: The names of the features it has
+    :param cost: A function of (users, items) to its expected queries
+    '''
+    settings = dict((key, key in features.split()) for key in [
+        'envy-free', 'proportional', 'equitable', 'optimal', 'discrete', 'continuous'])
+    settings['users'] = users
+    registry[name] = Entry(name, 'cakery.algorithms.' + module, settings, cost)
+
+
+register('AustinMovingKnife', 'austin_moving_knife', 2,
+    'envy-free proportional equitable optimal discrete continuous',
+    lambda n, m: 100)                                   # the knife moves until both agree
+register('BanachKnaster', 'banach_knaster', 'n',
+    'proportional discrete continuous', lambda n, m: n * n)
+register('InverseBanachKnaster', 'inverse_banach_knaster', 'n',
+    'proportional discrete continuous', lambda n, m: n * n)
+register('DivideAndChoose', 'divide_and_choose', 2,
+    'envy-free proportional equitable optimal discrete continuous', lambda n, m: 3)
+register('InverseDivideAndChoose', 'inverse_divide_and_choose', 2,
+    'envy-free proportional equitable optimal discrete continuous', lambda n, m: 3)
+register('DubinsSpanier', 'dubins_spanier', 'n',
+    'proportional discrete continuous', lambda n, m: n * n)
+register('InverseDubinsSpanier', 'inverse_dubins_spanier', 'n',
+    'proportional discrete continuous', lambda n, m: n * n)
+register('EvenPaz', 'even_paz', 'n',
+    'proportional continuous', lambda n, m: n * ceil(log(n, 2)))
+register('LoneChooser', 'lone_chooser', 'n',
+    'proportional discrete continuous', lambda n, m: n ** 3)
+register('InverseLoneChooser', 'inverse_lone_chooser', 'n',
+    'proportional discrete continuous', lambda n, m: n ** 3)
+register('GuyConwaySelfridge', 'guy_conway_selfridge', 3,
+    'proportional discrete continuous', lambda n, m: 12)
+register('InverseGuyConwaySelfridge', 'inverse_guy_conway_selfridge', 3,
+    'proportional discrete continuous', lambda n, m: 12)
+register('TaylorRst', 'taylor_rst', 2,
+    'proportional discrete continuous', lambda n, m: 21)
+register('AlternatingChoice', 'alternation', 'n',
+    'discrete', lambda n, m: n * m)
+register('InverseAlternatingChoice', 'inverse_alternation', 'n',
+    'discrete', lambda n, m: n * m)
+register('BalancedAlternatingChoice', 'balanced_alternation', 'n',
+    'discrete', lambda n, m: n * m)
+register('InverseBalancedAlternatingChoice', 'inverse_balanced_alternation', 'n',
+    'discrete', lambda n, m: n * m)
+register('SealedBidsAuction', 'sealed_bids_auction', 'n',
+    'discrete', lambda n, m: n * m)
+register('KnasterSealedBids', 'knaster_sealed_bids', 'n',
+    'proportional discrete', lambda n, m: n * m)
+register('AdjustedWinner', 'adjusted_winner', 2,
+    'envy-free proportional equitable discrete', lambda n, m: 2 * m)
+register('OneCutSuffices', 'one_cut_suffices', 1,
+    'discrete', lambda n, m: m)
+register('LensEpsteinPoints', 'lens_epstein_points', 2,
+    'discrete', lambda n, m: 2 * m)
+register('SalterPoints', 'salter_points', 2,
+    'discrete', lambda n, m: 2 * m)
+register('EnvyCycleElimination', 'envy_cycle_elimination', 'n',
+    'discrete', lambda n, m: n * m)
+
+
+# ------------------------------------------------------------
+# lookup
+# ------------------------------------------------------------
+def get_algorithm(name):
+    ''' Given an algorithm name, return a factory for that
+    algorithm, importing its module if needed.
+
+    :param name: The name of the algorithm to create
+    :returns: The type factory for that algorithm
+    '''
+    if name not in registry:
+        raise ValueError("no matching algorithm available: %s" % name)
+    return getattr(import_module(registry[name].module), name)
+
+
+def get_capabilities(name):
+    ''' Given an algorithm name, return its capabilities
+    without importing the algorithm.
+
+    :param name: The name of the algorithm
+    :returns: A dictionary of the algorithm features
+    '''
+    if name not in registry:
+        raise ValueError("no matching algorithm available: %s" % name)
+    return dict(registry[name].settings)
+
+
+def _resource_kind(resource):
+    ''' Return the kind (discrete or continuous) and the
+    number of items of the supplied resource.
+
+    :param resource: The resource or the name of its kind
+    :returns: The tuple of (kind, items)
+    '''
+    from cakery.resource import CountedResource, CollectionResource
+    if isinstance(resource, basestring):
+        return resource, 1
+    if isinstance(resource, (CountedResource, CollectionResource)):
+        return 'discrete', len(resource.value)
+    return 'continuous', 1
+
+
+def find_algorithms(users, resource='continuous', requires=()):
+    ''' Find the algorithms that can divide the supplied
+    resource between the number of users with the required
+    features, ordered by their expected number of queries.
+
+    :param users: The number of users (or the users) to divide between
+    :param resource: The resource (or the name of its kind) to divide
+    :param requires: The features the algorithm must have
+    :returns: A list of the names of the eligible algorithms
+    '''
+    users = users if isinstance(users, (int, long)) else len(users)
+    kind, items = _resource_kind(resource)
+    eligible = [entry for entry in registry.values()
+        if entry.settings['users'] in ('n', users) and entry.settings[kind]
+        and all(entry.settings[feature] for feature in requires)]
+    eligible.sort(key=lambda entry: (entry.cost(users, items), entry.name))
+    return [entry.name for entry in eligible]
+
+
+def select_algorithm(users, resource='continuous', requires=()):
+    ''' Select the cheapest algorithm that can divide the
+    supplied resource between the users with the required
+    features.
+
+    :param users: The number of users (or the users) to divide between
+    :param resource: The resource (or the name of its kind) to divide
+    :param requires: The features the algorithm must have
+    :returns: The type factory of the selected algorithm
+    '''
+    names = find_algorithms(users, resource, requires)
+    if not names:
+        raise ValueError("no algorithm meets the requirements")
+    return get_algorithm(names[0])
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "register", "get_algorithm", "get_capabilities",
+    "find_algorithms", "select_algorithm",
+]
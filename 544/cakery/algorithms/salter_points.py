@@ -6,6 +6,16 @@ class SalterPoints(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        2,
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake, count=None):
         ''' Initializes a new instance of the algorithm.
         It should be noted that the first player is the
@@ -19,21 +29,6 @@ class SalterPoints(FairDivider):
         self.cake  = cake
         self.count = count or 2
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        2,
-            'envy-free':    False,
-            'proportional': False,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
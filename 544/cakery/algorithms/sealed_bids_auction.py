@@ -7,6 +7,16 @@ class SealedBidsAuction(FairDivider):
     '''
     '''
 
+    capabilities = {
+        'users':        'n',
+        'envy-free':    False,
+        'proportional': False,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   False,
+    }
+
     def __init__(self, users, cake):
         ''' Initializes a new instance of the algorithm
 
@@ -16,21 +26,6 @@ class SealedBidsAuction(FairDivider):
         self.users = users
         self.cake  = cake
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': False,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
@@ -39,7 +34,8 @@ class SealedBidsAuction(FairDivider):
         '''
         slices = defaultdict(list)
         users  = randomize_items(self.users)
-        for cake in self.cake.as_collection():
-            cutter = choose_highest_bidder(users, cake)
-            slices[cutter].append(cake)  # user that bid the most, gets the cake
+        pieces = self.cake.as_collection()
+        matrix = ValuationMatrix(users, pieces)         # every bid is valued once
+        for cake, cutter in zip(pieces, matrix.winners()):
+            slices[users[cutter]].append(cake)  # user that bid the most, gets the cake
         return slices
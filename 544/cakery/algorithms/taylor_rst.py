@@ -8,6 +8,16 @@ class TaylorRst(FairDivider):
     algorithm that works as follows:
     '''
 
+    capabilities = {
+        'users':        2,
+        'envy-free':    False,
+        'proportional': True,
+        'equitable':    False,
+        'optimal':      False,
+        'discrete':     True,
+        'continuous':   True,
+    }
+
     def __init__(self, users, cake, count=None):
         ''' Initializes a new instance of the algorithm
 
@@ -18,21 +28,6 @@ class TaylorRst(FairDivider):
         self.cake  = cake
         self.count = count or 10
 
-    def settings(self):
-        ''' Retieves a capability listing of this algorithm
-
-        :returns: A dictionary of the algorithm features
-        '''
-        return {
-            'users':        'n',
-            'envy-free':    False,
-            'proportional': True,
-            'equitable':    False,
-            'optimal':      False,
-            'discrete':     True,
-            'continuous':   True,
-        }
-
     def divide(self):
         ''' Run the algorithm to perform a suggested
         division.
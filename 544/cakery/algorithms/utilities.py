@@ -7,9 +7,11 @@ These are a collection of simple helper methods that make
 the code easier to read (basically a simple DSL).
 '''
 import random
+import numpy as np
 from collections import Iterable
-from fractions import Fraction as F
+from heapq import heapify, heappush, heappop
 from math import ceil, sqrt
+from cakery.numeric import get_backend
 
 
 # ------------------------------------------------------------
@@ -58,50 +60,62 @@ def choose_and_remove(items):
     return choice
 
 
-def choose_highest_bidder(users, item):
+def choose_highest_bidder(users, item, matrix=None):
     ''' Given an item, return the user that bid
     the higest amount for said item.
 
     :param users: The users bidding on the item
     :param item: The item to be bid upon
+    :param matrix: An optional valuation matrix to read values from
     :returns: The user with the highest bid
     '''
+    if matrix is not None:
+        return users[matrix.best_user(users, item)]
     return max((user.value_of(item), user) for user in users)[1]
 
 
-def choose_lowest_bidder(users, item):
+def choose_lowest_bidder(users, item, matrix=None):
     ''' Given an item, return the user that bid
     the lowest amount for said item.
 
     :param users: The users bidding on the item
     :param item: The item to be bid upon
+    :param matrix: An optional valuation matrix to read values from
     :returns: The user with the highest bid
     '''
+    if matrix is not None:
+        return users[matrix.worst_user(users, item)]
     return min((user.value_of(item), user) for user in users)[1]
 
 
-def get_total_value(user, pieces):
+def get_total_value(user, pieces, matrix=None):
     ''' Given a user and a collection of one or
     more pieces, return the total value of those
     pieces as viewed by that user.
 
     :param user: The user to get the value with
     :param pieces: The pieces to totally value
+    :param matrix: An optional valuation matrix to read values from
     :returns: The total value of the pieces to the user
     '''
+    if matrix is not None:
+        return matrix.total_value(user, pieces)
     if not isinstance(pieces, list):
         return user.value_of(pieces)
     return sum(user.value_of(p) for p in pieces)
 
 
-def list_best_pieces(users, pieces):
+def list_best_pieces(users, pieces, matrix=None):
     ''' Given a collection of users and pieces
     return the favorite pieces for each user.
 
     :param users: The users to search with
     :param pieces: The pieces to search in
+    :param matrix: An optional valuation matrix to read values from
     :returns: dict of {user: best-pieces}
     '''
+    if matrix is not None:
+        return dict((u, pieces[matrix.best_piece(u, pieces)]) for u in users)
     choices = {}
     for user in users:
         choice = max((user.value_of(p), p) for p in pieces)
@@ -109,14 +123,17 @@ def list_best_pieces(users, pieces):
     return choices
 
 
-def list_worst_pieces(users, pieces):
+def list_worst_pieces(users, pieces, matrix=None):
     ''' Given a collection of users and pieces
     return the worst pieces for each user.
 
     :param users: The users to search with
     :param pieces: The pieces to search in
+    :param matrix: An optional valuation matrix to read values from
     :returns: dict of {user: worst-pieces}
     '''
+    if matrix is not None:
+        return dict((u, pieces[matrix.worst_piece(u, pieces)]) for u in users)
     choices = {}
     for user in users:
         choice = min((user.value_of(p), p) for p in pieces)
@@ -124,41 +141,50 @@ def list_worst_pieces(users, pieces):
     return choices
 
 
-def sort_by_value(user, pieces, reverse=False):
+def sort_by_value(user, pieces, reverse=False, matrix=None):
     ''' Given a collection of pieces, sort
     them based on their value to the given user.
 
     :param user: The user to value the pieces with
     :param pieces: The pieces to sort by value
     :param reverse: True to return in descending order
+    :param matrix: An optional valuation matrix to read values from
     :returns: A list of (value, piece)
     '''
+    if matrix is not None:
+        return matrix.sort_by_value(user, pieces, reverse)
     return sorted(((user.value_of(p), p) for p in pieces), reverse=reverse)
 
 
-def choose_best_piece(user, pieces):
+def choose_best_piece(user, pieces, matrix=None):
     ''' Given a collection of resources, choose the
     one that is the most preferred by the supplied
     user.
 
     :param user: The user to choose the best item for
     :param pieces: The pieces to choose the most liked from
+    :param matrix: An optional valuation matrix to read values from
     :returns: A the best item for the user
     '''
+    if matrix is not None:
+        return pieces.pop(matrix.best_piece(user, pieces))
     choice = max((user.value_of(p), p) for p in pieces)[1]
     pieces.remove(choice)
     return choice
 
 
-def choose_worst_piece(user, pieces):
+def choose_worst_piece(user, pieces, matrix=None):
     ''' Given a collection of resources, choose the
     one that is the least preferred by the supplied
     user.
 
     :param user: The user to choose the best item for
     :param pieces: The pieces to choose the least liked from
+    :param matrix: An optional valuation matrix to read values from
     :returns: A the worst item for the user
     '''
+    if matrix is not None:
+        return pieces.pop(matrix.worst_piece(user, pieces))
     choice = min((user.value_of(p), p) for p in pieces)[1]
     pieces.remove(choice)
     return choice
@@ -173,12 +199,10 @@ def create_equal_pieces(user, cake, count=2, weight=None):
     :param count: The number of pieces to split
     :param weight: The weight to split into
     '''
-    pieces = []
     weight = weight or user.value_of(cake) / count
+    pieces = cake.find_pieces(user, [weight] * (count - 1))
     cloned = cake.clone()
-    for n in range(count - 1):
-        piece = cloned.find_piece(user, weight)
-        pieces.append(piece)
+    for piece in pieces:
         cloned.remove(piece)
     pieces.append(cloned) # the rest is a single slice
     return pieces
@@ -188,15 +212,16 @@ def choose_next_piece(users, cake, weight=None):
     ''' Given a resource and a collection of users,
     return the next user who would have said 'Stop'
     first and the piece they would have stopped for.
+    Ties are given to the earliest user in the ordering.
 
     :param users: The users to split the resource with
     :param cake: The cake to split
     :param weight: The weight to find the next piece for
     :returns: (user, piece)
     '''
-    weight = weight or F(1, len(users)) # TODO
-    pieces = ((cake.find_piece(user, weight), user) for user in users)
-    (piece, user) = min(pieces) # we choose the smallest 'appraised value'
+    weight = weight or get_backend().fraction(1, len(users)) # TODO
+    pieces = [(cake.find_piece(user, weight), user) for user in users]
+    (piece, user) = min(pieces, key=lambda p: p[0]) # we choose the smallest 'appraised value'
     cake.remove(piece)
     return (user, piece)
 
@@ -205,15 +230,16 @@ def choose_last_piece(users, cake, weight=None):
     ''' Given a resource and a collection of users,
     return the next user who would have said 'Stop'
     last and the piece they would have stopped for.
+    Ties are given to the latest user in the ordering.
 
     :param users: The users to split the resource with
     :param cake: The cake to split
     :param weight: The weight to find the next piece for
     :returns: (user, piece)
     '''
-    weight = weight or F(1, len(users)) # TODO
-    pieces = ((cake.find_piece(user, weight), user) for user in users)
-    (piece, user) = max(pieces) # we choose the largest 'appraised value'
+    weight = weight or get_backend().fraction(1, len(users)) # TODO
+    pieces = [(cake.find_piece(user, weight), user) for user in reversed(users)]
+    (piece, user) = max(pieces, key=lambda p: p[0]) # we choose the largest 'appraised value'
     cake.remove(piece)
     return (user, piece)
 
@@ -237,6 +263,306 @@ def trim_and_replace(user, cake, piece, weight):
 # ------------------------------------------------------------
 # classes
 # ------------------------------------------------------------
+class MovingKnife(object):
+    ''' A moving knife over a continuous (or interval) resource
+    that is only ever cut from the left.
+
+    Each user keeps a mark (the piece from the start of the
+    cake to where they would say 'Stop') in a heap ordered by
+    where the mark stops. Removing a piece from the left can
+    only move the marks of the remaining users forward, so an
+    old mark is a lower bound of where that user would stop
+    now. The marks are therefore advanced lazily: only a mark
+    that reaches the top of the heap is cut again, and a user
+    whose old mark already lies past the next winner is never
+    asked again that round.
+    '''
+
+    def __init__(self, users, cake, weight):
+        ''' Initializes a new instance of the knife
+
+        :param users: The users (in tie breaking order) to cut for
+        :param cake: The cake to cut (this will be modified)
+        :param weight: The value each user should stop at
+        '''
+        self.cake   = cake
+        self.users  = list(users)
+        self.weight = weight
+        self.round  = 0                         # the number of pieces removed
+        self.marks  = {}                        # user -> (round, piece)
+        self.heap   = [self.__mark(order, user) for order, user in enumerate(self.users)]
+        heapify(self.heap)
+
+    def __mark(self, order, user):
+        ''' Cut a new mark for the supplied user from the
+        current start of the cake.
+
+        :param order: The tie breaking order of the user
+        :param user: The user to cut a mark for
+        :returns: The heap entry for the new mark
+        '''
+        piece = self.cake.find_piece(user, self.weight)
+        self.marks[user] = (self.round, piece)
+        if isinstance(piece.value, list):
+            stop = piece.value[-1][1]
+        else: stop = piece.value[0] + piece.value[1]
+        return (stop, order, user)
+
+    def next(self):
+        ''' Find the user that would say 'Stop' first, remove
+        the piece they stop at from the cake, and retire them.
+        Ties are given to the earliest user in the ordering.
+
+        :returns: (user, piece)
+        '''
+        while True:
+            stop, order, user = heappop(self.heap)
+            round, piece = self.marks[user]
+            if round == self.round: break
+            heappush(self.heap, self.__mark(order, user))
+
+        del self.marks[user]
+        self.users.remove(user)
+        self.cake.remove(piece)
+        self.round += 1
+        return (user, piece)
+
+
+class ValuationMatrix(object):
+    ''' A users x pieces matrix of the value that each user
+    places on each piece. This is built once for a collection
+    of pieces (say from `cake.as_collection()`) so that the
+    helpers above can read values instead of calling
+    `user.value_of` for the same pair every round.
+
+    Pieces are indexed by identity, so the matrix can be used
+    with any sub-list of the pieces it was built with.
+    '''
+
+    def __init__(self, users, pieces):
+        ''' Initializes a new instance of the matrix
+
+        :param users: The users to value the pieces with
+        :param pieces: The pieces to be valued
+        '''
+        self.users  = list(users)
+        self.pieces = list(pieces)
+        self.user_index  = dict((u, i) for i, u in enumerate(self.users))
+        self.piece_index = dict((id(p), j) for j, p in enumerate(self.pieces))
+        self.values = np.array([u.value_of_many(self.pieces) for u in self.users])
+        if self.values.ndim != 2:
+            self.values = self.values.reshape(len(self.users), len(self.pieces))
+
+    def columns(self, pieces):
+        ''' Return the matrix columns of the supplied pieces
+
+        :param pieces: The pieces to find the columns of
+        :returns: The list of column indices
+        '''
+        return [self.piece_index[id(p)] for p in pieces]
+
+    def rows(self, users):
+        ''' Return the matrix rows of the supplied users
+
+        :param users: The users to find the rows of
+        :returns: The list of row indices
+        '''
+        return [self.user_index[u] for u in users]
+
+    def value_of(self, user, piece):
+        ''' Return the value the user places on the piece
+
+        :param user: The user to value the piece with
+        :param piece: The piece to value
+        :returns: The value of the piece to the user
+        '''
+        return self.values[self.user_index[user], self.piece_index[id(piece)]]
+
+    def total_value(self, user, pieces):
+        ''' Return the total value of one or more pieces
+
+        :param user: The user to value the pieces with
+        :param pieces: The piece or list of pieces to value
+        :returns: The total value of the pieces to the user
+        '''
+        if not isinstance(pieces, list):
+            return self.value_of(user, pieces)
+        return self.values[self.user_index[user], self.columns(pieces)].sum()
+
+    def best_piece(self, user, pieces):
+        ''' Return the position of the user's favorite piece
+
+        :param user: The user to choose for
+        :param pieces: The pieces to choose between
+        :returns: The position of the best piece in pieces
+        '''
+        values = self.values[self.user_index[user], self.columns(pieces)]
+        return self.__tie_break(values, values.max(), pieces, max)
+
+    def worst_piece(self, user, pieces):
+        ''' Return the position of the user's least favorite piece
+
+        :param user: The user to choose for
+        :param pieces: The pieces to choose between
+        :returns: The position of the worst piece in pieces
+        '''
+        values = self.values[self.user_index[user], self.columns(pieces)]
+        return self.__tie_break(values, values.min(), pieces, min)
+
+    def best_user(self, users, piece):
+        ''' Return the position of the user valuing the piece most
+
+        :param users: The users to choose between
+        :param piece: The piece being valued
+        :returns: The position of the highest bidder in users
+        '''
+        return int(np.argmax(self.values[self.rows(users), self.piece_index[id(piece)]]))
+
+    def worst_user(self, users, piece):
+        ''' Return the position of the user valuing the piece least
+
+        :param users: The users to choose between
+        :param piece: The piece being valued
+        :returns: The position of the lowest bidder in users
+        '''
+        return int(np.argmin(self.values[self.rows(users), self.piece_index[id(piece)]]))
+
+    def __tie_break(self, values, value, pieces, choose):
+        ''' Given the best value in a row, return the position
+        of the piece with that value. Ties are broken by the
+        pieces themselves, the same as comparing (value, piece).
+
+        :param values: The row of values to search
+        :param value: The best value in that row
+        :param pieces: The pieces the values belong to
+        :param choose: The function used to break ties (min or max)
+        :returns: The position of the chosen piece
+        '''
+        indices = np.flatnonzero(values == value)
+        if len(indices) == 1: return int(indices[0])
+        return int(choose(indices, key=lambda i: pieces[i]))
+
+    def winners(self):
+        ''' Return the row of the highest bidder for every
+        piece (ties go to the earliest user).
+
+        :returns: The array of the winning row of each column
+        '''
+        return self.values.argmax(axis=0)
+
+    def assigned_totals(self, owners):
+        ''' Return the total value that each user places on
+        the pieces that they were assigned.
+
+        :param owners: The row that owns each piece (column)
+        :returns: The array of the total of each row
+        '''
+        owned = np.arange(len(self.users))[:, None] == np.asarray(owners)[None, :]
+        return np.where(owned, self.values, 0).sum(axis=1)
+
+    def sort_by_value(self, user, pieces, reverse=False):
+        ''' Sort the pieces by their value to the user
+
+        :param user: The user to value the pieces with
+        :param pieces: The pieces to sort by value
+        :param reverse: True to return in descending order
+        :returns: A list of (value, piece)
+        '''
+        values = self.values[self.user_index[user], self.columns(pieces)]
+        return sorted(zip(values, pieces), reverse=reverse)
+
+
+class PickEngine(object):
+    ''' Hands out the remaining pieces of a collection to users
+    that each take their favorite (or least favorite) piece.
+
+    Each user has a heap of the pieces ordered by the values in
+    a ValuationMatrix (built the first time the user is asked),
+    and a piece that is taken is only discarded once it reaches
+    the top of a heap. Handing out m pieces among n users then
+    costs O(m n log m) instead of a scan of the remaining pieces
+    for every pick. Ties are broken the same as choose_best_piece
+    and choose_worst_piece.
+    '''
+
+    def __init__(self, matrix, pieces, best=True):
+        ''' Initializes a new instance of the engine
+
+        :param matrix: The valuation matrix of the pieces
+        :param pieces: The pieces to hand out
+        :param best: True to pick the best pieces, False for the worst
+        '''
+        self.matrix = matrix
+        self.pieces = list(pieces)
+        self.best   = best
+        self.count  = len(self.pieces)
+        self.taken  = [False] * self.count
+        self.heaps  = {}                        # user -> heap of (value, rank, index)
+        self.index  = dict((id(p), k) for k, p in enumerate(self.pieces))
+        self.ranks  = [0] * self.count          # the order to break ties with
+        order = sorted(range(self.count), key=lambda k: (self.pieces[k], -k if best else k))
+        for rank, k in enumerate(order):
+            self.ranks[k] = rank
+
+    def __heap(self, user):
+        ''' Retrieve the heap of the supplied user with a
+        piece that has not been taken at the top.
+
+        :param user: The user to retrieve the heap of
+        :returns: The heap of the user
+        '''
+        heap = self.heaps.get(user)
+        if heap is None:
+            sign   = -1 if self.best else 1
+            row    = self.matrix.user_index[user]
+            values = self.matrix.values[row, self.matrix.columns(self.pieces)].tolist()
+            heap   = [(sign * v, sign * self.ranks[k], k)
+                for k, v in enumerate(values) if not self.taken[k]]
+            heapify(heap)
+            self.heaps[user] = heap
+        while heap and self.taken[heap[0][2]]:
+            heappop(heap)
+        if not heap:
+            raise ValueError("there are no pieces remaining")
+        return heap
+
+    def peek(self, user):
+        ''' Return the piece the user would pick without
+        removing it.
+
+        :param user: The user to choose for
+        :returns: The best (or worst) remaining piece
+        '''
+        return self.pieces[self.__heap(user)[0][2]]
+
+    def pick(self, user):
+        ''' Remove and return the piece the user picks
+
+        :param user: The user to choose for
+        :returns: The best (or worst) remaining piece
+        '''
+        piece = self.peek(user)
+        self.remove(piece)
+        return piece
+
+    def remove(self, piece):
+        ''' Remove the supplied piece from the remaining pieces
+
+        :param piece: The piece to remove
+        '''
+        k = self.index[id(piece)]
+        if self.taken[k]:
+            raise ValueError("this piece has already been taken")
+        self.taken[k] = True
+        self.count -= 1
+
+    def __contains__(self, piece):
+        k = self.index.get(id(piece))
+        return k is not None and not self.taken[k]
+
+    def __len__(self): return self.count
+
+
 class AlternationStrategy(object):
     ''' A collection of predefined alternation strategies
     that can be used to supply a user ordering for choosing
@@ -281,6 +607,7 @@ class AlternationStrategy(object):
         turns = list(users)
         sizes = int(ceil(sqrt(len(pieces))))
         for i in range(1, sizes):
+            if len(turns) >= len(pieces): break    # enough turns for every piece
             n = len(turns) / 2
             turns = turns + turns[n:] + turns[:n]
         return lambda: turns
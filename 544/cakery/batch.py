@@ -0,0 +1,266 @@
+'''
+------------------------------------------------------------
+Batch Division Runner
+------------------------------------------------------------
+
+This runs a large collection of randomized divisions over a
+process pool so that the algorithms can be compared and their
+parameters tuned. Each job is described by the name of the
+algorithm, the name of the user and cake factories, the number
+of users, and the seed used to generate the random input::
+
+    jobs    = create_jobs(['DubinsSpanier'], ['interval'], sizes=[2, 3], rounds=100)
+    summary = run_batch(jobs, open('results.json', 'w'))
+    print summary.statistics()
+
+The factories are referenced by name so that only the job
+description has to be sent to each worker. The random module
+is seeded with the job seed before the inputs are generated,
+so every job can be reproduced regardless of which worker (or
+in which order) it is run. Every algorithm is given the same
+seed (and so divides the same instance) for each combination
+of kind, size, and round, so their results can be compared.
+Each result is written to the output stream as it arrives, as
+either JSON lines or CSV.
+'''
+import csv
+import json
+import random
+import time
+import numpy as np
+from collections import namedtuple
+from fractions import Fraction as F
+from itertools import imap
+from multiprocessing import Pool
+from cakery.preference import ContinuousPreference, CountedPreference
+from cakery.preference import CollectionPreference, OrdinalPreference
+from cakery.preference import IntervalPreference, StepPreference
+from cakery.preference import GridPreference
+from cakery.resource import ContinuousResource, CountedResource
+from cakery.resource import CollectionResource, IntervalResource
+from cakery.resource import RectangleResource
+import cakery.algorithms
+
+
+# ------------------------------------------------------------
+# factories
+# ------------------------------------------------------------
+users = {
+    'continuous': lambda cake: ContinuousPreference.random(),
+    'counted':    lambda cake: CountedPreference.random(cake),
+    'collection': lambda cake: CollectionPreference.random(cake),
+    'ordinal':    lambda cake: OrdinalPreference.random(cake),
+    'interval':   lambda cake: IntervalPreference.random(3),
+    'step':       lambda cake: StepPreference.random(1000),
+    'grid':       lambda cake: GridPreference.random(),
+}
+
+cakes = {
+    'continuous': lambda: ContinuousResource(F(0), F(1)),
+    'counted':    lambda: CountedResource.random(10),
+    'collection': lambda: CollectionResource.random(10),
+    'ordinal':    lambda: CollectionResource.random(10),
+    'interval':   lambda: IntervalResource((F(0), F(1))),
+    'step':       lambda: IntervalResource((F(0), F(1))),
+    'grid':       lambda: RectangleResource((F(0), F(0), F(1), F(1))),
+}
+
+FIELDS = [
+    'algorithm', 'users', 'cake', 'size', 'seed', 'elapsed', 'error',
+    'proportional', 'equitable', 'envy-free', 'max envy',
+    'utilitarian welfare', 'egalitarian welfare',
+]
+
+Job = namedtuple('Job', 'algorithm users cake size seed')
+
+
+# ------------------------------------------------------------
+# jobs
+# ------------------------------------------------------------
+def create_jobs(algorithms, kinds, sizes=(2,), rounds=1, seed=0):
+    ''' Create the collection of jobs to run. A kind is
+    either the name of a matching user and cake factory or
+    a tuple of (user factory, cake factory) names.
+
+    :param algorithms: The names of the algorithms to run
+    :param kinds: The user and cake factories to run with
+    :param sizes: The numbers of users to run with
+    :param rounds: The number of times to run each combination
+    :param seed: The seed of the first instance
+    :returns: A list of the jobs to run
+    '''
+    jobs = []
+    for algorithm in algorithms:
+        instance = seed                         # every algorithm divides the same instances
+        for kind in kinds:
+            user, cake = (kind, kind) if isinstance(kind, basestring) else kind
+            for size in sizes:
+                for _ in xrange(rounds):
+                    jobs.append(Job(algorithm, user, cake, size, instance))
+                    instance += 1
+    return jobs
+
+
+def run_job(job):
+    ''' Run a single division job and return a record of
+    the result. Any error in the division is recorded
+    instead of being raised so the batch can continue.
+
+    :param job: The job to run
+    :returns: A dictionary record of the result
+    '''
+    record = dict(zip(Job._fields, job))
+    record['error'] = None
+    random.seed(job.seed)
+    np.random.seed(job.seed % 2**32)
+    started = time.time()
+    try:
+        cake    = cakes[job.cake]()
+        people  = [users[job.users](cake) for _ in xrange(job.size)]
+        factory = getattr(cakery.algorithms, job.algorithm)
+        divider = factory(people, cake)
+        results = divider.divide()
+        if isinstance(results, tuple):
+            results = results[0]
+        record['elapsed'] = time.time() - started
+        for key, value in divider.report(results).summary().items():
+            record[key] = value if isinstance(value, bool) else float(value)
+    except Exception, ex:
+        record['elapsed'] = time.time() - started
+        record['error'] = "%s: %s" % (ex.__class__.__name__, ex)
+    return record
+
+
+# ------------------------------------------------------------
+# output
+# ------------------------------------------------------------
+def create_writer(stream, format='json'):
+    ''' Create a function that writes each record to the
+    supplied stream in the requested format.
+
+    :param stream: The stream to write to (or None to discard)
+    :param format: The format to write (json or csv)
+    :returns: A function that writes a single record
+    '''
+    if stream is None:
+        return lambda record: None
+    if format == 'json':
+        def writer(record):
+            stream.write(json.dumps(record, sort_keys=True) + "\n")
+        return writer
+    if format == 'csv':
+        output = csv.DictWriter(stream, FIELDS)
+        output.writerow(dict(zip(FIELDS, FIELDS)))
+        return output.writerow
+    raise ValueError("unknown batch output format %s" % format)
+
+
+class BatchSummary(object):
+    ''' Collects the aggregate statistics of a batch
+    run as the job records arrive.
+    '''
+
+    def __init__(self):
+        ''' Initializes a new instance of the summary
+        '''
+        self.records = {}
+        self.count   = 0
+        self.errors  = 0
+        self.started = time.time()
+        self.stopped = None
+
+    def add(self, record):
+        ''' Add the next job record to the summary
+
+        :param record: The job record to add
+        '''
+        self.count += 1
+        self.errors += 1 if record['error'] else 0
+        self.records.setdefault(record['algorithm'], []).append(record)
+
+    def finish(self):
+        ''' Mark the batch run as finished
+        '''
+        self.stopped = time.time()
+
+    @property
+    def elapsed(self):
+        ''' The total time the batch has been running
+
+        :returns: The elapsed time in seconds
+        '''
+        return (self.stopped or time.time()) - self.started
+
+    @property
+    def throughput(self):
+        ''' The number of jobs completed every second
+
+        :returns: The number of jobs per second
+        '''
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed else 0.0
+
+    def statistics(self):
+        ''' Return the fairness statistics of each algorithm.
+        The fairness properties are reported as the rate of
+        the successful divisions that had them, and the envy
+        and welfare values as their mean.
+
+        :returns: A dictionary of {algorithm: statistics}
+        '''
+        statistics = {}
+        for algorithm, records in self.records.items():
+            passed = [r for r in records if not r['error']]
+            mean = lambda key: sum(r[key] for r in passed) / float(len(passed)) if passed else 0.0
+            statistics[algorithm] = {
+                'runs':                len(records),
+                'errors':              len(records) - len(passed),
+                'elapsed':             sum(r['elapsed'] for r in records) / float(len(records)),
+                'proportional':        mean('proportional'),
+                'equitable':           mean('equitable'),
+                'envy-free':           mean('envy-free'),
+                'max envy':            mean('max envy'),
+                'utilitarian welfare': mean('utilitarian welfare'),
+                'egalitarian welfare': mean('egalitarian welfare'),
+            }
+        return statistics
+
+
+# ------------------------------------------------------------
+# runner
+# ------------------------------------------------------------
+def run_batch(jobs, stream=None, format='json', processes=None, chunksize=1):
+    ''' Run the supplied jobs over a process pool and
+    stream each result to the output as it completes.
+
+    :param jobs: The jobs to run (see create_jobs)
+    :param stream: The stream to write the results to
+    :param format: The format to write the results in (json or csv)
+    :param processes: The number of worker processes (1 runs in process)
+    :param chunksize: The number of jobs to send to a worker at once
+    :returns: The BatchSummary of the run
+    '''
+    writer  = create_writer(stream, format)
+    summary = BatchSummary()
+    pool    = None if processes == 1 else Pool(processes)
+    try:
+        if pool: results = pool.imap_unordered(run_job, jobs, chunksize)
+        else: results = imap(run_job, jobs)
+        for record in results:
+            writer(record)
+            summary.add(record)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    summary.finish()
+    return summary
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "Job", "create_jobs", "run_job", "run_batch",
+    "create_writer", "BatchSummary",
+]
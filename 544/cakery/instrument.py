@@ -0,0 +1,259 @@
+'''
+------------------------------------------------------------
+Query Instrumentation
+------------------------------------------------------------
+
+The complexity of a fair division algorithm is usually stated
+in terms of the Robertson-Webb query model:
+
+* eval - ask a user the value of a piece (`user.value_of`)
+* cut  - ask a user for a piece of a given value (`cake.find_piece`,
+         or `cake.find_pieces` for one cut per weight)
+
+This module counts the queries that a divider actually issues.
+It is opt-in and only active while `divide` runs::
+
+    divider = instrument(DubinsSpanier(users, cake))
+    slices  = divider.divide()
+    print divider.queries.summary()
+
+The evaluations that a resource makes while answering a cut
+query are part of that cut, so they are counted separately as
+`internal` queries. The size (in bits) of the denominator of
+every rational value that is returned is also recorded, which
+shows how quickly exact arithmetic is growing.
+'''
+import time
+import threading
+from fractions import Fraction
+from functools import wraps
+from cakery.resource import Resource
+
+
+# ------------------------------------------------------------
+# helpers
+# ------------------------------------------------------------
+def _denominators(value):
+    ''' Walk the supplied value and yield the denominator
+    of every rational number found within it.
+
+    :param value: The value (or resource) to walk
+    :returns: A generator of the denominators
+    '''
+    if isinstance(value, Fraction):
+        yield value.denominator
+    elif isinstance(value, Resource):
+        for denominator in _denominators(value.value):
+            yield denominator
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            for denominator in _denominators(item):
+                yield denominator
+
+
+def _resource_types(name, klass=Resource):
+    ''' Return every resource type that defines its own
+    version of the named cut method.
+
+    :param name: The name of the cut method
+    :param klass: The root of the resource hierarchy
+    :returns: The list of resource types to instrument
+    '''
+    types = [klass] if name in klass.__dict__ else []
+    for subclass in klass.__subclasses__():
+        types.extend(_resource_types(name, subclass))
+    return types
+
+
+# ------------------------------------------------------------
+# counter
+# ------------------------------------------------------------
+class QueryCounter(object):
+    ''' Records the number of queries of each type that
+    were issued, the time spent answering them, and the
+    size of the denominators of the returned values.
+    '''
+
+    def __init__(self):
+        ''' Initializes a new instance of the counter
+        '''
+        self.counts = {'eval': 0, 'cut': 0, 'internal': 0}
+        self.times  = {'eval': 0.0, 'cut': 0.0}
+        self.bits   = []
+        self.depth  = 0     # the number of cuts being answered
+        self.muted  = 0     # the number of evals being answered
+
+    def query(self, kind, method, *args, **kwargs):
+        ''' Issue a query while recording its statistics.
+        Evaluations made while answering a cut are counted
+        as internal queries instead of eval queries, and
+        the work done to answer an eval is not counted.
+
+        :param kind: The type of query (eval or cut)
+        :param method: The method that answers the query
+        :param args: The arguments to the query
+        :param count: The number of queries being issued at once
+        :returns: The result of the query
+        '''
+        count = kwargs.get('count', 1)
+        if self.muted or (kind == 'cut' and self.depth):
+            return method(*args)
+        if kind == 'eval' and self.depth:
+            self.counts['internal'] += count
+            kind = None
+
+        self.muted += 1 if kind != 'cut' else 0
+        self.depth += 1 if kind == 'cut' else 0
+        started = time.time()
+        try: result = method(*args)
+        finally:
+            self.muted -= 1 if kind != 'cut' else 0
+            self.depth -= 1 if kind == 'cut' else 0
+            if kind: self.times[kind] += time.time() - started
+        if kind:
+            self.counts[kind] += count
+            self.bits.extend(d.bit_length() for d in _denominators(result))
+        return result
+
+    def summary(self):
+        ''' Return a dictionary summary of the queries
+
+        :returns: A dictionary of the query statistics
+        '''
+        bits = self.bits or [0]
+        return {
+            'eval':      self.counts['eval'],
+            'cut':       self.counts['cut'],
+            'internal':  self.counts['internal'],
+            'eval time': self.times['eval'],
+            'cut time':  self.times['cut'],
+            'max denominator bits':  max(bits),
+            'mean denominator bits': sum(bits) / float(len(bits)),
+        }
+
+    def __str__(self):
+        ''' Returns a string representation of the counter
+
+        :returns: The string representation of this counter
+        '''
+        return "QueryCounter(eval=%d, cut=%d, internal=%d)" % (
+            self.counts['eval'], self.counts['cut'], self.counts['internal'])
+
+    __repr__ = __str__
+
+
+# ------------------------------------------------------------
+# instrumentation
+# ------------------------------------------------------------
+def _patch_user(user, counter):
+    ''' Replace the evaluation methods of the supplied user
+    with ones that report to the counter.
+
+    :param user: The user to instrument
+    :param counter: The counter to report to
+    :returns: A function to remove the instrumentation
+    '''
+    value_of, value_of_many = user.value_of, user.value_of_many
+    user.value_of = lambda resource: counter.query('eval', value_of, resource)
+
+    def counted_many(resources):
+        resources = list(resources)
+        return counter.query('eval', value_of_many, resources, count=len(resources))
+    user.value_of_many = counted_many
+
+    def restore():
+        del user.value_of
+        del user.value_of_many
+    return restore
+
+
+def _patch_resource(klass, users, counter):
+    ''' Replace the find_piece method of the supplied resource
+    type with one that reports cuts by the users to the counter.
+
+    :param klass: The resource type to instrument
+    :param users: The users whose cuts should be counted
+    :param counter: The counter to report to
+    :returns: A function to remove the instrumentation
+    '''
+    find_piece = klass.__dict__['find_piece']
+
+    @wraps(find_piece)
+    def counted(self, user, weight, *args, **kwargs):
+        method = lambda: find_piece(self, user, weight, *args, **kwargs)
+        if user not in users: return method()
+        return counter.query('cut', method)
+    klass.find_piece = counted
+
+    def restore():
+        klass.find_piece = find_piece
+    return restore
+
+
+def _patch_resource_many(klass, users, counter):
+    ''' Replace the find_pieces method of the supplied resource
+    type with one that reports a cut for each weight to the
+    counter (the cuts it makes itself are not counted again).
+
+    :param klass: The resource type to instrument
+    :param users: The users whose cuts should be counted
+    :param counter: The counter to report to
+    :returns: A function to remove the instrumentation
+    '''
+    find_pieces = klass.__dict__['find_pieces']
+
+    @wraps(find_pieces)
+    def counted(self, user, weights):
+        weights = list(weights)
+        method  = lambda: find_pieces(self, user, weights)
+        if user not in users: return method()
+        return counter.query('cut', method, count=len(weights))
+    klass.find_pieces = counted
+
+    def restore():
+        klass.find_pieces = find_pieces
+    return restore
+
+
+_patching = threading.RLock()   # the resource types are patched for every thread
+
+
+def instrument(divider):
+    ''' Instrument the supplied divider so that the queries
+    issued by each call to divide are counted. After divide
+    returns, the counts are available as `divider.queries`.
+    As the cut methods are patched on the resource types,
+    instrumented divisions in different threads are run one
+    at a time.
+
+    :param divider: The divider to instrument
+    :returns: The instrumented divider
+    '''
+    divide = divider.divide
+
+    @wraps(divide)
+    def instrumented():
+        counter  = QueryCounter()
+        users    = set(divider.users)
+        with _patching:
+            restores = [_patch_user(user, counter) for user in users]
+            restores.extend(_patch_resource(klass, users, counter)
+                for klass in _resource_types('find_piece'))
+            restores.extend(_patch_resource_many(klass, users, counter)
+                for klass in _resource_types('find_pieces'))
+            divider.queries = counter
+            try: return divide()
+            finally:
+                for restore in reversed(restores): restore()
+
+    divider.queries = QueryCounter()
+    divider.divide  = instrumented
+    return divider
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "QueryCounter", "instrument",
+]
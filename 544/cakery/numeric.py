@@ -0,0 +1,246 @@
+'''
+------------------------------------------------------------
+Numeric Backends
+------------------------------------------------------------
+
+The arithmetic used by the resources, preferences, and the
+fairness checks is supplied by a numeric backend. The exact
+backend works with rational values (fractions.Fraction) and
+is suitable for audits, while the float backend works with
+float64 values and a configurable tolerance for throughput.
+
+The backend can be changed globally::
+
+    set_backend(FloatBackend(epsilon=1e-9))
+
+The exact backend can also bound the cost of the cut searches
+that are not solved directly. The default mediant search walks
+the Stern-Brocot tree, whose denominators can grow quickly near
+an irrational target, so a dyadic (bisection) or bounded (the
+mediant limited to a maximum denominator) search can be chosen::
+
+    set_backend(ExactBackend(search='bounded', limit=10**6, iterations=100))
+
+or for a block of code::
+
+    with using(FloatBackend()):
+        slices = divider.divide()
+'''
+from contextlib import contextmanager
+from fractions import Fraction as F
+
+
+# ------------------------------------------------------------
+# backends
+# ------------------------------------------------------------
+class ExactBackend(object):
+    ''' A numeric backend that performs all of its math
+    using rational values. Searches step with one of:
+
+    * mediant - the mediant of the bounds (a Stern-Brocot tree)
+    * dyadic  - the midpoint of the bounds (bisection)
+    * bounded - the mediant limited to a maximum denominator,
+      or the midpoint if that does not lie between the bounds
+    '''
+    name = 'exact'
+    searches = ('mediant', 'dyadic', 'bounded')
+
+    def __init__(self, epsilon=0, search='mediant', limit=10**6, iterations=10000):
+        ''' Initializes a new instance of the backend
+
+        :param epsilon: The tolerance used for comparisons
+        :param search: The method used to step a search
+        :param limit: The largest denominator of a bounded search step
+        :param iterations: The maximum number of steps of a search
+        '''
+        if search not in self.searches:
+            raise ValueError("unknown search method: %s" % search)
+        self.epsilon = F(epsilon)
+        self.search  = search
+        self.limit   = limit
+        self.iterations = iterations
+
+    def number(self, value):
+        ''' Convert a library constant to this backend
+
+        :param value: The value to convert
+        :returns: The converted value
+        '''
+        return F(value)
+
+    def fraction(self, numerator, denominator=1):
+        ''' Create the ratio of the supplied values
+
+        :param numerator: The numerator of the ratio
+        :param denominator: The denominator of the ratio
+        :returns: The ratio in this backend
+        '''
+        return F(numerator, denominator)
+
+    def coerce(self, value):
+        ''' Convert user supplied data to this backend. Exact
+        values are left as supplied so their type is preserved.
+
+        :param value: The value to convert
+        :returns: The converted value
+        '''
+        return value
+
+    def midpoint(self, low, high):
+        ''' Return the next search point between two bounds
+
+        :param low: The lower bound of the search
+        :param high: The upper bound of the search
+        :returns: The next point between the two bounds
+        '''
+        low, high = F(low), F(high)
+        if self.search == 'dyadic':
+            return (low + high) / 2
+        point = F(low.numerator + high.numerator, low.denominator + high.denominator)
+        if self.search == 'bounded':
+            point = point.limit_denominator(self.limit)
+            if not min(low, high) < point < max(low, high):
+                point = (low + high) / 2
+        return point
+
+    def find_point(self, probe, low, high, value, weight, shift):
+        ''' Search for the point at which the value of an
+        increasing probe reaches the requested weight. The
+        search stops as soon as a point within the shift of
+        the weight is found, or after the maximum number of
+        iterations, in which case the closest point seen is
+        returned.
+
+        :param probe: A function returning the value at a point
+        :param low: The lower bound of the search
+        :param high: The upper bound of the search (the starting point)
+        :param value: The value of the probe at the upper bound
+        :param weight: The weight we are attempting to hit
+        :param shift: The distance from the weight that is allowed
+        :returns: The (point, value) that was found
+        '''
+        best = (abs(value - weight), high, value)
+        for _ in xrange(self.iterations):
+            if best[0] <= shift: break
+            point = self.midpoint(low, high)
+            value = probe(point)
+            if   value > weight: high = point
+            elif value < weight: low  = point
+            best = min(best, (abs(value - weight), point, value))
+        return best[1:]
+
+    def is_close(self, this, that):
+        ''' Test if two values are equal within the tolerance
+
+        :param this: The first value to compare
+        :param that: The second value to compare
+        :returns: True if the values are close, False otherwise
+        '''
+        return abs(this - that) <= self.epsilon
+
+    def __str__(self):
+        ''' Returns a string representation of the backend
+
+        :returns: The string representation of this backend
+        '''
+        return "%s(%s)" % (self.name, self.epsilon)
+
+    __repr__ = __str__
+
+
+class FloatBackend(ExactBackend):
+    ''' A numeric backend that performs all of its math
+    using float64 values. Searches step by bisection and
+    comparisons are made within the supplied epsilon.
+    '''
+    name = 'float'
+
+    def __init__(self, epsilon=1e-9, iterations=10000):
+        ''' Initializes a new instance of the backend
+
+        :param epsilon: The tolerance used for comparisons
+        :param iterations: The maximum number of steps of a search
+        '''
+        self.epsilon = float(epsilon)
+        self.iterations = iterations
+
+    def number(self, value):
+        ''' Convert a library constant to this backend
+
+        :param value: The value to convert
+        :returns: The converted value
+        '''
+        return float(value)
+
+    def fraction(self, numerator, denominator=1):
+        ''' Create the ratio of the supplied values
+
+        :param numerator: The numerator of the ratio
+        :param denominator: The denominator of the ratio
+        :returns: The ratio in this backend
+        '''
+        return float(numerator) / denominator
+
+    def coerce(self, value):
+        ''' Convert user supplied data to this backend
+
+        :param value: The value to convert
+        :returns: The converted value
+        '''
+        return float(value)
+
+    def midpoint(self, low, high):
+        ''' Return the next search point between two bounds
+
+        :param low: The lower bound of the search
+        :param high: The upper bound of the search
+        :returns: The midpoint of the two bounds
+        '''
+        return (float(low) + float(high)) / 2
+
+
+# ------------------------------------------------------------
+# the current backend
+# ------------------------------------------------------------
+_backend = ExactBackend()
+
+
+def get_backend():
+    ''' Retrieve the currently active numeric backend
+
+    :returns: The active numeric backend
+    '''
+    return _backend
+
+
+def set_backend(backend):
+    ''' Change the globally active numeric backend
+
+    :param backend: The backend to activate
+    :returns: The previously active backend
+    '''
+    global _backend
+    _backend, previous = backend, _backend
+    return previous
+
+
+@contextmanager
+def using(backend):
+    ''' Activate the supplied backend for the duration
+    of a with block and restore the previous one after.
+
+    :param backend: The backend to activate
+    '''
+    previous = set_backend(backend)
+    try:
+        yield backend
+    finally: set_backend(previous)
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "ExactBackend", "FloatBackend",
+    "get_backend", "set_backend", "using",
+]
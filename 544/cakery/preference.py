@@ -1,9 +1,86 @@
+import os
 import sys
+import csv
+import numpy as np
+from contextlib import closing
 from fractions import Fraction as F
+from functools import wraps
+from itertools import izip, imap, groupby
 from random import random, shuffle
-from cakery.utilities import integrate
-from cakery.utilities import Interval
+from cakery.utilities import integrate, LRUCache
+from cakery.utilities import Interval, IntervalIndex
 from cakery.utilities import any_range
+from cakery.numeric import get_backend
+
+
+#------------------------------------------------------------
+# helpers
+#------------------------------------------------------------
+def cached(value_of):
+    ''' Decorate the valuation method of a preference so
+    that, if the preference cache is enabled, the values
+    are looked up by the snapshot of the resource.
+
+    :param value_of: The valuation method to decorate
+    :returns: The decorated valuation method
+    '''
+    @wraps(value_of)
+    def lookup(self, resource):
+        if self.valuations is None:
+            return value_of(self, resource)
+        key = resource.snapshot()
+        value = self.valuations.get(key, lookup)
+        if value is lookup:
+            value = value_of(self, resource)
+            self.valuations.put(key, value)
+        return value
+    return lookup
+
+
+def read_table(path):
+    ''' Read a columnar table of the preferences of many
+    users. The table is one of:
+
+    * a CSV file with a header row naming the columns
+    * an NPZ archive with an array for each column
+    * an NPY file of a structured array (memory mapped)
+
+    :param path: The path of the table to read
+    :returns: A dictionary of {column name: column values}
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npz':
+        with closing(np.load(path)) as table:
+            return dict((name, table[name].tolist()) for name in table.files)
+    if extension == '.npy':
+        table = np.load(path, mmap_mode='r')
+        return dict((name, table[name].tolist()) for name in table.dtype.names)
+    with open(path, 'rb') as handle:
+        header, _, body = handle.read().partition('\n')
+    names = [name.strip() for name in header.split(',')]
+    rows  = [row for row in body.splitlines() if row]
+    if '"' in body:                             # quoted cells need the csv module
+        rows    = list(csv.reader(rows))
+        _check_widths([len(row) for row in rows], len(names))
+        columns = zip(*rows) or [()] * len(names)
+    else: # split every cell at once and stride out the columns
+        _check_widths([row.count(',') + 1 for row in rows], len(names))
+        cells   = ','.join(rows).split(',') if rows else []
+        columns = [cells[n::len(names)] for n in xrange(len(names))]
+    return dict(zip(names, columns))
+
+
+def _check_widths(widths, width):
+    ''' Check that every row of a table has a cell for each
+    column, as a short (or long) row would shift every later
+    cell into the wrong column.
+
+    :param widths: The number of cells in each row
+    :param width: The number of columns in the header
+    '''
+    for line, count in enumerate(widths, 2):   # the header is the first line
+        if count != width:
+            raise ValueError("row %d has %d cells, expected %d" % (line, count, width))
 
 
 #------------------------------------------------------------
@@ -17,8 +94,26 @@ class Preference(object):
     preference type is strongly coupled to the underlying
     resource type. Trying to use mismatched types (Counted
     with Collection for example) will result in runtime errors.
+
+    .. attribute:: invertible
+
+       True if the preference exposes `cumulative(x)` and
+       `inverse(value)` so that cuts can be solved directly.
+
+    .. attribute:: valuations
+
+       The LRUCache of values keyed by resource snapshot
+       (None until the cache is enabled with `cache`).
+
+    .. attribute:: columns
+
+       The names of the (key, value) columns of a table of
+       these preferences (None if they cannot be loaded).
     '''
     __id = 1
+    invertible = False
+    valuations = None
+    columns = None
 
     def value_of(self, resource):
         ''' Given a resource, return the total value
@@ -29,6 +124,69 @@ class Preference(object):
         '''
         raise NotImplementedError("value_of")
 
+    def value_of_many(self, resources):
+        ''' Given a collection of resources, return the
+        total value of each resource to the current user.
+
+        :params resources: The resources to get the values of
+        :returns: A list of the values of each resource
+        '''
+        return [self.value_of(resource) for resource in resources]
+
+    def cache(self, size=1024):
+        ''' Enable a bounded cache of the valuations of this
+        user, so repeated valuations of identical pieces are
+        only computed once. The cache must be reset (by calling
+        this again) if the preference values are changed.
+
+        :param size: The number of valuations to keep (None to disable)
+        :returns: This preference
+        '''
+        self.valuations = LRUCache(size) if size else None
+        return self
+
+    @classmethod
+    def from_table(klass, table):
+        ''' A factory method to create the preferences of every
+        user in a columnar table in a single pass. The table has
+        a `user` column and the columns named by `klass.columns`,
+        with a row for each value of each user.
+
+        :param table: The path of the table (or the columns read from it)
+        :returns: A list of initialized Preferences (in table order)
+        '''
+        if not isinstance(table, dict):
+            table = read_table(table)
+        names = ('user',) + (klass.columns or ())
+        if not klass.columns or any(name not in table for name in names):
+            raise ValueError("the table needs the columns %s" % ', '.join(names))
+        keys, values = [table[name] for name in klass.columns]
+        runs, order, stop = {}, [], 0
+        for user, run in groupby(table['user']):                # the rows are usually
+            start, stop = stop, stop + len(list(run))           # grouped by user already
+            if user not in runs:
+                runs[user] = []
+                order.append(user)
+            runs[user].append(slice(start, stop))
+
+        def column(rows, user):
+            if len(runs[user]) == 1: return rows[runs[user][0]]
+            return [row for run in runs[user] for row in rows[run]]
+        return [klass.from_rows(user, column(keys, user), column(values, user))
+            for user in order]
+
+    @classmethod
+    def from_rows(klass, user, keys, values):
+        ''' A factory method to create a preference from the
+        rows of a table that belong to a single user.
+
+        :param user: The name or id of the participant
+        :param keys: The key column of the participant's rows
+        :param values: The value column of the participant's rows
+        :returns: An initialized Preference
+        '''
+        raise NotImplementedError("from_rows")
+
     def _get_user(self):
         ''' A helper method to return a unique
         username for undefined users.
@@ -55,20 +213,71 @@ class ContinuousPreference(Preference):
     ''' Represents the preference of a given user about a continuous
     resource. This preference is supplied by a function over a given
     interval.
+
+    By default the function is sampled once over [0, 1] into a
+    cumulative integral table (the trapezoidal rule at the given
+    resolution), so a valuation is an interpolated table lookup. The
+    exact mode integrates the function on every valuation instead.
     '''
 
-    def __init__(self, user, function, resolution=1000):
+    def __init__(self, user, function, resolution=1000, exact=False):
         ''' Initialize a new preference class
 
         :param user: The name or id of the participant
         :param function: The function that describes the user's preference
         :param resolution: The number of steps we will take in the integral
+        :param exact: True to integrate on every valuation
         '''
         self.user = user or self._get_user()
-        self.function = function
         self.resolution = resolution
-        self.total = integrate(self.function, F(0), F(1), self.resolution)
+        self.exact = exact
+        self.function = function
+        if self.exact:
+            numeric = get_backend()
+            self.total = integrate(self.function, numeric.number(0),
+                numeric.number(1), self.resolution)
+        else: self.total = self.index.total
+
+    def __get_function(self):
+        ''' Retrieve the function describing this preference
+
+        :returns: The preference function
+        '''
+        return self.__function
+
+    def __set_function(self, function):
+        ''' Update the function describing this preference
+        and rebuild the cumulative integral table for it.
+
+        :param function: The new preference function
+        '''
+        self.__function = function
+        self.index = None if self.exact else self.__build_index()
+        if self.valuations is not None: self.valuations.clear()
+
+    function = property(__get_function, __set_function)
+
+    def __build_index(self):
+        ''' A helper method to sample the preference function
+        into a cumulative integral table.
+
+        :returns: The cumulative index of the function
+        '''
+        numeric = get_backend()
+        points  = (numeric.fraction(i, self.resolution) for i in xrange(self.resolution + 1))
+        points  = [(x, numeric.coerce(self.function(x))) for x in points]
+        return IntervalIndex(Interval.create(points))
+
+    @property
+    def invertible(self):
+        ''' The cumulative table can only be inverted when
+        it is being used for valuations.
 
+        :returns: True if cuts can be solved directly
+        '''
+        return not self.exact
+
+    @cached
     def value_of(self, resource):
         ''' Given a resource, return the total value
         of this resource to the current user.
@@ -77,9 +286,29 @@ class ContinuousPreference(Preference):
         :returns: The total value of the items
         '''
         (x0, span) = resource.value
-        value = integrate(self.function, x0, x0 + span, self.resolution)
+        if self.exact:
+            value = integrate(self.function, x0, x0 + span, self.resolution)
+        else: value = self.index.area(x0, x0 + span)
         return value / self.total
 
+    def cumulative(self, x):
+        ''' Return the value of the resource from 0 to the
+        supplied point to the current user.
+
+        :param x: The point to find the cumulative value at
+        :returns: The value of the range [0, x]
+        '''
+        return self.index.cumulative(x) / self.total
+
+    def inverse(self, value):
+        ''' Return the first point at which the value of the
+        resource from 0 reaches the supplied value.
+
+        :param value: The cumulative value to find the point of
+        :returns: The point x such that cumulative(x) == value
+        '''
+        return self.index.inverse(value * self.total)
+
     @classmethod
     def random(klass):
         ''' A factory method to create a random
@@ -103,6 +332,8 @@ class CountedPreference(Preference):
     we care to retrieve (defaults to as many as possible).
     '''
 
+    columns = ('item', 'value')
+
     def __init__(self, user, values, counts=None):
         ''' Initialize a new preference class
 
@@ -115,6 +346,7 @@ class CountedPreference(Preference):
         self.counts = counts or dict((k, 1) for k in self.values)
         #self.counts = counts or dict((k, sys.maxint) for k in self.values)
 
+    @cached
     def value_of(self, resource):
         ''' Given a resource, return the total value
         of this resource to the current user.
@@ -143,6 +375,18 @@ class CountedPreference(Preference):
         values = dict((k, v / summed) for k, v in values.items())
         return klass(None, values)
 
+    @classmethod
+    def from_rows(klass, user, items, values):
+        ''' A factory method to create a preference from the
+        rows of a table that belong to a single user.
+
+        :param user: The name or id of the participant
+        :param items: The item column of the participant's rows
+        :param values: The value column of the participant's rows
+        :returns: An initialized Preference
+        '''
+        return klass(user, dict(izip(items, imap(float, values))))
+
     @classmethod
     def from_file(klass, filename):
         ''' A factory method to create a preference
@@ -171,6 +415,7 @@ class CollectionPreference(Preference):
     preferences collectively add up to specified resolution
     (or slightly less, but never more).
     '''
+    columns = ('item', 'value')
 
     def __init__(self, user, values):
         ''' Initialize a new preference class
@@ -181,6 +426,7 @@ class CollectionPreference(Preference):
         self.user = user or self._get_user()
         self.values = values or {}
 
+    @cached
     def value_of(self, resource):
         ''' Given a resource, return its total value
         to this user.
@@ -188,8 +434,27 @@ class CollectionPreference(Preference):
         :params resource: The resource to get the value of
         :returns: The total value of the items
         '''
+        items = set(resource.value)
         return sum(value for item, value in self.values.items()
-            if item in resource.value)
+            if item in items)
+
+    def value_of_many(self, resources):
+        ''' Given a collection of resources, return the
+        total value of each resource to the current user.
+
+        The values of each resource are looked up by item,
+        so valuing a collection of single items (as the
+        auctions do) does not walk every preference value.
+
+        :params resources: The resources to get the values of
+        :returns: A list of the values of each resource
+        '''
+        if self.valuations is not None:
+            return Preference.value_of_many(self, resources)
+        get = self.values.get
+        return [get(resource.value[0], 0) if len(resource.value) == 1
+            else sum(get(item, 0) for item in set(resource.value))
+            for resource in resources]
 
     @classmethod
     def random(klass, resource):
@@ -205,6 +470,18 @@ class CollectionPreference(Preference):
         values = dict((k, v / summed) for k, v in values.items())
         return klass(None, values)
 
+    @classmethod
+    def from_rows(klass, user, items, values):
+        ''' A factory method to create a preference from the
+        rows of a table that belong to a single user.
+
+        :param user: The name or id of the participant
+        :param items: The item column of the participant's rows
+        :param values: The value column of the participant's rows
+        :returns: An initialized Preference
+        '''
+        return klass(user, dict(izip(items, imap(float, values))))
+
     @classmethod
     def from_file(klass, filename):
         ''' A factory method to create a preference
@@ -249,11 +526,27 @@ class OrdinalPreference(CollectionPreference):
         shuffle(values)
         return klass(None, values)
 
+    @classmethod
+    def from_rows(klass, user, items, values):
+        ''' A factory method to create a preference from the
+        rows of a table that belong to a single user (the
+        items are ordered by their value).
+
+        :param user: The name or id of the participant
+        :param items: The item column of the participant's rows
+        :param values: The value column of the participant's rows
+        :returns: An initialized Preference
+        '''
+        rows = sorted(izip(imap(float, values), items), key=lambda row: row[0], reverse=True)
+        return klass(user, [item for _, item in rows])
+
 
 class IntervalPreference(Preference):
     ''' Represents the preference of a given user about a continuous
     resource over a collection of intervals.
     '''
+    invertible = True
+    columns = ('x', 'y')
 
     def __init__(self, user, intervals, resolution=100):
         ''' Initialize a new preference class
@@ -262,24 +555,47 @@ class IntervalPreference(Preference):
         :param inervals: The intervals to initialize with
         :param resolution: The number of steps we will take in the integral
         '''
+        numeric = get_backend()
+        points = [(numeric.coerce(x), numeric.coerce(y)) for x, y in intervals]
         self.user = user or self._get_user()
-        self.intervals = Interval.create(intervals)
-        self.total = sum(i.area(0, 1) for i in self.intervals)
+        self.intervals = Interval.create(points)
+        self.index = IntervalIndex(self.intervals)
+        self.total = self.index.total
         self.resolution = resolution
 
+    @cached
     def value_of(self, resource):
         ''' Given a resource, return the total value
         of this resource to the current user.
 
+        Each segment of the resource is valued with two
+        lookups in the cumulative area index.
+
         :params resource: The resource to get the value of
         :returns: The total value of the items
         '''
-        piece = 0
-        for a, b in resource.value:
-            for interval in self.intervals:
-                piece += interval.area(a, b)
+        piece = sum(self.index.area(a, b) for a, b in resource.value)
         return piece / self.total
 
+    def cumulative(self, x):
+        ''' Return the value of the resource from 0 to the
+        supplied point to the current user.
+
+        :param x: The point to find the cumulative value at
+        :returns: The value of the range [0, x]
+        '''
+        return self.index.cumulative(x) / self.total
+
+    def inverse(self, value):
+        ''' Return the first point at which the value of the
+        resource from 0 reaches the supplied value. This
+        solves the piecewise linear density analytically.
+
+        :param value: The cumulative value to find the point of
+        :returns: The point x such that cumulative(x) == value
+        '''
+        return self.index.inverse(value * self.total)
+
     @classmethod
     def random(klass, intervals):
         ''' A factory method to create a random
@@ -295,6 +611,19 @@ class IntervalPreference(Preference):
         points.append((1.0, random()))
         return klass(None, points)
 
+    @classmethod
+    def from_rows(klass, user, xs, ys):
+        ''' A factory method to create a preference from the
+        rows of a table that belong to a single user.
+
+        :param user: The name or id of the participant
+        :param xs: The x column of the participant's points
+        :param ys: The y column of the participant's points
+        :returns: An initialized Preference
+        '''
+        number = get_backend().number
+        return klass(user, zip(imap(number, xs), imap(number, ys)))
+
     @classmethod
     def from_file(klass, filename):
         ''' A factory method to create a preference
@@ -306,7 +635,7 @@ class IntervalPreference(Preference):
         points = []
         with open(filename) as handle:
             for line in handle:
-                x, y = [F(x) for x in line.split()]
+                x, y = [get_backend().number(x) for x in line.split()]
                 points.append((x, y))
         return klass(None, points)
 
@@ -324,3 +653,224 @@ class IntervalPreference(Preference):
             points.append((x, function(x)))
         points.append((1, function(1)))
         return klass(None, points)
+
+
+class StepPreference(Preference):
+    ''' Represents the preference of a given user about a continuous
+    resource as a step function: a density for each of a collection
+    of bins over [0, 1] (of equal width unless the edges are given).
+
+    The bins are kept with a table of the cumulative value at each
+    edge, so the value of any point is found with a bisection of the
+    edges and a cut is inverted with a bisection of the table, both
+    in O(log n) for n bins. This works with both the continuous and
+    the interval resources.
+    '''
+    invertible = True
+
+    def __init__(self, user, densities, edges=None, resolution=None):
+        ''' Initialize a new preference class
+
+        :param user: The name or id of the participant
+        :param densities: The density of the value in each bin
+        :param edges: The n + 1 edges of the bins (defaults to equal widths)
+        :param resolution: The number of steps we will take in a search
+        '''
+        self.user = user or self._get_user()
+        self.densities = np.asarray(densities, dtype=float)
+        self.edges = np.linspace(0.0, 1.0, len(self.densities) + 1) \
+            if edges is None else np.asarray(edges, dtype=float)
+        if len(self.edges) != len(self.densities) + 1:
+            raise ValueError("there must be an edge on each side of every bin")
+        if (self.densities < 0).any() or (np.diff(self.edges) <= 0).any():
+            raise ValueError("the densities must be positive and the edges increasing")
+        areas = self.densities * np.diff(self.edges)
+        self.table = np.concatenate(([0.0], np.cumsum(areas)))
+        self.total = self.table[-1]
+        self.resolution = resolution or len(self.densities)
+
+    def __cumulative(self, points):
+        ''' A helper method to find the unscaled cumulative
+        value at each of the supplied points.
+
+        :param points: The array of points to find the value at
+        :returns: The array of cumulative values
+        '''
+        points = np.clip(points, self.edges[0], self.edges[-1])
+        bins = np.searchsorted(self.edges, points, side='right') - 1
+        bins = np.clip(bins, 0, len(self.densities) - 1)
+        return self.table[bins] + self.densities[bins] * (points - self.edges[bins])
+
+    @cached
+    def value_of(self, resource):
+        ''' Given a resource, return the total value
+        of this resource to the current user.
+
+        :params resource: The resource to get the value of
+        :returns: The total value of the items
+        '''
+        if isinstance(resource.value, tuple):                   # a continuous resource
+            (x0, span) = resource.value
+            ranges = [(x0, x0 + span)]
+        else: ranges = resource.value
+        if not ranges: return 0.0
+        starts, stops = np.array(ranges, dtype=float).T
+        return float((self.__cumulative(stops) - self.__cumulative(starts)).sum() / self.total)
+
+    def cumulative(self, x):
+        ''' Return the value of the resource from 0 to the
+        supplied point to the current user.
+
+        :param x: The point to find the cumulative value at
+        :returns: The value of the range [0, x]
+        '''
+        return float(self.__cumulative(float(x)) / self.total)
+
+    def inverse(self, value):
+        ''' Return the first point at which the value of the
+        resource from 0 reaches the supplied value.
+
+        :param value: The cumulative value to find the point of
+        :returns: The point x such that cumulative(x) == value
+        '''
+        target = min(max(float(value), 0.0), 1.0) * self.total
+        index = int(np.searchsorted(self.table, target, side='left'))
+        if index == 0: return float(self.edges[0])
+        index = min(index, len(self.densities))
+        point = self.edges[index - 1] + (target - self.table[index - 1]) / self.densities[index - 1]
+        return float(min(point, self.edges[index]))
+
+    @classmethod
+    def random(klass, bins=100):
+        ''' A factory method to create a random
+        preference collection.
+
+        :param bins: The number of bins to create
+        :returns: An initialized Preference
+        '''
+        return klass(None, [random() for _ in xrange(bins)])
+
+    @classmethod
+    def from_file(klass, filename):
+        ''' A factory method to create a preference
+        collection from a settings file (the density
+        of each bin on its own line).
+
+        :param filename: The file to read preferences from
+        :returns: An initialized Preference
+        '''
+        return klass(None, np.loadtxt(filename, ndmin=1))
+
+
+class GridPreference(Preference):
+    ''' Represents the preference of a given user about a two
+    dimensional resource as a density for each cell of a grid
+    over the unit square (row i and column j cover the cell
+    [j/cols, (j+1)/cols] x [i/rows, (i+1)/rows]).
+
+    The grid is kept as a summed area table (an integral image),
+    so the value of the region below and to the left of any point
+    is a lookup of the table and its enclosing cell, and the value
+    of any axis aligned rectangle costs four of those lookups.
+    '''
+
+    def __init__(self, user, densities, resolution=100):
+        ''' Initialize a new preference class
+
+        :param user: The name or id of the participant
+        :param densities: The (rows, cols) array of the cell densities
+        :param resolution: The number of steps we will take in a search
+        '''
+        self.user = user or self._get_user()
+        self.densities = np.atleast_2d(np.asarray(densities, dtype=float))
+        if (self.densities < 0).any():
+            raise ValueError("the densities must be positive")
+        rows, cols = self.densities.shape
+        self.masses = self.densities / (rows * cols)
+        self.table = np.zeros((rows + 1, cols + 1))
+        self.table[1:, 1:] = self.masses.cumsum(axis=0).cumsum(axis=1)
+        self.total = float(self.integral(1.0, 1.0))     # so the whole cake is exactly 1
+        self.resolution = resolution
+
+    def edges(self, axis):
+        ''' Return the grid lines along the supplied axis,
+        between which the value of a sweep is linear.
+
+        :param axis: The axis (0 for x, 1 for y)
+        :returns: The array of the grid lines
+        '''
+        return np.linspace(0.0, 1.0, self.densities.shape[1 - axis] + 1)
+
+    def integral(self, xs, ys):
+        ''' Return the unscaled value of the region [0, x] x [0, y]
+        for each of the supplied points.
+
+        :param xs: The array of the x coordinates
+        :param ys: The array of the y coordinates
+        :returns: The array of the values of each region
+        '''
+        rows, cols = self.densities.shape
+        xs = np.clip(np.asarray(xs, dtype=float), 0.0, 1.0) * cols
+        ys = np.clip(np.asarray(ys, dtype=float), 0.0, 1.0) * rows
+        j = np.minimum(xs.astype(int), cols - 1)
+        i = np.minimum(ys.astype(int), rows - 1)
+        fx, fy = xs - j, ys - i                             # the fraction of the final cell
+        corner = self.table[i, j]
+        return (corner + fx * (self.table[i, j + 1] - corner)
+            + fy * (self.table[i + 1, j] - corner) + fx * fy * self.masses[i, j])
+
+    @cached
+    def value_of(self, resource):
+        ''' Given a resource, return the total value
+        of this resource to the current user.
+
+        :params resource: The resource to get the value of
+        :returns: The total value of the items
+        '''
+        if not resource.value: return 0.0
+        x0, y0, x1, y1 = np.array(resource.value, dtype=float).T
+        value = (self.integral(x1, y1) - self.integral(x0, y1)
+            - self.integral(x1, y0) + self.integral(x0, y0))
+        return float(value.sum() / self.total)
+
+    @classmethod
+    def random(klass, rows=10, cols=10):
+        ''' A factory method to create a random
+        preference collection.
+
+        :param rows: The number of rows of the grid
+        :param cols: The number of columns of the grid
+        :returns: An initialized Preference
+        '''
+        return klass(None, np.random.random((rows, cols)))
+
+    @classmethod
+    def from_file(klass, filename):
+        ''' A factory method to create a preference
+        collection from a settings file (a row of the
+        grid densities on each line).
+
+        :param filename: The file to read preferences from
+        :returns: An initialized Preference
+        '''
+        return klass(None, np.loadtxt(filename, ndmin=2))
+
+
+#------------------------------------------------------------
+# loaders
+#------------------------------------------------------------
+def load_preferences(path, kinds=None):
+    ''' Load the preferences of every user in a columnar
+    table, using the first preference type whose columns
+    are all present in the table.
+
+    :param path: The path of the table to read (or the columns read from it)
+    :param kinds: The preference types to try (in order)
+    :returns: A list of initialized Preferences
+    '''
+    table = path if isinstance(path, dict) else read_table(path)
+    kinds = kinds or [IntervalPreference, CollectionPreference]
+    for kind in kinds:
+        if all(name in table for name in ('user',) + kind.columns):
+            return kind.from_table(table)
+    raise ValueError("no matching user preference available")
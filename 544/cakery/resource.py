@@ -1,7 +1,41 @@
 import sys
+import numpy as np
+from collections import namedtuple
 from random import randint, sample, random
 from fractions import Fraction as F
-from cakery.utilities import any_range, powerset
+from cakery.utilities import any_range, IntervalSet
+from cakery.subsets import find_subset
+from cakery.numeric import get_backend
+
+
+#------------------------------------------------------------
+# helpers
+#------------------------------------------------------------
+def as_type(kind, value, limit=10**9):
+    ''' Convert the supplied value to the numeric type of
+    the resource. Floating point values converted to rationals
+    are snapped to the closest fraction with a bounded
+    denominator so exact cuts like 1/3 stay exact.
+
+    :param kind: The numeric type to convert to
+    :param value: The value to convert
+    :param limit: The largest denominator to snap to
+    :returns: The converted value
+    '''
+    if kind is F and isinstance(value, float):
+        return F(value).limit_denominator(limit)
+    return kind(value)
+
+
+#------------------------------------------------------------
+# snapshots
+#------------------------------------------------------------
+class Snapshot(namedtuple('Snapshot', 'kind value')):
+    ''' A frozen, hashable copy of a resource in a canonical
+    form, so two resources with the same contents have equal
+    snapshots (which makes them usable as cache keys).
+    '''
+    __slots__ = ()
 
 
 #------------------------------------------------------------
@@ -16,7 +50,12 @@ class Resource(object):
        The current value of this resource in which
        the type may be unique to the resource in
        question.
+
+    Clones share their value with the original until
+    either of them is modified in place (copy on write),
+    so cloning and probing a resource does not copy it.
     '''
+    _shared = False     # True if the value may be shared with a clone
 
     def actual_value(self):
         ''' Return an actual value that we can use for
@@ -43,6 +82,14 @@ class Resource(object):
         '''
         raise NotImplementedError("as_collection")
 
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form.
+
+        :returns: The Snapshot of this resource
+        '''
+        raise NotImplementedError("snapshot")
+
     def remove(self, piece):
         ''' Update this resource by removing the
         specified piece.
@@ -70,6 +117,23 @@ class Resource(object):
         '''
         raise NotImplementedError("find_piece")
 
+    def find_pieces(self, user, weights):
+        ''' Attempt to find consecutive pieces of the current
+        resource that meet each of the requested weights
+        according to the given user. Each piece is found in
+        what remains once the previous pieces are removed.
+
+        :param user: The user preferences to weight with
+        :param weights: The weights we are attempting to hit
+        :returns: The list of pieces matching each weight
+        '''
+        cake, pieces = self.clone(), []
+        for weight in weights:
+            piece = cake.find_piece(user, weight)
+            cake.remove(piece)
+            pieces.append(piece)
+        return pieces
+
     #------------------------------------------------------------
     # common methods
     #------------------------------------------------------------
@@ -82,6 +146,30 @@ class Resource(object):
         '''
         return cmp(this.value, that.value)
 
+    def _share(self, clone):
+        ''' Share the value of this resource with the supplied
+        (empty) clone, deferring the copy until either of them
+        is modified in place.
+
+        :param clone: The clone to share the value with
+        :returns: The initialized clone
+        '''
+        clone.value = self.value
+        clone._shared = self._shared = True
+        return clone
+
+    def _writable(self):
+        ''' Return the value of this resource, first copying
+        it if it may be shared with a clone, so that it can
+        be modified in place.
+
+        :returns: The unshared value of this resource
+        '''
+        if self._shared:
+            self.value = type(self.value)(self.value)
+            self._shared = False
+        return self.value
+
     #------------------------------------------------------------
     # the magic methods
     #------------------------------------------------------------
@@ -125,7 +213,8 @@ class ContinuousResource(Resource):
 
         :returns: An initialized resource
         '''
-        return klass(F(0,1), F(0, 1))
+        numeric = get_backend()
+        return klass(numeric.number(0), numeric.number(0))
 
     @classmethod
     def random(klass):
@@ -134,9 +223,10 @@ class ContinuousResource(Resource):
 
         :returns: An initialized resource
         '''
-        start = F(randint(0, 1), 2)
-        span  = F(1, randint(1, 10))
-        span  = F(1, 1) if start == span else span
+        numeric = get_backend()
+        start = numeric.fraction(randint(0, 1), 2)
+        span  = numeric.fraction(1, randint(1, 10))
+        span  = numeric.number(1) if start == span else span
         return klass(start, span)
 
     def actual_value(self):
@@ -155,7 +245,7 @@ class ContinuousResource(Resource):
         :returns: The collection of resources
         '''
         (start, span) = self.value
-        step = F(start + span, self.resolution)
+        step = (start + span) / get_backend().number(self.resolution)
         pieces = []
         points = any_range(start + step, start + span, step)
         for point in points:
@@ -172,6 +262,14 @@ class ContinuousResource(Resource):
         (start, span) = self.value
         return ContinuousResource(start, span)
 
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form.
+
+        :returns: The Snapshot of this resource
+        '''
+        return Snapshot(type(self), tuple(self.value))
+
     def remove(self, piece):
         ''' Update this resource by removing the
         specified piece.
@@ -220,26 +318,66 @@ class ContinuousResource(Resource):
         that meets the requested weight according to the
         given user.
 
-        This is implemented with a Stern-Brocot tree.
+        If the user exposes an inverse of their cumulative
+        value, the cut is solved directly, otherwise this is
+        searched for as configured by the numeric backend
+        (a Stern-Brocot tree by default).
 
         :param user: The user preferences to weight with
         :param weight: The weight we are attempting to hit
         :returns: The first piece matching that weight
         '''
-        shift = F(1, user.resolution)
+        numeric = get_backend()
+        shift = numeric.fraction(1, user.resolution)
         cake, value = self.clone(), user.value_of(self)
         if value < weight:
             raise ValueError("cannot find a piece with this weight")
 
-        l, h = F(0, 1), F(cake.value[1])
-        while abs(value - weight) > shift:
-            m = F(l.numerator + h.numerator, l.denominator + h.denominator)
-            cake.value = (cake.value[0], m)
-            value = user.value_of(cake)
-            if   value > weight: h = m
-            elif value < weight: l = m
+        if getattr(user, 'invertible', False):
+            start = cake.value[0]
+            stop  = user.inverse(user.cumulative(start) + weight)
+            cake.value = (start, as_type(type(start), stop - start))
+            return cake
+
+        def probe(span):
+            cake.value = (cake.value[0], span)
+            return user.value_of(cake)
+
+        span, _ = numeric.find_point(probe, numeric.number(0),
+            cake.value[1], value, weight, shift)
+        cake.value = (cake.value[0], span)
         return cake
 
+    def find_pieces(self, user, weights):
+        ''' Attempt to find consecutive pieces of the current
+        resource that meet each of the requested weights
+        according to the given user.
+
+        If the user exposes an inverse of their cumulative
+        value, every cut is placed in a single sweep from the
+        start of the resource, otherwise each piece is searched
+        for in turn.
+
+        :param user: The user preferences to weight with
+        :param weights: The weights we are attempting to hit
+        :returns: The list of pieces matching each weight
+        '''
+        if not getattr(user, 'invertible', False):
+            return super(ContinuousResource, self).find_pieces(user, weights)
+        if user.value_of(self) < sum(weights):
+            raise ValueError("cannot find a piece with this weight")
+
+        pieces, start = [], self.value[0]
+        total = user.cumulative(start)
+        for weight in weights:
+            total += weight
+            span = as_type(type(start), user.inverse(total) - start)
+            piece = self.clone()
+            piece.value = (start, span)
+            pieces.append(piece)
+            start += span
+        return pieces
+
 
 class CountedResource(Resource):
     ''' Represents a discrete resource that may
@@ -304,7 +442,17 @@ class CountedResource(Resource):
 
         :returns: A clone of the current resource
         '''
-        return CountedResource(dict(self.value))
+        return self._share(CountedResource({}))
+
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form (the
+        items that have no supply are dropped).
+
+        :returns: The Snapshot of this resource
+        '''
+        items = frozenset((k, v) for k, v in self.value.items() if v > 0)
+        return Snapshot(type(self), items)
 
     def remove(self, piece):
         ''' Update this resource by removing the
@@ -315,11 +463,12 @@ class CountedResource(Resource):
         for key, value in piece.value.items():
             if self.value.get(key, -1) - value < 0:
                 raise ValueError("not enough supply to remove")
-            self.value[key] -= value
 
-        for key, value in self.value.items():
-            if self.value[key] == 0:
-                del self.value[key]
+        items = self._writable()
+        for key, value in piece.value.items():
+            items[key] -= value
+            if items[key] == 0:
+                del items[key]
 
     def append(self, piece):
         ''' Update this resource by adding the
@@ -327,37 +476,39 @@ class CountedResource(Resource):
 
         :param piece: The piece to append to this
         '''
+        items = self._writable()
         for key, value in piece.value.items():
-            current = self.value.get(key, 0)
-            self.value[key] = current + value
+            items[key] = items.get(key, 0) + value
 
-    def find_piece(self, user, weight):
+    def find_piece(self, user, weight, method='auto'):
         ''' Attempt to find a piece of the current resource
         that meets the requested weight according to the
         given user.
 
+        Each item may be chosen up to the number of copies
+        that still add value for the user (their multiplicity).
+
         :param user: The user preferences to weight with
         :param weight: The weight we are attempting to hit
+        :param method: The subset sum method to use (see cakery.subsets)
         :returns: The first piece matching that weight
         '''
-        cake, items = self.clone(), {}
-        piece = (sys.maxint, []) # a proposed slice in the resource
+        cake, items = self.clone(), []
         value = user.value_of(cake)
         if value < weight:
             raise ValueError("cannot find a piece with this weight")
 
-        for item in self.value: # TODO what about N repeats?
+        for item, count in self.value.items():
             cake.value = {item: 1}
-            items[item] = user.value_of(cake)
+            single = user.value_of(cake)
+            cake.value = {item: count}
+            total = user.value_of(cake)
+            if single and total != single * count:
+                count = max(1, int(total / single))
+            items.append((item, single, count))
 
-        # try all possible combinations of resources until we
-        # find one that matches the weight we are looking for
-        # otherwise, find smallest difference from our weight
-        for possible in powerset(self.value):
-            value = abs(weight - sum(items[k] for k in possible))
-            piece = min(piece, (value, list(possible)))
-            if value == 0: break
-        return CountedResource(piece[1])
+        _, piece = find_subset(items, weight, method)
+        return CountedResource(piece)
 
 
 class CollectionResource(Resource):
@@ -422,7 +573,16 @@ class CollectionResource(Resource):
 
         :returns: A clone of the current resource
         '''
-        return CollectionResource(list(self.value))
+        return self._share(CollectionResource([]))
+
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form (the
+        order of the items is ignored).
+
+        :returns: The Snapshot of this resource
+        '''
+        return Snapshot(type(self), frozenset(self.value))
 
     def remove(self, piece):
         ''' Update this resource by removing the
@@ -438,43 +598,38 @@ class CollectionResource(Resource):
 
         :param piece: The piece to append to this
         '''
-        self.value.extend(piece.value)
+        self._writable().extend(piece.value)
 
-    def find_piece(self, user, weight):
+    def find_piece(self, user, weight, method='auto'):
         ''' Attempt to find a piece of the current resource
         that meets the requested weight according to the
         given user.
 
         :param user: The user preferences to weight with
         :param weight: The weight we are attempting to hit
+        :param method: The subset sum method to use (see cakery.subsets)
         :returns: The first piece matching that weight
         '''
-        cake, items = self.clone(), {}
-        piece = (sys.maxint, []) # a proposed slice in the resource
+        cake, items = self.clone(), []
         value = user.value_of(cake)
         if value < weight:
             raise ValueError("cannot find a piece with this weight")
 
         for item in self.value:
             cake.value = [item]
-            items[item] = user.value_of(cake)
+            items.append((item, user.value_of(cake), 1))
 
-        # try all possible combinations of resources until we
-        # find one that matches the weight we are looking for
-        # otherwise, find smallest difference from our weight
-        for possible in powerset(self.value): # preserve original order
-            value = abs(weight - sum(items[k] for k in possible))
-            piece = min(piece, (value, list(possible)))
-            if value == 0: break
-        return CollectionResource(piece[1])
+        _, piece = find_subset(items, weight, method)
+        return CollectionResource([v for v in self.value if v in piece])
 
 
 class IntervalResource(Resource):
     ''' Represents a continuous resource that exists
     over a collection of intervals.
 
-    This is represented internally as a list of ranges
-    [(start, stop)].
+    This is represented internally as a sorted list of
+    ranges [(start, stop)] (an IntervalSet), so that pieces
+    can be removed and appended without walking every range.
     '''
 
     def __init__(self, points, resolution=100):
@@ -483,11 +638,32 @@ class IntervalResource(Resource):
         :param points: The collection of points
         :param resolution: The number of pieces to create
         '''
-        if not isinstance(points, list):
-            points = [points]
+        if isinstance(points, IntervalSet):
+            points = IntervalSet(points)
         self.value = points
         self.resolution = resolution
 
+    def __get_value(self):
+        ''' Retrieve the ranges of this resource
+
+        :returns: The IntervalSet of ranges
+        '''
+        return self.__value
+
+    def __set_value(self, points):
+        ''' Update the ranges of this resource (an IntervalSet
+        is used as is, anything else is converted to one).
+
+        :param points: The range or collection of ranges
+        '''
+        if not isinstance(points, IntervalSet):
+            if not isinstance(points, list):
+                points = [points]
+            points = IntervalSet(points)
+        self.__value = points
+
+    value = property(__get_value, __set_value)
+
     @classmethod
     def empty(klass):
         ''' A factory method to create an empty
@@ -543,8 +719,23 @@ class IntervalResource(Resource):
 
         :returns: A clone of the current resource
         '''
-        value = list(self.value)
-        return IntervalResource(value)
+        return self._share(IntervalResource([]))
+
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form (the
+        empty ranges are dropped and touching ranges merged).
+
+        :returns: The Snapshot of this resource
+        '''
+        ranges = []
+        for start, stop in self.value:
+            if start >= stop: continue
+            if ranges and start <= ranges[-1][1]:
+                first, last = ranges.pop()
+                start, stop = first, max(last, stop)
+            ranges.append((start, stop))
+        return Snapshot(type(self), tuple(ranges))
 
     def remove(self, piece):
         ''' Update this resource by removing the
@@ -552,37 +743,11 @@ class IntervalResource(Resource):
 
         :param piece: The piece to remove from this
         '''
-        this = list(self.value)
+        if not all(self.value.covers(s, e) for s, e in piece.value):
+            raise ValueError("cannot remove this piece")
+        ranges = self._writable()
         for s, e in piece.value:
-            i = 0
-            while True:
-                if i >= len(this):
-                    raise ValueError("cannot remove this piece")
-                x1, x2 = this[i]
-                if s == x1:                 # [s.........x2]
-                    if   e == x2:           # [s..........e]
-                        this.pop(i)         # []
-                        break
-                    elif e  < x2:           # [s....e....x2]
-                        this[i] = (e, x2)   #      [e....x2]
-                        break
-                    else:                   # [s...x2][...e]
-                        this.pop(i)         # []      [...e]
-                        s = x2              #         [s..e]
-                elif s > x1 and s < x2:     # [x1....s.....]
-                    if   e == x2:           # [x1....s....e]
-                        this[i] = (x1, s)   # [x1....s]
-                        break
-                    elif e  < x2:           # [x1..s..e..x2]
-                        this[i] = (x1, s)   # [x1..s]
-                        this.insert(i + 1, (e, x2)) # [e.x2]
-                        break;
-                    else:                   # [x1.s.x2][..e]
-                        this[i] = (x1, s)   # [x1.s]
-                        s = x2
-                        i += 1
-                else: i += 1                # [x1.x2][.s..e]
-        self.value = this
+            ranges.discard(s, e)
 
     def append(self, piece):
         ''' Update this resource by adding the
@@ -592,41 +757,99 @@ class IntervalResource(Resource):
 
         :param piece: The piece to append to this
         '''
-        i, values = 0, sorted(self.value + piece.value)
-        while i < len(values) - 1:
-            a1, a2 = values[i]
-            b1, b2 = values[i + 1]
-            if b1 <= a2:
-                values[i] = (a1, b2)
-                values.pop(i + 1)
-            else: i += 1
-        self.value = values
+        ranges = self._writable()
+        for s, e in piece.value:
+            ranges.add(s, e)
 
     def find_piece(self, user, weight):
         ''' Attempt to find a piece of the current resource
         that meets the requested weight according to the
         given user.
 
-        This is implemented with a Stern-Brocot tree.
+        If the user exposes an inverse of their cumulative
+        value, the cut is solved directly, otherwise this is
+        searched for as configured by the numeric backend
+        (a Stern-Brocot tree by default).
 
         :param user: The user preferences to weight with
         :param weight: The weight we are attempting to hit
         :returns: The first piece matching that weight
         '''
-        shift = F(1, user.resolution)
+        numeric = get_backend()
+        shift = numeric.fraction(1, user.resolution)
         cake, value = self.clone(), user.value_of(self)
         if value < weight:
             raise ValueError("cannot find a piece with this weight")
 
-        l, h = F(cake.value[0][0]), F(cake.value[-1][-1])
-        while abs(value - weight) > shift:
-            m = F(l.numerator + h.numerator, l.denominator + h.denominator)
-            cake.value = self.__trim(m)
-            value = user.value_of(cake)
-            if   value > weight: h = m
-            elif value < weight: l = m
+        if getattr(user, 'invertible', False):
+            cake.value = self.__trim(self.__find_cut(user, weight))
+            return cake
+
+        def probe(stop):
+            cake.value = self.__trim(stop)
+            return user.value_of(cake)
+
+        stop, _ = numeric.find_point(probe, numeric.number(cake.value[0][0]),
+            numeric.number(cake.value[-1][-1]), value, weight, shift)
+        cake.value = self.__trim(stop)
         return cake
 
+    def find_pieces(self, user, weights):
+        ''' Attempt to find consecutive pieces of the current
+        resource that meet each of the requested weights
+        according to the given user.
+
+        If the user exposes an inverse of their cumulative
+        value, every cut is placed in a single walk of the
+        intervals, otherwise each piece is searched for in turn.
+
+        :param user: The user preferences to weight with
+        :param weights: The weights we are attempting to hit
+        :returns: The list of pieces matching each weight
+        '''
+        if not getattr(user, 'invertible', False):
+            return super(IntervalResource, self).find_pieces(user, weights)
+        if user.value_of(self) < sum(weights):
+            raise ValueError("cannot find a piece with this weight")
+
+        pieces, ranges, weights = [], [], list(weights)
+        target, total = weights[0] if weights else 0, 0
+        for a, b in self.value:
+            start = user.cumulative(a)
+            value = user.cumulative(b) - start
+            while len(pieces) < len(weights) and total + value >= target:
+                stop = as_type(type(a), user.inverse(start + target - total))
+                stop = min(b, max(a, stop))         # rounding may overshoot the interval
+                if a < stop: ranges.append((a, stop))
+                pieces.append(IntervalResource(ranges))
+                ranges, a = [], stop
+                if len(pieces) < len(weights):
+                    target += weights[len(pieces)]
+            if a < b: ranges.append((a, b))
+            total += value
+        while len(pieces) < len(weights):           # rounding left the last cuts at the end
+            pieces.append(IntervalResource(ranges))
+            ranges = []
+        return pieces
+
+    def __find_cut(self, user, weight):
+        ''' A helper method to find the point at which the
+        current intervals reach the requested weight by
+        walking the intervals and inverting the user's
+        cumulative value inside the final interval.
+
+        :param user: The user preferences to weight with
+        :param weight: The weight we are attempting to hit
+        :returns: The point to stop at
+        '''
+        for a, b in self.value:
+            start = user.cumulative(a)
+            value = user.cumulative(b) - start
+            if value >= weight:
+                return user.inverse(start + weight)
+            weight -= value
+        return self.value[-1][-1]
+
     def __trim(self, stop):
         ''' A helper method to trim the current
         intervals at the specified stopping point.
@@ -639,12 +862,288 @@ class IntervalResource(Resource):
         :param stop: The point to stop at
         :returns: The trimmed interval range
         '''
-        i, cake = 0, list(self.value)
-        while True:
-            a, b = cake[i]
-            if stop <= b:
-                cake[i] = (a, type(a)(stop))
-                cake = cake[:i + 1]
-                break;
-            else: i += 1
+        cake = self.value.head(stop)
+        if cake:
+            a, b = cake[-1]
+            cake[-1] = (a, as_type(type(a), b))
         return cake
+
+
+class RectangleResource(Resource):
+    ''' Represents a two dimensional resource (a parcel of
+    land for example) that exists over a collection of
+    disjoint axis aligned rectangles.
+
+    This is represented internally as a list of rectangles
+    [(x0, y0, x1, y1)]. A piece is cut from the resource by
+    sweeping a cut along one axis: a vertical cut (axis 0)
+    takes every part of the resource left of the cut and a
+    horizontal cut (axis 1) every part below it. Unless an
+    axis is supplied, the cut is swept along the longest
+    side of the resource.
+    '''
+
+    def __init__(self, rectangles, resolution=100, axis=None):
+        ''' Initializes a new instance of the resource
+
+        :param rectangles: The rectangle or collection of rectangles
+        :param resolution: The number of pieces to create
+        :param axis: The axis to sweep cuts along (0, 1, or None)
+        '''
+        if not isinstance(rectangles, list):
+            rectangles = [rectangles]
+        self.value = [tuple(rectangle) for rectangle in rectangles]
+        self.resolution = resolution
+        self.axis = axis
+
+    @classmethod
+    def empty(klass):
+        ''' A factory method to create an empty
+        resource.
+
+        :returns: An initialized resource
+        '''
+        return klass([])
+
+    @classmethod
+    def random(klass):
+        ''' A factory method to create a random
+        resource.
+
+        :returns: An initialized resource
+        '''
+        x0, y0 = random() / 2, random() / 2
+        return klass((x0, y0, x0 + random() / 2, y0 + random() / 2))
+
+    def actual_value(self):
+        ''' Return an actual value that we can use for
+        comparison for the algorithm (the area).
+
+        :returns: The actual value of the object
+        '''
+        return sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.value)
+
+    def as_collection(self):
+        ''' Return the underlying resource as a
+        collection of resources (one for each
+        discrete item
+
+        :returns: The collection of resources
+        '''
+        pieces = []
+        axis   = self.__get_axis()
+        value  = sum(r[axis + 2] - r[axis] for r in self.value)
+        steps  = value / self.resolution
+        for rectangle in self.value:
+            start, stop = rectangle[axis], rectangle[axis + 2]
+            for point in list(any_range(start + steps, stop, steps)) + [stop]:
+                if point <= start: continue
+                pieces.append(RectangleResource(self.__slice(rectangle, axis, start, point)))
+                start = point
+        return pieces
+
+    def clone(self):
+        ''' Return a clone of this resource that is
+        identical to the original.
+
+        :returns: A clone of the current resource
+        '''
+        return self._share(RectangleResource([], self.resolution, self.axis))
+
+    def snapshot(self):
+        ''' Return a frozen, hashable copy of the current
+        value of this resource in a canonical form (the
+        empty rectangles are dropped and the rest sorted).
+
+        :returns: The Snapshot of this resource
+        '''
+        rectangles = (r for r in self.value if r[0] < r[2] and r[1] < r[3])
+        return Snapshot(type(self), tuple(sorted(rectangles)))
+
+    def remove(self, piece):
+        ''' Update this resource by removing the
+        specified piece.
+
+        :param piece: The piece to remove from this
+        '''
+        numeric = get_backend()
+        covered = sum(self.__area(self.__intersect(a, b)) for a in self.value for b in piece.value)
+        if not numeric.is_close(covered, piece.actual_value()):
+            raise ValueError("cannot remove this piece")
+        rectangles = list(self.value)
+        for cut in piece.value:
+            rectangles = [r for rectangle in rectangles for r in self.__subtract(rectangle, cut)]
+        self.value, self._shared = rectangles, False
+
+    def append(self, piece):
+        ''' Update this resource by adding the
+        specified piece. Only the parts of the piece that
+        are not already covered are added, and the
+        rectangles that share a whole side are merged.
+
+        :param piece: The piece to append to this
+        '''
+        rectangles = self._writable()
+        for rectangle in piece.value:
+            parts = [rectangle]
+            for other in list(rectangles):
+                parts = [r for part in parts for r in self.__subtract(part, other)]
+            for part in parts:
+                rectangles.append(part)
+                self.__merge(rectangles)
+
+    def find_piece(self, user, weight):
+        ''' Attempt to find a piece of the current resource
+        that meets the requested weight according to the
+        given user.
+
+        If the user exposes the grid lines at which their
+        value changes, the cut is found with a binary search
+        over the grid lines and solved directly within the
+        final cell (where the value is linear in the cut),
+        otherwise this is searched for as configured by the
+        numeric backend.
+
+        :param user: The user preferences to weight with
+        :param weight: The weight we are attempting to hit
+        :returns: The first piece matching that weight
+        '''
+        numeric = get_backend()
+        shift = numeric.fraction(1, user.resolution)
+        cake, value = self.clone(), user.value_of(self)
+        if value < weight:
+            raise ValueError("cannot find a piece with this weight")
+
+        axis  = self.__get_axis()
+        low   = min(r[axis] for r in self.value)
+        high  = max(r[axis + 2] for r in self.value)
+
+        def probe(stop):
+            cake.value = self.__head(axis, stop)
+            return user.value_of(cake)
+
+        if hasattr(user, 'edges'):
+            stop = self.__sweep(user.edges(axis), axis, low, high, probe, weight)
+        else: stop, _ = numeric.find_point(probe, numeric.number(low),
+            numeric.number(high), value, weight, shift)
+        cake.value = self.__head(axis, stop)
+        return cake
+
+    #------------------------------------------------------------
+    # helper methods
+    #------------------------------------------------------------
+    def __get_axis(self):
+        ''' A helper method to return the axis to cut along
+        (the longest side of the resource by default).
+
+        :returns: The axis to cut along
+        '''
+        if self.axis is not None or not self.value:
+            return self.axis or 0
+        width  = max(r[2] for r in self.value) - min(r[0] for r in self.value)
+        height = max(r[3] for r in self.value) - min(r[1] for r in self.value)
+        return 0 if width >= height else 1
+
+    def __sweep(self, edges, axis, low, high, probe, weight):
+        ''' A helper method to find the cut at which the value
+        swept along the axis reaches the requested weight. The
+        value is linear between the grid lines and the sides of
+        the rectangles, so those are binary searched and the
+        final segment is solved directly.
+
+        :param edges: The grid lines of the user along the axis
+        :param axis: The axis to sweep along
+        :param low: The start of the sweep
+        :param high: The end of the sweep
+        :param probe: A function of a cut to the value before it
+        :param weight: The weight we are attempting to hit
+        :returns: The point to stop at
+        '''
+        edges  = np.asarray(edges, dtype=float)
+        edges  = edges[(edges > float(low)) & (edges < float(high))]
+        sides  = [float(r[n]) for r in self.value for n in (axis, axis + 2)]
+        points = np.union1d(edges, sides).tolist()
+        lower, upper = 0, len(points) - 1
+        while upper - lower > 1:                            # find the segment of the weight
+            middle = (lower + upper) // 2
+            if probe(points[middle]) < weight: lower = middle
+            else: upper = middle
+        a, b = points[lower], points[upper]
+        fa, fb = probe(a), probe(b)
+        if fb <= fa: return b
+        return min(b, a + (float(weight) - fa) * (b - a) / (fb - fa))
+
+    def __head(self, axis, stop):
+        ''' A helper method to trim the current rectangles at
+        the specified stopping point along the axis.
+
+        This method makes sure to use the supplied numeric type
+        in the new rectangles (not the stop value).
+
+        :param axis: The axis to trim along
+        :param stop: The point to stop at
+        :returns: The trimmed rectangles
+        '''
+        head = []
+        for rectangle in self.value:
+            start = rectangle[axis]
+            if start >= stop: continue
+            kind  = F if isinstance(start, (int, long)) else type(start)
+            point = min(rectangle[axis + 2], as_type(kind, stop))
+            head.append(self.__slice(rectangle, axis, start, point))
+        return head
+
+    @staticmethod
+    def __slice(rectangle, axis, start, stop):
+        ''' Return the part of the rectangle between the start
+        and the stop along the supplied axis.
+        '''
+        x0, y0, x1, y1 = rectangle
+        return (start, y0, stop, y1) if axis == 0 else (x0, start, x1, stop)
+
+    @staticmethod
+    def __area(rectangle):
+        ''' Return the area of the rectangle (or 0 for None) '''
+        if not rectangle: return 0
+        x0, y0, x1, y1 = rectangle
+        return (x1 - x0) * (y1 - y0)
+
+    @staticmethod
+    def __intersect(this, that):
+        ''' Return the intersection of two rectangles (or None) '''
+        x0, y0 = max(this[0], that[0]), max(this[1], that[1])
+        x1, y1 = min(this[2], that[2]), min(this[3], that[3])
+        return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+    @classmethod
+    def __subtract(klass, this, that):
+        ''' Return the rectangles that cover this rectangle
+        once the other rectangle has been removed from it.
+        '''
+        inside = klass.__intersect(this, that)
+        if not inside: return [this]
+        x0, y0, x1, y1 = this
+        i0, j0, i1, j1 = inside
+        pieces = [
+            (x0, y0, i0, y1), (i1, y0, x1, y1),             # the left and right strips
+            (i0, y0, i1, j0), (i0, j1, i1, y1),             # the bottom and top strips
+        ]
+        return [p for p in pieces if p[0] < p[2] and p[1] < p[3]]
+
+    @staticmethod
+    def __merge(rectangles):
+        ''' Merge the last rectangle with any of the others
+        that it shares a whole side with (in place).
+        '''
+        while len(rectangles) > 1:
+            x0, y0, x1, y1 = rectangles[-1]
+            for index, (a0, b0, a1, b1) in enumerate(rectangles[:-1]):
+                if (b0, b1) == (y0, y1) and (a1 == x0 or x1 == a0):
+                    merged = (min(a0, x0), y0, max(a1, x1), y1)
+                elif (a0, a1) == (x0, x1) and (b1 == y0 or y1 == b0):
+                    merged = (x0, min(b0, y0), x1, max(b1, y1))
+                else: continue
+                rectangles.pop(index)
+                rectangles[-1] = merged
+                break
+            else: return
@@ -0,0 +1,248 @@
+'''
+------------------------------------------------------------
+Division Service
+------------------------------------------------------------
+
+Every script in `contrib/scripts` starts a new interpreter,
+imports the algorithms, and reads the preference files for a
+single division. This service instead stays running and
+answers division requests as JSON lines, so that the startup
+cost is only paid once::
+
+    $ ./division_service.py < requests.json
+    $ ./division_service.py --socket /tmp/cakery.sock
+
+Each request names the algorithm and its users, which are
+either the paths of the preference files of each user, the
+path of a table of every user (see `load_preferences`), or
+the columns of such a table inline::
+
+    {"id": 1, "algorithm": "AlternatingChoice", "users": ["data/bidding1", "data/bidding2"]}
+    {"id": 2, "algorithm": "DubinsSpanier", "table": "data/table/interval.csv", "seed": 42}
+    {"id": 3, "algorithm": "AlternatingChoice",
+     "table": {"user": ["a", "b"], "item": ["x", "y"], "value": [1, 2]}}
+
+A batch is a JSON list of requests on a single line. A
+result is written (and flushed) as soon as each division
+completes, with the shares of each user and the fairness
+summary of the division (as in `cakery.batch`). The
+algorithms and the preferences loaded from files are kept
+between requests, and a file is only read again once it has
+been modified.
+'''
+import os
+import sys
+import stat
+import json
+import time
+import random
+import threading
+import SocketServer
+from fractions import Fraction
+from cakery.preference import IntervalPreference, CollectionPreference
+from cakery.preference import load_preferences
+from cakery.resource import Resource, IntervalResource, CollectionResource
+from cakery.algorithms.registry import registry, get_algorithm
+
+
+# ------------------------------------------------------------
+# helpers
+# ------------------------------------------------------------
+cakes = {
+    'IntervalPreference':   lambda users: IntervalResource((Fraction(0), Fraction(1))),
+    'CollectionPreference': lambda users: CollectionResource(
+        sorted(set(item for user in users for item in user.values))),
+}
+
+
+def _encode(value):
+    ''' Convert the values that json cannot serialize. A
+    resource is encoded as the value of its snapshot.
+
+    :param value: The value to encode
+    :returns: The json serializable value
+    '''
+    if isinstance(value, Resource):
+        return value.snapshot().value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Fraction):
+        return float(value)
+    raise TypeError("%r is not JSON serializable" % value)
+
+
+# ------------------------------------------------------------
+# service
+# ------------------------------------------------------------
+class DivisionService(object):
+    ''' Answers division requests while keeping the algorithms
+    and the loaded preferences warm between requests.
+    '''
+
+    def __init__(self):
+        ''' Initializes a new instance of the service
+        '''
+        self.algorithms = {}
+        self.preferences = {}   # {path: (modified time, preferences)}
+        self.lock = threading.Lock()
+        self.dividing = threading.Lock()   # the random state is shared by every thread
+
+    def get_algorithm(self, name):
+        ''' Given an algorithm name, return a factory
+        for that algorithm.
+
+        :param name: The name of the algorithm to create
+        :returns: The type factory for that algorithm
+        '''
+        if name not in self.algorithms:
+            if name not in registry:
+                raise ValueError("no matching algorithm available: %s" % name)
+            self.algorithms[name] = get_algorithm(name)
+        return self.algorithms[name]
+
+    def load(self, path, loader):
+        ''' Load the preferences in the supplied file, unless
+        they are cached and the file has not been modified.
+
+        :param path: The path of the file to load
+        :param loader: A function to load the preferences of a path
+        :returns: The preferences in the file
+        '''
+        modified = os.path.getmtime(path)
+        with self.lock:
+            cached = self.preferences.get(path)
+        if cached and cached[0] == modified:
+            return cached[1]
+        preferences = loader(path)
+        with self.lock:
+            self.preferences[path] = (modified, preferences)
+        return preferences
+
+    def get_users(self, request):
+        ''' Given a request, return the users to divide between.
+
+        :param request: The division request
+        :returns: The collection of users to operate with
+        '''
+        if isinstance(request.get('table'), dict):
+            return load_preferences(request['table'])
+        if request.get('table'):
+            return self.load(request['table'], load_preferences)
+        if request.get('users'):
+            return [self.load(path, self.load_file) for path in request['users']]
+        raise ValueError("the request needs either users or a table")
+
+    @staticmethod
+    def load_file(path):
+        ''' Load the preference of a single user from its file,
+        naming the user after the file.
+
+        :param path: The path of the file to load
+        :returns: The preference in the file
+        '''
+        for preference in [IntervalPreference, CollectionPreference]:
+            try: user = preference.from_file(path)
+            except Exception: continue
+            user.user = os.path.basename(path)
+            return user
+        raise ValueError("no matching user preference available: %s" % path)
+
+    def divide(self, request):
+        ''' Perform the requested division and return a record
+        of the result. Any error in the division is recorded
+        instead of being raised so the service can continue.
+
+        :param request: The division request
+        :returns: A dictionary record of the result
+        '''
+        record  = {'id': request.get('id'), 'algorithm': request.get('algorithm'), 'error': None}
+        started = time.time()
+        try:
+            users   = self.get_users(request)
+            cake    = cakes[users[0].__class__.__name__](users)
+            factory = self.get_algorithm(request.get('algorithm'))
+            divider = factory(users, cake)
+            with self.dividing:                     # so a seed is not reset by another request
+                random.seed(request.get('seed'))
+                results = divider.divide()
+            if isinstance(results, tuple):
+                results = results[0]
+            record['shares'] = dict((str(user), piece) for user, piece in results.items())
+            for key, value in divider.report(results).summary().items():
+                record[key] = value if isinstance(value, bool) else float(value)
+        except Exception, ex:
+            record['error'] = "%s: %s" % (ex.__class__.__name__, ex)
+        record['elapsed'] = time.time() - started
+        return record
+
+    def handle(self, line):
+        ''' Answer the request (or the batch of requests) on
+        the supplied line.
+
+        :param line: The json encoded request or list of requests
+        :returns: A generator of the result records
+        '''
+        try: requests = json.loads(line)
+        except ValueError, ex:
+            yield {'id': None, 'error': "ValueError: %s" % ex}
+            return
+        if not isinstance(requests, list):
+            requests = [requests]
+        for request in requests:
+            if not isinstance(request, dict):
+                yield {'id': None, 'error': "ValueError: a request must be an object"}
+            else: yield self.divide(request)
+
+    def serve(self, input=sys.stdin, output=sys.stdout):
+        ''' Answer every request read from the input stream,
+        writing each result to the output as it completes.
+
+        :param input: The stream to read requests from
+        :param output: The stream to write the results to
+        '''
+        for line in iter(input.readline, ''):
+            if not line.strip(): continue
+            for record in self.handle(line):
+                output.write(json.dumps(record, sort_keys=True, default=_encode) + "\n")
+                output.flush()
+
+
+# ------------------------------------------------------------
+# socket server
+# ------------------------------------------------------------
+class _ServiceHandler(SocketServer.StreamRequestHandler):
+    ''' Serves the requests of a single connection '''
+
+    def handle(self):
+        self.server.service.serve(self.rfile, self.wfile)
+
+
+class _ServiceServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    ''' A local socket server with a thread per connection '''
+    daemon_threads = True
+
+
+def create_server(path, service=None):
+    ''' Create a server that answers the requests of every
+    connection to the local socket at the supplied path.
+    Call `serve_forever` on the result to start it.
+
+    :param path: The path of the socket to listen on
+    :param service: The service to answer with (None for a new one)
+    :returns: The initialized server
+    '''
+    if os.path.exists(path):
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise ValueError("%s exists and is not a socket" % path)
+        os.remove(path)                         # a stale socket of an earlier server
+    server = _ServiceServer(path, _ServiceHandler)
+    server.service = service or DivisionService()
+    return server
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "DivisionService", "create_server",
+]
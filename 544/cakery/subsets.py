@@ -0,0 +1,329 @@
+'''
+------------------------------------------------------------
+Subset Sum Engine
+------------------------------------------------------------
+
+These methods find the collection of items whose summed value
+is closest to a requested target. Each item is supplied as a
+tuple of `(key, value, count)` where count is the number of
+copies of that item that may be chosen (its multiplicity).
+Every method returns a tuple of `(difference, {key: count})`.
+
+The following methods are available:
+
+* brute  - enumerate every combination (small inputs only)
+* split  - meet in the middle over two halves of the items
+* exact  - dynamic programming over scaled integer values
+* approx - a trimmed list FPTAS with a bounded relative error
+* greedy - a descending greedy fill (no error bound, only on request)
+* auto   - choose one of the bounded methods by the input size
+'''
+from bisect import bisect_left
+from fractions import Fraction
+from itertools import product
+from cakery.utilities import powerset
+
+PRECISION = 10**4   # the default integer steps for inexact values
+
+
+# ------------------------------------------------------------
+# helpers
+# ------------------------------------------------------------
+def _expand(items):
+    ''' Expand the items into one entry for each copy
+
+    :param items: The (key, value, count) items to expand
+    :returns: A list of (key, value) for each copy
+    '''
+    return [(k, v) for k, v, c in items for _ in xrange(c)]
+
+
+def _split(items):
+    ''' Split each bounded item into groups of 1, 2, 4, ...
+    copies (binary splitting) so any count up to the bound
+    can be chosen with each group used at most once.
+
+    :param items: The (key, value, count) items to split
+    :returns: A list of (key, copies, value) groups
+    '''
+    groups = []
+    for key, value, count in items:
+        size = 1
+        while count > 0:
+            size = min(size, count)
+            groups.append((key, size, value * size))
+            count, size = count - size, size * 2
+    return groups
+
+
+def _collect(chosen):
+    ''' Convert the chosen (key, copies) pairs to a count dict
+
+    :param chosen: The chosen (key, copies) pairs
+    :returns: The {key: count} of the chosen items
+    '''
+    counts = {}
+    for key, copies in chosen:
+        counts[key] = counts.get(key, 0) + copies
+    return counts
+
+
+def _unlink(node):
+    ''' Walk a linked list of (group, parent) nodes
+
+    :param node: The final node of the linked list
+    :returns: The list of groups in the linked list
+    '''
+    groups = []
+    while node is not None:
+        group, node = node
+        groups.append(group)
+    return groups
+
+
+def _scale(items, target, precision):
+    ''' Find the factor used to convert the item values to
+    integers. Rational values are scaled exactly when their
+    common denominator is small enough, otherwise the target
+    is divided into `precision` integer steps.
+
+    :param items: The (key, value, count) items to scale
+    :param target: The target value to scale
+    :param precision: The number of steps for inexact values
+    :returns: The scaling factor to use
+    '''
+    values = [target] + [v for _, v, _ in items]
+    if all(isinstance(v, (int, long, Fraction)) for v in values):
+        factor = 1
+        for value in values:
+            denominator = Fraction(value).denominator
+            factor = factor * denominator / _gcd(factor, denominator)
+            if factor * target > precision: break
+        else: return factor
+    return Fraction(precision) / target if target else 1
+
+
+def _gcd(a, b):
+    ''' Return the greatest common divisor of two integers
+
+    :param a: The first integer
+    :param b: The second integer
+    :returns: The greatest common divisor
+    '''
+    while b: a, b = b, a % b
+    return a
+
+
+# ------------------------------------------------------------
+# methods
+# ------------------------------------------------------------
+def brute_subset(items, target):
+    ''' Find the closest subset by trying every combination
+    of the item copies in order. The first exact match is
+    returned, otherwise the smallest difference wins.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :returns: (difference, {key: count})
+    '''
+    copies = _expand(items)
+    best = (abs(target), [])
+    for possible in powerset(range(len(copies))):
+        value = abs(target - sum(copies[i][1] for i in possible))
+        best = min(best, (value, [copies[i][0] for i in possible]))
+        if value == 0: break
+    return best[0], _collect((k, 1) for k in best[1])
+
+
+def split_subset(items, target):
+    ''' Find the closest subset by enumerating the sums of
+    each half of the items and then matching every sum in
+    the first half with a bisection of the second half.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :returns: (difference, {key: count})
+    '''
+    def enumerate_sums(half):
+        ranges = [xrange(c + 1) for _, _, c in half]
+        sums = []
+        for counts in product(*ranges):
+            value = sum(n * v for n, (_, v, _) in zip(counts, half))
+            sums.append((value, counts))
+        return sums
+
+    middle = len(items) // 2
+    lower, upper = items[:middle], items[middle:]
+    lefts  = enumerate_sums(lower)
+    rights = sorted(enumerate_sums(upper))
+    values = [v for v, _ in rights]
+
+    best = (abs(target), (), ())
+    for value, counts in lefts:
+        i = bisect_left(values, target - value)
+        for j in (i - 1, i):
+            if 0 <= j < len(rights):
+                error = abs(target - value - rights[j][0])
+                if error < best[0]:
+                    best = (error, counts, rights[j][1])
+        if best[0] == 0: break
+
+    chosen = zip(lower, best[1]) + zip(upper, best[2])
+    return best[0], _collect((k, n) for (k, _, _), n in chosen if n)
+
+
+def exact_subset(items, target, precision=None):
+    ''' Find the closest subset with a dynamic program over
+    the reachable integer sums. The item values are scaled
+    to integers (exactly for small rational denominators),
+    and bounded counts are handled with binary splitting.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :param precision: The number of integer steps for inexact values
+    :returns: (difference, {key: count})
+    '''
+    factor = _scale(items, target, precision or PRECISION)
+    goal   = int(round(target * factor))
+    groups = _split(items)
+    reach  = {0: None}                          # sum -> (group, parent sum)
+    for index, (_, _, value) in enumerate(groups):
+        weight = int(round(value * factor))
+        for total in reach.keys():
+            after = total + weight
+            if after <= 2 * goal and after not in reach:
+                reach[after] = (index, total)
+        if goal in reach: break
+
+    total  = min(reach, key=lambda s: (abs(goal - s), s))
+    chosen = []
+    while reach[total] is not None:
+        index, total = reach[total]
+        chosen.append(groups[index])
+    value = sum(v for _, _, v in chosen)
+    return abs(target - value), _collect((k, c) for k, c, _ in chosen)
+
+
+def approximate_subset(items, target, epsilon=0.05):
+    ''' Find a close subset with the trimmed list FPTAS. The
+    list of reachable sums is trimmed after each group so
+    that no retained sum is within a (1 + delta) factor of
+    the previous one, which bounds the list size. The greedy
+    fill is tried first and the groups are then added largest
+    first, stopping as soon as a sum is within the allowed
+    error of the target (which keeps large inputs fast).
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :param epsilon: The relative error allowed in the result
+    :returns: (difference, {key: count})
+    '''
+    allowed = abs(target) * epsilon
+    greedy  = greedy_subset(items, target)
+    if greedy[0] <= allowed: return greedy
+
+    groups = sorted(_split(items), key=lambda g: g[2], reverse=True)
+    delta  = float(epsilon) / (2 * max(len(groups), 1))
+    sums   = [(0, None)]                        # (sum, linked groups)
+    best   = sums[0]
+    for index, (_, _, value) in enumerate(groups):
+        merged = sorted(sums + [(s + value, (index, n)) for s, n in sums
+            if s + value <= 2 * target], key=lambda s: s[0])
+        sums, last = [], None
+        for total, node in merged:
+            if last is None or total > last * (1 + delta):
+                sums.append((total, node))
+                last = total
+                if abs(target - total) < abs(target - best[0]):
+                    best = (total, node)
+        if abs(target - best[0]) <= allowed: break
+
+    total, node = best
+    if greedy[0] <= abs(target - total): return greedy
+    chosen = [groups[i] for i in _unlink(node)]
+    return abs(target - total), _collect((k, c) for k, c, _ in chosen)
+
+
+def greedy_subset(items, target):
+    ''' Find a close subset by filling the target with the
+    largest groups that still fit, and then taking the
+    smallest rejected group if overshooting is closer. This
+    runs in O(n log n) and its error is bounded by the value
+    of the smallest rejected group.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :returns: (difference, {key: count})
+    '''
+    groups = sorted(_split(items), key=lambda g: g[2], reverse=True)
+    total, chosen, rejected = 0, [], None
+    for group in groups:
+        if total + group[2] <= target:
+            total += group[2]
+            chosen.append(group)
+        elif rejected is None or group[2] < rejected[2]:
+            rejected = group
+
+    if rejected and (total + rejected[2] - target) < (target - total):
+        total += rejected[2]
+        chosen.append(rejected)
+    return abs(target - total), _collect((k, c) for k, c, _ in chosen)
+
+
+# ------------------------------------------------------------
+# dispatch
+# ------------------------------------------------------------
+methods = {
+    'brute':  brute_subset,
+    'split':  split_subset,
+    'exact':  exact_subset,
+    'approx': approximate_subset,
+    'greedy': greedy_subset,
+}
+
+
+def choose_method(items, target, limit=10**7):
+    ''' Choose a subset sum method based on the size of
+    the supplied input. Inputs too large for the exact
+    methods use the FPTAS, as it still bounds the error.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :param limit: The largest amount of work to allow the exact methods
+    :returns: The name of the method to use
+    '''
+    copies, combinations = 0, 1
+    for _, _, count in items:
+        copies, combinations = copies + count, combinations * (count + 1)
+    if copies <= 16: return 'brute'
+    if combinations <= 2**32: return 'split'
+    goal = target * _scale(items, target, PRECISION)
+    if len(_split(items)) * 2 * goal <= limit: return 'exact'
+    return 'approx'
+
+
+def find_subset(items, target, method='auto'):
+    ''' Find the subset of items whose summed value is the
+    closest to the target value.
+
+    :param items: The (key, value, count) items to choose from
+    :param target: The target value to hit
+    :param method: The method to use (or auto to choose one)
+    :returns: (difference, {key: count})
+    '''
+    items = [(k, v, c) for k, v, c in items if c > 0]
+    if method == 'auto':
+        method = choose_method(items, target)
+    if method not in methods:
+        raise ValueError("unknown subset sum method %s" % method)
+    return methods[method](items, target)
+
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    "brute_subset", "split_subset", "exact_subset", "approximate_subset",
+    "greedy_subset",
+    "choose_method", "find_subset",
+]
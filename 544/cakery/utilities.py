@@ -1,4 +1,9 @@
-from itertools import chain, combinations
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from fractions import Fraction
+from itertools import chain, combinations, izip
+from math import sqrt
+import numpy as np
 
 
 def powerset(iterable):
@@ -32,20 +37,148 @@ def all_unique(iterable):
     return len(set(values)) == len(values)
 
 
-def integrate(fx, x0, x1, ns):
+def _evaluate(fx, points):
+    ''' Evaluate the function at every point in one call if
+    it returns a value for each point of a numpy array,
+    otherwise (say for a constant) one point at a time.
+
+    :param fx: The function to evaluate
+    :param points: The array of points to evaluate at
+    :returns: The array of the values at each point
+    '''
+    try:
+        values = np.asarray(fx(points), dtype=float)
+        if values.shape == points.shape:
+            return values
+    except Exception: pass                          # the function only takes scalars
+    return np.array([fx(x) for x in points.tolist()], dtype=float)
+
+
+def _quadrature(rule, x0, x1, ns):
+    ''' Return the nodes and weights of the composite rule
+    over the supplied range, in rational arithmetic.
+
+    :param rule: The rule to use (trapezoid or simpson)
+    :param x0: The starting point of the integral
+    :param x1: The ending point of the integral
+    :param ns: The number of subinterval steps
+    :returns: The lists of (nodes, weights)
+    '''
+    if rule == 'simpson':
+        ns += ns % 2                                # simpson needs an even number of steps
+        h = (x1 - x0) / ns
+        weights = [h / 3 * (1 if i in (0, ns) else 4 if i % 2 else 2) for i in xrange(ns + 1)]
+    elif rule == 'trapezoid':
+        h = (x1 - x0) / ns
+        weights = [h / 2 if i in (0, ns) else h for i in xrange(ns + 1)]
+    else: raise ValueError("unknown integration rule: %s" % rule)
+    return [x0 + i * h for i in xrange(ns + 1)], weights
+
+
+_rules = {}  # the cached unit rules of {(rule, ns): (nodes, weights, divisor)}
+
+
+def _unit_quadrature(rule, ns):
+    ''' Return the nodes and weights of the rule over the
+    range [0, 1] as arrays, to be scaled to any range.
+
+    :param rule: The rule to use (trapezoid, simpson, or gauss)
+    :param ns: The number of subinterval steps (or gauss nodes)
+    :returns: The arrays of (nodes, weights) and the weight divisor
+    '''
+    if (rule, ns) not in _rules:
+        if rule == 'gauss':
+            nodes, weights = np.polynomial.legendre.leggauss(ns)
+            _rules[(rule, ns)] = ((nodes + 1) / 2, weights, 2.0)
+        else:                                       # whole weights keep the sums exact
+            nodes, weights = _quadrature(rule, Fraction(0), Fraction(1), ns)
+            divisor = max(w.denominator for w in weights)
+            _rules[(rule, ns)] = (np.array(nodes, dtype=float),
+                np.array([w * divisor for w in weights], dtype=float), float(divisor))
+    return _rules[(rule, ns)]
+
+
+def _adaptive(fx, x0, x1, ns, tolerance, depth=50):
+    ''' Approximates the integral with gauss rules of ns and
+    2 * ns nodes, splitting the range in half (with half the
+    tolerance each) until the two agree within the tolerance.
+
+    :param fx: The function to integrate
+    :param x0: The starting point of the integral
+    :param x1: The ending point of the integral
+    :param ns: The number of gauss nodes of the coarse rule
+    :param tolerance: The largest error allowed
+    :param depth: The number of times the range may still be split
+    '''
+    coarse = integrate(fx, x0, x1, ns, 'gauss')
+    fine   = integrate(fx, x0, x1, 2 * ns, 'gauss')
+    if abs(fine - coarse) <= tolerance or depth == 0:
+        return fine
+    middle = (x0 + x1) / 2.0
+    return (_adaptive(fx, x0, middle, ns, tolerance / 2, depth - 1)
+          + _adaptive(fx, middle, x1, ns, tolerance / 2, depth - 1))
+
+
+def integrate(fx, x0, x1, ns, rule='trapezoid', tolerance=None):
     ''' Approximates the integral of the supplied
-    function by using the trapezoidal rule.
+    function by using the trapezoidal rule (or the
+    composite simpson rule, or gauss-legendre rule).
+
+    If the limits are floating point, every node is
+    evaluated with a single call when the function
+    accepts numpy arrays (falling back to calling it at
+    each node). Rational limits keep the integral in
+    rational arithmetic (for trapezoid and simpson).
+    If a tolerance is supplied, the gauss rule is split
+    adaptively until the error estimate is within it.
 
     :param fx: The function to integrate
     :param x0: The starting point of the integral
     :param x1: The ending point of the integral
     :param ns: The number of subinterval steps to take
+    :param rule: The rule to use (trapezoid, simpson, or gauss)
+    :param tolerance: The error allowed by the adaptive mode
+    '''
+    if tolerance is not None:
+        return _adaptive(fx, float(x0), float(x1), ns, tolerance)
+    if rule != 'gauss' and (isinstance(x0, Fraction) or isinstance(x1, Fraction)):
+        nodes, weights = _quadrature(rule, x0, x1, ns)
+        return sum(w * fx(x) for x, w in izip(nodes, weights))
+    nodes, weights, divisor = _unit_quadrature(rule, ns)
+    x0, span = float(x0), float(x1) - float(x0)
+    return span * float(np.dot(weights, _evaluate(fx, x0 + span * nodes))) / divisor
+
+
+def integer_root(value):
+    ''' Given a non-negative integer, return the floor
+    of its square root using integer arithmetic only.
+
+    :param value: The integer to find the root of
+    :returns: The largest integer whose square is <= value
+    '''
+    if value < 2: return value
+    root = 1 << ((value.bit_length() + 1) // 2)    # newton's method from above
+    while True:
+        lower = (root + value // root) // 2
+        if lower >= root: return root
+        root = lower
+
+
+def square_root(value):
+    ''' Given a number, return its square root in the
+    same numeric type. Rational values that are perfect
+    squares produce an exact rational root.
+
+    :param value: The number to find the root of
+    :returns: The square root of the value
     '''
-    h = (x1 - x0) / ns
-    s = fx(x0) + fx(x1)
-    for i in xrange(1, ns):
-        s += 2 * fx(x0 + i * h)
-    return s * h / 2
+    if isinstance(value, Fraction):
+        n = integer_root(value.numerator)
+        d = integer_root(value.denominator)
+        if n * n == value.numerator and d * d == value.denominator:
+            return Fraction(n, d)
+        return Fraction(sqrt(value))
+    return sqrt(value)
 
 
 def any_range(start, stop, step=1):
@@ -63,15 +196,16 @@ def any_range(start, stop, step=1):
         current += step
 
 
-def memoize(function):
+def memoize(function, size=None):
     ''' Given a function, perform memoization
     of the various calls to the function based
     on the supplied argument tuple.
 
     :param function: The function to memoize
+    :param size: The number of results to keep (None for unbounded)
     :returns: The memoized function instance
     '''
-    cache = {}
+    cache = {} if size is None else LRUCache(size)
     def catcher(*args):
         if args not in cache:
             cache[args] = function(*args)
@@ -79,6 +213,68 @@ def memoize(function):
     return catcher
 
 
+class LRUCache(object):
+    ''' A bounded mapping that evicts the least recently
+    used entry once it is full. The number of hits and
+    misses of `get` are recorded to judge its effectiveness.
+    '''
+
+    def __init__(self, size=1024):
+        ''' Initializes a new instance of the cache
+
+        :param size: The maximum number of entries to keep
+        '''
+        if size < 1:
+            raise ValueError("cache size must be positive")
+        self.size   = size
+        self.hits   = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    def get(self, key, default=None):
+        ''' Retrieve the entry for the supplied key and mark
+        it as the most recently used.
+
+        :param key: The key to retrieve the entry of
+        :param default: The value to return on a miss
+        :returns: The cached value or the default
+        '''
+        try: value = self.__entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__entries[key] = value
+        return value
+
+    def put(self, key, value):
+        ''' Store the supplied entry, evicting the least
+        recently used entry if the cache is full.
+
+        :param key: The key to store the entry under
+        :param value: The value to store
+        '''
+        self.__entries.pop(key, None)
+        self.__entries[key] = value
+        if len(self.__entries) > self.size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        ''' Remove every entry from the cache
+        '''
+        self.__entries.clear()
+        self.hits, self.misses = 0, 0
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self: raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value): self.put(key, value)
+    def __contains__(self, key):       return key in self.__entries
+    def __len__(self):                 return len(self.__entries)
+
+
 class Interval(object):
     ''' Represents a single linear interval
     '''
@@ -141,6 +337,22 @@ class Interval(object):
             return 0
         return self._integrate(r) - self._integrate(l)
 
+    def find(self, area):
+        ''' Find the point x in this interval such that the
+        area from the left boundary to x is the supplied area.
+        This solves the quadratic m/2 t^2 + y1 t = area for the
+        offset t = x - x1, clamped to the interval boundaries.
+
+        :param area: The area to find the stopping point for
+        :returns: The point that encloses the supplied area
+        '''
+        if area <= 0: return self.x1
+        if area >= self.area(self.x1, self.x2): return self.x2
+        discriminant = self.y1 * self.y1 + 2 * self.m * area
+        divisor = self.y1 + square_root(max(discriminant, 0))
+        if divisor <= 0: return self.x1
+        return min(self.x1 + 2 * area / divisor, self.x2)
+
     def __str__(self):
         ''' Returns a string representation of this interval
 
@@ -149,6 +361,159 @@ class Interval(object):
         return "%s - %s" % ((self.x1, self.y1), (self.x2, self.y2))
 
 
+class IntervalIndex(object):
+    ''' Represents a cumulative area index over a sorted
+    collection of contiguous intervals. The sorted interval
+    breakpoints are stored along with the prefix sums of
+    their areas, so the area from 0 to any point can be
+    found with a single bisection.
+    '''
+
+    def __init__(self, intervals):
+        '''
+        :param intervals: The sorted intervals to index
+        '''
+        self.intervals = list(intervals)
+        self.starts = [i.x1 for i in self.intervals]
+        self.areas  = [0]
+        for interval in self.intervals:
+            area = interval.area(interval.x1, interval.x2)
+            self.areas.append(self.areas[-1] + area)
+        self.total = self.areas[-1]
+
+    def cumulative(self, x):
+        ''' Calculate the area of the indexed intervals
+        from the first breakpoint to the supplied point.
+
+        :param x: The point to integrate up to
+        :returns: The area up to the specified point
+        '''
+        if not self.intervals or x <= self.starts[0]:
+            return 0
+        if x >= self.intervals[-1].x2:
+            return self.total
+        i = bisect_right(self.starts, x) - 1
+        interval = self.intervals[i]
+        return self.areas[i] + interval.area(interval.x1, x)
+
+    def area(self, a, b):
+        ''' Calculate the area of the indexed intervals
+        from a to b.
+
+        :param a: The starting point of the area
+        :param b: The ending point of the area
+        :returns: The area of the specified range
+        '''
+        if b <= a: return 0
+        return self.cumulative(b) - self.cumulative(a)
+
+    def inverse(self, area):
+        ''' Find the first point x such that the area from
+        the first breakpoint to x is the supplied area.
+
+        :param area: The cumulative area to find the point for
+        :returns: The point that encloses the supplied area
+        '''
+        if not self.intervals or area <= 0:
+            return self.starts[0] if self.intervals else 0
+        if area >= self.total:
+            return self.intervals[-1].x2
+        i = max(bisect_left(self.areas, area) - 1, 0)
+        return self.intervals[i].find(area - self.areas[i])
+
+
+class IntervalSet(list):
+    ''' Represents a sorted list of disjoint (start, stop)
+    intervals. The intervals that an operation touches are
+    located with a bisection, so adding, removing, and trimming
+    a range costs O(log n) comparisons plus a single slice
+    assignment of the intervals that change (instead of a
+    walk or re-sort of the whole list).
+
+    This is a list, so it can be used anywhere the plain list
+    of intervals was used before.
+    '''
+
+    def __init__(self, intervals=()):
+        '''
+        :param intervals: The intervals to initialize with
+        '''
+        if not isinstance(intervals, IntervalSet):
+            intervals = sorted(intervals)
+        list.__init__(self, intervals)
+
+    def __locate(self, point):
+        ''' Find the index of the first interval that
+        ends at or after the supplied point.
+
+        :param point: The point to locate
+        :returns: The index of the interval
+        '''
+        i = bisect_left(self, (point,))
+        if i > 0 and self[i - 1][1] >= point:
+            i -= 1
+        return i
+
+    def covers(self, start, stop):
+        ''' Test if the supplied range is completely
+        covered by the intervals in this set.
+
+        :param start: The start of the range
+        :param stop: The stop of the range
+        :returns: True if covered, False otherwise
+        '''
+        i = self.__locate(start)
+        while i < len(self) and self[i][0] <= start:
+            if self[i][1] >= stop: return True
+            start, i = max(start, self[i][1]), i + 1
+        return False
+
+    def add(self, start, stop):
+        ''' Add the supplied range to this set, merging it
+        with any intervals that it overlaps or touches.
+
+        :param start: The start of the range
+        :param stop: The stop of the range
+        '''
+        i = j = self.__locate(start)
+        while j < len(self) and self[j][0] <= stop:
+            start, stop = min(start, self[j][0]), max(stop, self[j][1])
+            j += 1
+        self[i:j] = [(start, stop)]
+
+    def discard(self, start, stop):
+        ''' Remove the supplied range from this set, splitting
+        any interval that only partially overlaps it.
+
+        :param start: The start of the range
+        :param stop: The stop of the range
+        '''
+        if start >= stop: return
+        i = j = self.__locate(start)
+        if i < len(self) and self[i][1] == start: i = j = i + 1
+        kept = []
+        while j < len(self) and self[j][0] < stop:
+            x1, x2 = self[j]
+            if x1 < start: kept.append((x1, start))
+            if x2 > stop:  kept.append((stop, x2))
+            j += 1
+        self[i:j] = kept
+
+    def head(self, stop):
+        ''' Return the intervals of this set that lie before
+        the supplied point (trimming the final interval at it).
+
+        :param stop: The point to trim at
+        :returns: A new set of the trimmed intervals
+        '''
+        i = self.__locate(stop)
+        if i >= len(self): return IntervalSet(self)
+        head = IntervalSet(self[:i + 1])
+        if head[i][0] >= stop: head.pop()
+        else: head[i] = (head[i][0], stop)
+        return head
+
+
 class ValueItem(object):
     ''' This is a simple wrapper around an item
     to give it a real world appraisable value
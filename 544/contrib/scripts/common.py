@@ -19,7 +19,6 @@ if __name__ == '__main__': pass
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 
 import cakery.algorithms
-from cakery.algorithms.utilities import get_total_value
 from cakery.resource import *
 from cakery.preference import *
 from fractions import Fraction as F
@@ -41,12 +40,18 @@ def get_algorithm(name):
 
 
 def get_users(paths):
-    ''' Given a collection of preference files,
-    generate a collection of users.
+    ''' Given a collection of preference files (or a
+    single table of every user's preferences), generate
+    a collection of users.
 
     :param paths: The paths to create users from
     :returns: The collection of users to operate with
     '''
+    tables = ('.csv', '.npz', '.npy')
+    if len(paths) == 1 and os.path.splitext(paths[0])[1].lower() in tables:
+        log.debug("loading users from table %s" % paths[0])
+        return load_preferences(paths[0])
+
     preferences = [
         IntervalPreference,
         CollectionPreference,
@@ -89,9 +94,10 @@ def print_results(divider, results, extras):
     for key, value in divider.settings().items():
         print "*", key, "\t:", value
 
+    report  = divider.report(results)
     print "\nAlgorithm Results\n", header
     for user, shares in results.items():
-        print "* share for %s: value(%s)" % (str(user), get_total_value(user, shares))
+        print "* share for %s: value(%s)" % (str(user), report.value_of(user))
         print " ", shares, "\n"
 
     if isinstance(extras, dict):
@@ -103,9 +109,12 @@ def print_results(divider, results, extras):
     print "Algorithm Result Validation\n", header
     print "* users\t\t:", len(results.keys())
     #print "* optimal\t:", divider.is_optimal(results)
-    print "* envy free\t:", divider.is_envy_free(results)
-    print "* equitable\t:", divider.is_equitable(results)
-    print "* proportional\t:", divider.is_proportional(results)
+    print "* envy free\t:", report.is_envy_free
+    print "* equitable\t:", report.is_equitable
+    print "* proportional\t:", report.is_proportional
+    print "* max envy\t:", report.max_envy
+    print "* utilitarian\t:", report.utilitarian_welfare
+    print "* egalitarian\t:", report.egalitarian_welfare
 
 
 #--------------------------------------------------------------------------------#
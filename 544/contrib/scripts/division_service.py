@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+'''
+Runs a long lived division service that answers the JSON
+requests read from stdin (or from a local socket), so the
+interpreter startup is paid once instead of once per division::
+
+    echo '{"algorithm": "AlternatingChoice", "table": "../data/table/bidding.csv"}' | ./division_service.py
+    ./division_service.py --socket /tmp/cakery.sock
+'''
+import argparse
+from common import log
+from cakery.service import DivisionService, create_server
+
+#------------------------------------------------------------
+# settings
+#------------------------------------------------------------
+parser = argparse.ArgumentParser(description="run a long lived division service")
+parser.add_argument('-s', '--socket', default=None,
+    help="the local socket to listen on (defaults to stdin and stdout)")
+options = parser.parse_args()
+
+#------------------------------------------------------------
+# run the service
+#------------------------------------------------------------
+service = DivisionService()
+if not options.socket:
+    service.serve()
+else:
+    server = create_server(options.socket, service)
+    log.info("serving divisions on %s" % options.socket)
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: server.server_close()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+'''
+Runs a large batch of randomized divisions over a process
+pool and reports the throughput and the fairness statistics
+of each algorithm::
+
+    ./batch_test_algorithms.py -a DubinsSpanier -k interval -s 2 3 -r 1000 -o results.json
+'''
+import sys
+import argparse
+from cakery.batch import create_jobs, run_batch
+
+#------------------------------------------------------------
+# settings
+#------------------------------------------------------------
+parser = argparse.ArgumentParser(description="run a batch of randomized divisions")
+parser.add_argument('-a', '--algorithms', nargs='+', default=['DubinsSpanier'],
+    help="the names of the algorithms to run")
+parser.add_argument('-k', '--kinds', nargs='+', default=['interval'],
+    help="the user and cake factories to run with")
+parser.add_argument('-s', '--sizes', nargs='+', type=int, default=[2],
+    help="the number of users to run with")
+parser.add_argument('-r', '--rounds', type=int, default=100,
+    help="the number of rounds to run for each combination")
+parser.add_argument('-e', '--seed', type=int, default=0,
+    help="the seed of the first job")
+parser.add_argument('-p', '--processes', type=int, default=None,
+    help="the number of worker processes (defaults to the cpu count)")
+parser.add_argument('-o', '--output', default=None,
+    help="the file to stream the results to")
+parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json',
+    help="the format to stream the results in")
+options = parser.parse_args()
+
+#------------------------------------------------------------
+# run the batch
+#------------------------------------------------------------
+jobs   = create_jobs(options.algorithms, options.kinds, options.sizes,
+    options.rounds, options.seed)
+stream = open(options.output, 'w') if options.output else None
+try:
+    summary = run_batch(jobs, stream, options.format, options.processes)
+finally:
+    if stream: stream.close()
+
+#------------------------------------------------------------
+# report the results
+#------------------------------------------------------------
+print "\n","=" * 60
+print "Algorithms Batch Test"
+print "=" * 60,"\n"
+print "* jobs\t\t: %d (%d errors)" % (summary.count, summary.errors)
+print "* elapsed\t: %.3fs" % summary.elapsed
+print "* throughput\t: %.1f jobs/s" % summary.throughput
+print
+
+for algorithm, statistics in sorted(summary.statistics().items()):
+    print "-" * 60
+    print algorithm
+    print "-" * 60
+    for key, value in sorted(statistics.items()):
+        print "  - %s\t: %s" % (key.ljust(20), value)
+    print
@@ -46,7 +46,7 @@ setup(name  = 'cakery',
     platforms = ['Linux', 'Mac OS X', 'Win'],
     include_package_data = True,
     zip_safe = True,
-    install_requires = [],
+    install_requires = [ 'numpy >= 1.6.1' ],
     extras_require = {
         'quality'   : [ 'coverage >= 3.5.3', 'nose >= 1.2.1', 'mock >= 1.0.0', 'pep8 >= 1.3.3' ],
         'documents' : [ 'sphinx >= 1.1.3' ],
@@ -3,8 +3,9 @@ import random
 import unittest
 from cakery.utilities import ValueItem as V
 from cakery.algorithms.utilities import *
-from cakery.preference import CollectionPreference
-from cakery.resource import CollectionResource
+from fractions import Fraction as F
+from cakery.preference import CollectionPreference, IntervalPreference
+from cakery.resource import CollectionResource, IntervalResource
 
 class AlgorithmUtilitiesTest(unittest.TestCase):
     '''
@@ -150,6 +151,23 @@ class AlgorithmUtilitiesTest(unittest.TestCase):
         self.assertEqual(user, users[0])
         self.assertEqual(piece, CollectionResource([a]))
 
+    def test_moving_knife(self):
+        ''' test the moving knife utility '''
+        users = [
+            IntervalPreference('mark', [(F(0), F(1)), (F(1), F(1))]),
+            IntervalPreference('john', [(F(0), F(2)), (F(1), F(0))]),
+            IntervalPreference('jack', [(F(0), F(0)), (F(1), F(2))]),
+        ]
+        cake  = IntervalResource((F(0), F(1)))
+        knife = MovingKnife(users, cake.clone(), F(1, 3))
+        clone = cake.clone()
+        while len(knife.users) > 1:
+            expect = choose_next_piece(knife.users, clone, F(1, 3))
+            actual = knife.next()
+            self.assertEqual(expect, actual)
+        self.assertEqual([users[2]], knife.users)
+        self.assertEqual(clone.value, knife.cake.value)
+
     def test_choose_last_piece(self):
         ''' test the choose last piece utility '''
         a, b, c = V('a', 10), V('b', 100), V('c', 1000)
@@ -185,6 +203,65 @@ class AlgorithmUtilitiesTest(unittest.TestCase):
         actual = sort_by_value(user, cakes)
         self.assertEqual(actual, expected)
 
+    def test_valuation_matrix(self):
+        ''' test the valuation matrix utility '''
+        keys  = ['a', 'b', 'c']
+        cakes = [CollectionResource([k]) for k in keys]
+        users = [
+            CollectionPreference('mark', {'a':1, 'b':2, 'c':3}),
+            CollectionPreference('john', {'a':3, 'b':2, 'c':1})
+        ]
+        matrix = ValuationMatrix(users, cakes)
+        self.assertEqual((2, 3), matrix.values.shape)
+        self.assertEqual(3, matrix.value_of(users[0], cakes[2]))
+        self.assertEqual(5, get_total_value(users[1], cakes[:2], matrix))
+        self.assertEqual(users[0], choose_highest_bidder(users, cakes[2], matrix))
+        self.assertEqual(users[1], choose_lowest_bidder(users, cakes[2], matrix))
+
+        expect = {users[0]: cakes[2], users[1]: cakes[0]}
+        self.assertEqual(expect, list_best_pieces(users, cakes, matrix))
+        expect = {users[0]: cakes[0], users[1]: cakes[2]}
+        self.assertEqual(expect, list_worst_pieces(users, cakes, matrix))
+
+        expected = [(3, cakes[2]), (2, cakes[1]), (1, cakes[0])]
+        self.assertEqual(expected, sort_by_value(users[0], cakes, True, matrix))
+
+        pieces = list(cakes)
+        self.assertTrue(choose_best_piece(users[0], pieces, matrix) is cakes[2])
+        self.assertTrue(choose_worst_piece(users[0], pieces, matrix) is cakes[0])
+        self.assertEqual([cakes[1]], pieces)
+
+        owners = matrix.winners()
+        self.assertEqual([1, 0, 0], owners.tolist())
+        self.assertEqual([5, 3], matrix.assigned_totals(owners).tolist())
+
+    def test_pick_engine(self):
+        ''' test the pick engine utility '''
+        keys  = ['a', 'b', 'c', 'd']
+        cakes = [CollectionResource([k]) for k in keys]
+        users = [
+            CollectionPreference('mark', {'a':1, 'b':2, 'c':3, 'd':3}),
+            CollectionPreference('john', {'a':3, 'b':2, 'c':1, 'd':1})
+        ]
+        matrix = ValuationMatrix(users, cakes)
+        engine = PickEngine(matrix, cakes)
+        self.assertEqual(4, len(engine))
+        self.assertTrue(engine.peek(users[0]) is cakes[3])
+        self.assertTrue(engine.pick(users[0]) is cakes[3])
+        self.assertTrue(engine.pick(users[0]) is cakes[2])
+        self.assertFalse(cakes[2] in engine)
+        self.assertTrue(engine.pick(users[1]) is cakes[0])
+        self.assertRaises(ValueError, lambda: engine.remove(cakes[0]))
+        self.assertTrue(engine.pick(users[1]) is cakes[1])
+        self.assertEqual(0, len(engine))
+        self.assertRaises(ValueError, lambda: engine.pick(users[0]))
+
+        engine = PickEngine(matrix, cakes, best=False)
+        for user in users:
+            pieces = list(cakes)
+            expect = choose_worst_piece(user, pieces, matrix)
+            self.assertTrue(engine.peek(user) is expect)
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
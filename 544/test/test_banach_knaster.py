@@ -26,7 +26,7 @@ class BanachKnasterTest(unittest.TestCase):
 
         # test that the algorithm is not valid
         pref  = lambda x: randint(1, 100) # crazy person...
-        users.append(ContinuousPreference('bill', pref))
+        users.append(ContinuousPreference('bill', pref, exact=True))
         algorithm = BanachKnaster(users, cake)
         self.assertRaises(ValueError, lambda: algorithm.is_valid())
 
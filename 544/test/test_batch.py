@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+import json
+import unittest
+from StringIO import StringIO
+from cakery.batch import Job, create_jobs, run_job, run_batch
+from cakery.batch import create_writer, BatchSummary
+
+class BatchTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.batch runner
+    '''
+
+    def test_create_jobs(self):
+        ''' test that the jobs are created correctly '''
+        jobs = create_jobs(['DubinsSpanier'], ['interval', ('collection', 'counted')],
+            sizes=[2, 3], rounds=2, seed=10)
+        self.assertEqual(8, len(jobs))
+        self.assertEqual(range(10, 18), [job.seed for job in jobs])
+        self.assertEqual(Job('DubinsSpanier', 'interval', 'interval', 2, 10), jobs[0])
+        self.assertEqual(('collection', 'counted'), (jobs[-1].users, jobs[-1].cake))
+
+        jobs = create_jobs(['DubinsSpanier', 'BanachKnaster'], ['interval'], sizes=[2, 3], rounds=2)
+        self.assertEqual([job.seed for job in jobs[:4]], [job.seed for job in jobs[4:]])
+        self.assertEqual(4, len(set(job.seed for job in jobs)))
+
+    def test_run_job(self):
+        ''' test that a job is run reproducibly '''
+        job    = Job('DubinsSpanier', 'interval', 'interval', 2, 42)
+        record = run_job(job)
+        self.assertEqual(None, record['error'])
+        self.assertTrue(record['envy-free'] in (True, False))
+        self.assertEqual(record['utilitarian welfare'], run_job(job)['utilitarian welfare'])
+
+        record = run_job(Job('MissingAlgorithm', 'interval', 'interval', 2, 42))
+        self.assertTrue(record['error'].startswith('AttributeError'))
+
+    def test_run_batch(self):
+        ''' test that a batch streams its results '''
+        jobs    = create_jobs(['AlternatingChoice'], ['collection'], rounds=3)
+        stream  = StringIO()
+        summary = run_batch(jobs, stream, processes=1)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(3, len(records))
+        self.assertEqual(3, summary.count)
+        self.assertEqual(0, summary.errors)
+        self.assertTrue(summary.throughput > 0)
+        statistics = summary.statistics()['AlternatingChoice']
+        self.assertEqual(3, statistics['runs'])
+        self.assertTrue(0 <= statistics['envy-free'] <= 1)
+
+    def test_run_batch_pool(self):
+        ''' test that a batch can be run over a pool '''
+        jobs    = create_jobs(['DubinsSpanier'], ['interval'], rounds=4)
+        serial  = run_batch(jobs, processes=1)
+        pooled  = run_batch(jobs, processes=2)
+        welfare = lambda s: sorted(r['utilitarian welfare'] for r in s.records['DubinsSpanier'])
+        self.assertEqual(welfare(serial), welfare(pooled))
+
+    def test_create_writer(self):
+        ''' test that the output writers work correctly '''
+        stream = StringIO()
+        writer = create_writer(stream, 'csv')
+        writer({'algorithm': 'test', 'seed': 1})
+        lines  = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('algorithm,users,cake'))
+        self.assertTrue(lines[1].startswith('test,,,,1'))
+        self.assertRaises(ValueError, lambda: create_writer(stream, 'xml'))
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 import os
+import shutil
+import tempfile
 import unittest
 from fractions import Fraction as F
 from cakery.resource import CollectionResource
-from cakery.preference import CollectionPreference
+from cakery.preference import CollectionPreference, OrdinalPreference
+from cakery.preference import load_preferences, read_table
 from cakery.algorithms.utilities import create_equal_pieces
 
 class CollectionResourceTest(unittest.TestCase):
@@ -37,6 +40,36 @@ class CollectionResourceTest(unittest.TestCase):
         for user in users:
             self.assertTrue(0.95 <= user.value_of(cake) <= 1.05)
 
+    def test_preference_table(self):
+        ''' test that the preferences can be loaded from a table '''
+        path  = os.path.join(os.path.abspath('contrib'), 'data')
+        table = os.path.join(path, 'table', 'bidding.csv')
+        users = load_preferences(table)
+        self.assertEqual(['bidding1', 'bidding2', 'bidding3'], [user.user for user in users])
+        for user in users:
+            path = os.path.join(os.path.abspath('contrib'), 'data', 'collection', user.user)
+            self.assertEqual(CollectionPreference.from_file(path).values, user.values)
+
+        users = OrdinalPreference.from_table(table)
+        self.assertEqual(7, users[0].values['plane'])
+        self.assertRaises(ValueError, lambda: OrdinalPreference.from_table({'user': []}))
+
+        table = {'user': ['a', 'b', 'a'], 'item': ['x', 'x', 'y'], 'value': ['1', '2', '3']}
+        users = CollectionPreference.from_table(table)
+        self.assertEqual({'x': 1.0, 'y': 3.0}, users[0].values)
+        self.assertEqual({'x': 2.0}, users[1].values)
+
+    def test_preference_table_malformed(self):
+        ''' test that a row with a missing or extra cell is reported '''
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'table.csv')
+            for body in ['a,x,1\na,y\nb,x,2\n', 'a,x,1\na,"y",2,3\nb,x\n']:
+                with open(path, 'w') as handle:
+                    handle.write('user,item,value\n' + body)
+                self.assertRaisesRegexp(ValueError, 'row 3', read_table, path)
+        finally: shutil.rmtree(directory)
+
     def test_resource_clone(self):
         ''' test that the resource clone works correctly '''
         keys = ['red', 'blue', 'green', 'yellow', 'orange']
@@ -52,6 +85,21 @@ class CollectionResourceTest(unittest.TestCase):
 
         self.assertEqual(CollectionResource('a'), CollectionResource(['a']))
 
+    def test_resource_snapshot(self):
+        ''' test that the resource snapshot works correctly '''
+        keys = ['red', 'blue', 'green']
+        cake = CollectionResource(keys)
+        self.assertEqual(cake.snapshot(), CollectionResource(keys[::-1]).snapshot())
+        self.assertEqual(hash(cake.snapshot()), hash(cake.clone().snapshot()))
+        self.assertNotEqual(cake.snapshot(), CollectionResource(keys[1:]).snapshot())
+
+        user = CollectionPreference('mark', dict((k, F(1,1)) for k in keys)).cache(2)
+        self.assertEqual(3, user.value_of(cake))
+        self.assertEqual(3, user.value_of(CollectionResource(keys[::-1])))
+        self.assertEqual(1, user.valuations.hits)
+        self.assertEqual(1, user.valuations.misses)
+        self.assertEqual(None, user.cache(None).valuations)
+
     def test_resource_remove(self):
         ''' test that the resource remove works correctly '''
         keys = ['red', 'blue', 'green', 'yellow', 'orange']
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 import unittest
 from fractions import Fraction as F
-from cakery.resource import ContinuousResource
-from cakery.preference import ContinuousPreference
+from cakery.resource import ContinuousResource, IntervalResource
+from cakery.preference import ContinuousPreference, StepPreference
 from cakery.algorithms.utilities import create_equal_pieces
 
 class ContinuousResourceTest(unittest.TestCase):
@@ -87,6 +87,63 @@ class ContinuousResourceTest(unittest.TestCase):
 
         self.assertRaises(ValueError, lambda: cake.find_piece(user, F(10)))
 
+        user = ContinuousPreference('mark', lambda x: 2 * x)
+        piece = cake.find_piece(user, F(1,4))
+        self.assertEqual(piece, ContinuousResource(F(0, 1), F(1, 2)))
+        piece = ContinuousResource(F(1,2), F(1,2)).find_piece(user, F(9,16) - F(1,4))
+        self.assertEqual(piece, ContinuousResource(F(1, 2), F(1, 4)))
+
+    def test_resource_find_pieces(self):
+        ''' test that we can find many pieces in one sweep '''
+        user = ContinuousPreference('mark', lambda x: 2 * x)
+        cake = ContinuousResource(F(0), F(1))
+        pieces = cake.find_pieces(user, [F(1,4), F(5,16)])
+        self.assertEqual(pieces, [ContinuousResource(F(0), F(1,2)),
+                                  ContinuousResource(F(1,2), F(1,4))])
+        self.assertEqual(cake, ContinuousResource(F(0), F(1)))
+        self.assertRaises(ValueError, lambda: cake.find_pieces(user, [F(1,2), F(2,3)]))
+
+        exact = ContinuousPreference('john', lambda x: 2 * x, exact=True)
+        pieces = cake.find_pieces(exact, [F(1,4), F(5,16)])
+        self.assertAlmostEqual(0.25, float(exact.value_of(pieces[0])), places=3)
+        self.assertAlmostEqual(0.3125, float(exact.value_of(pieces[1])), places=3)
+
+    def test_preference_exact_mode(self):
+        ''' test that the cached and exact valuations agree '''
+        cake  = ContinuousResource(F(1,5), F(1,2))
+        fast  = ContinuousPreference('mark', lambda x: 3 * x + 1, resolution=100)
+        exact = ContinuousPreference('john', lambda x: 3 * x + 1, resolution=100, exact=True)
+        self.assertEqual(exact.total, fast.total)
+        self.assertEqual(exact.value_of(cake), fast.value_of(cake))
+        self.assertTrue(fast.invertible)
+        self.assertFalse(exact.invertible)
+
+        fast.function = lambda x: F(1)
+        self.assertEqual(F(1, 2) / fast.total, fast.value_of(cake))
+
+    def test_step_preference(self):
+        ''' test that the step preference values and cuts correctly '''
+        user = StepPreference('mark', [1, 3])
+        self.assertEqual(1.0, user.value_of(ContinuousResource(F(0), F(1))))
+        self.assertEqual(0.25, user.value_of(ContinuousResource(F(0), F(1,2))))
+        self.assertEqual(0.5, user.value_of(ContinuousResource(F(1,4), F(1,2))))
+        self.assertEqual(0.5, user.value_of(IntervalResource([(F(0), F(1,4)), (F(1,2), F(3,4))])))
+        self.assertEqual(0.0, user.value_of(IntervalResource.empty()))
+        self.assertEqual(0.625, user.cumulative(F(3,4)))
+        self.assertEqual(0.75, user.inverse(0.625))
+        self.assertEqual(1.0, user.inverse(1))
+
+        piece = ContinuousResource(F(0), F(1)).find_piece(user, F(1,2))
+        self.assertEqual(piece, ContinuousResource(F(0), F(2,3)))
+        piece = IntervalResource([(F(0), F(1,4)), (F(1,2), F(1))]).find_piece(user, F(1,2))
+        self.assertEqual([(F(0), F(1,4)), (F(1,2), F(3,4))], piece.value)
+
+        user = StepPreference('john', [2, 0, 2], edges=[0, 0.25, 0.75, 1])
+        self.assertEqual(0.5, user.value_of(ContinuousResource(F(0), F(3,4))))
+        self.assertEqual(0.25, user.inverse(0.5))
+        self.assertRaises(ValueError, lambda: StepPreference('bill', [1, 2], edges=[0, 1]))
+        self.assertRaises(ValueError, lambda: StepPreference('bill', [-1, 2]))
+
     def test_resource_as_collection(self):
         ''' test that we can convert a resource to a collection '''
         cake = ContinuousResource(F(0), F(1), resolution=5)
@@ -44,6 +44,15 @@ class CountedResourceTest(unittest.TestCase):
         self.assertEqual(20, cake.actual_value(),)
         self.assertEqual(cake.actual_value(), copy.actual_value())
 
+        # clones share the items until one of them is modified
+        self.assertTrue(cake.value is copy.value)
+        copy.remove(CountedResource({'red': 2}))
+        copy.append(CountedResource({'blue': 1}))
+        self.assertEqual(2, cake.value['red'])
+        self.assertEqual(3, cake.value['blue'])
+        self.assertEqual(4, copy.value['blue'])
+        self.assertFalse('red' in copy.value)
+
     def test_resource_remove(self):
         ''' test that the resource remove works correctly '''
         vals = {'red':2, 'blue':3, 'green':4, 'yellow':5, 'orange':6}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+import random
+import unittest
+from fractions import Fraction as F
+from cakery.preference import CollectionPreference, CountedPreference
+from cakery.resource import CollectionResource, CountedResource
+from cakery.algorithms import EnvyCycleElimination
+from cakery.algorithms.envy_cycle_elimination import EnvyGraph
+
+class EnvyCycleEliminationTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.algorithm.EnvyCycleElimination
+    '''
+
+    def is_envy_free_up_to_one(self, users, slices):
+        ''' test that no user envies another bundle once their
+        favorite item in it is removed '''
+        for user in users:
+            owned = sum(user.value_of(piece) for piece in slices[user])
+            for other in users:
+                values = [user.value_of(piece) for piece in slices[other]]
+                if values and owned < sum(values) - max(values):
+                    return False
+        return True
+
+    def test_initializes(self):
+        ''' test that the algorithm initializes correctly '''
+        keys  = ['red', 'blue', 'green', 'yellow']
+        vals  = dict((k, 1.0 / len(keys)) for k in keys)
+        cake  = CollectionResource(keys)
+        users = [CollectionPreference(name, vals) for name in ['mark', 'john', 'anna']]
+
+        algorithm = EnvyCycleElimination(users, cake)
+        self.assertEqual(True, algorithm.is_valid())
+        self.assertEqual(True, algorithm.settings()['discrete'])
+
+    def test_division(self):
+        ''' test that the algorithm divides correctly '''
+        random.seed(42)
+        for trial in xrange(50):
+            keys  = ['item%d' % i for i in xrange(random.randint(1, 12))]
+            cake  = CollectionResource(keys)
+            users = [CollectionPreference('user%d' % n,
+                dict((k, random.choice([0, 1, 2, 5])) for k in keys))
+                for n in xrange(random.randint(1, 5))]
+
+            slices = EnvyCycleElimination(users, cake).divide()
+            items  = sorted(p.value[0] for pieces in slices.values() for p in pieces)
+            self.assertEqual(sorted(keys), items)
+            self.assertEqual(set(users), set(slices.keys()))
+            self.assertTrue(self.is_envy_free_up_to_one(users, slices))
+
+    def test_division_exact(self):
+        ''' test that the algorithm divides exact values correctly '''
+        random.seed(7)
+        for trial in xrange(20):
+            keys  = ['item%d' % i for i in xrange(random.randint(1, 10))]
+            cake  = CountedResource(dict((k, 1) for k in keys))
+            users = [CountedPreference('user%d' % n,
+                dict((k, F(random.randint(0, 6), 7)) for k in keys))
+                for n in xrange(random.randint(1, 4))]
+
+            slices = EnvyCycleElimination(users, cake).divide()
+            items  = sorted(k for pieces in slices.values() for p in pieces for k in p.value)
+            self.assertEqual(sorted(keys), items)
+            self.assertTrue(self.is_envy_free_up_to_one(users, slices))
+
+    def test_envy_graph(self):
+        ''' test that the envy graph rotates its cycles '''
+        graph = EnvyGraph(2)
+        graph.add(0, [1.0, 3.0])                            # user 1 envies user 0
+        self.assertEqual([1], graph.unenvied().tolist())
+        graph.add(1, [2.0, 1.0])                            # user 0 envies user 1
+        self.assertEqual([], graph.unenvied().tolist())
+        self.assertEqual([0, 1], sorted(graph.find_cycle()))
+        graph.rotate(graph.find_cycle())
+        self.assertEqual([1, 0], graph.owner.tolist())
+        self.assertEqual([2.0, 3.0], graph.own_values().tolist())
+        self.assertEqual([0, 1], graph.unenvied().tolist())
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+import unittest
+from fractions import Fraction
+from cakery.preference import ContinuousPreference, IntervalPreference
+from cakery.resource import ContinuousResource, IntervalResource
+from cakery.algorithms import EvenPaz
+
+class EvenPazTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.algorithm.EvenPaz
+    '''
+
+    def test_initializes(self):
+        ''' test that the algorithm initializes correctly '''
+        cake  = ContinuousResource(Fraction(0,1), Fraction(1,1))
+        pref  = lambda x: 1
+        users = [ContinuousPreference(name, pref) for name in ['mark', 'john']]
+
+        algorithm = EvenPaz(users, cake)
+        self.assertEqual(True, algorithm.is_valid())
+        self.assertEqual(None, algorithm.processes)
+        self.assertEqual(True, algorithm.settings()['proportional'])
+
+    def test_division(self):
+        ''' test that the algorithm divides correctly '''
+        cake  = ContinuousResource(Fraction(0,1), Fraction(1,1))
+        pref  = lambda x: 1
+        names = ['mark', 'john', 'anna', 'sara', 'bill']
+        users = [ContinuousPreference(name, pref) for name in names]
+
+        algorithm = EvenPaz(users, cake)
+        divisions = algorithm.divide()
+        self.assertEqual(set(users), set(divisions.keys()))
+        for user, piece in divisions.items():
+            self.assertEqual(Fraction(1,5), user.value_of(piece))
+
+    def test_parallel_division(self):
+        ''' test that the algorithm divides correctly in parallel '''
+        cake  = IntervalResource((Fraction(0), Fraction(1)))
+        users = [
+            IntervalPreference('mark', [(Fraction(0), Fraction(2)), (Fraction(1), Fraction(0))]),
+            IntervalPreference('john', [(Fraction(0), Fraction(0)), (Fraction(1), Fraction(2))]),
+            IntervalPreference('anna', [(Fraction(0), Fraction(1)), (Fraction(1), Fraction(1))]),
+            IntervalPreference('sara', [(Fraction(0), Fraction(1)), (Fraction(1), Fraction(1))]),
+        ]
+
+        algorithm = EvenPaz(users, cake, processes=2)
+        divisions = algorithm.divide()
+        self.assertEqual(set(users), set(divisions.keys()))
+        for user, piece in divisions.items():
+            self.assertTrue(user.value_of(piece) >= user.value_of(cake) / 4)
+
+        pieces = [divisions[user] for user in users]
+        total  = sum(users[2].value_of(piece) for piece in pieces)
+        self.assertEqual(users[2].value_of(cake), total)
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
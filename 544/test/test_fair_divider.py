@@ -4,6 +4,7 @@ from fractions import Fraction as F
 from cakery.preference import ContinuousPreference as Preference
 from cakery.resource import ContinuousResource as Resource
 from cakery.algorithms import DubinsSpanier as Algorithm
+from cakery.algorithms.common import DivisionReport
 
 class DivideAndChooseTest(unittest.TestCase):
     '''
@@ -59,6 +60,31 @@ class DivideAndChooseTest(unittest.TestCase):
         result = self.fair.is_envy_free(self.shares)
         self.assertFalse(result)
 
+    def test_report(self):
+        ''' test that the report method works correctly '''
+        self.cakes[2].value = (F(0,1), F(1,9))
+        report = self.fair.report(self.shares)
+        self.assertEqual((3, 3), report.values.shape)
+        self.assertEqual(F(1,9), report.value_of(self.users[2]))
+        self.assertEqual(F(2,9), report.max_envy)
+        self.assertEqual(F(7,9), report.utilitarian_welfare)
+        self.assertEqual(F(1,9), report.egalitarian_welfare)
+        self.assertFalse(report.is_envy_free)
+        self.assertFalse(report.is_equitable)
+        self.assertFalse(report.is_proportional)
+
+        report = self.fair.report(self.shares, tolerance=F(1,4))
+        self.assertTrue(report.is_envy_free)
+        self.assertTrue(report.is_equitable)
+        self.assertTrue(report.is_proportional)
+
+    def test_division_report(self):
+        ''' test that the report defaults its fair share '''
+        report = DivisionReport(self.shares)
+        self.assertTrue(report.is_proportional)
+        self.assertEqual(0, report.max_envy)
+        self.assertEqual(True, report.summary()['envy-free'])
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
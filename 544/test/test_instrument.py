@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+import threading
+import unittest
+from fractions import Fraction as F
+from cakery.instrument import QueryCounter, instrument
+from cakery.preference import IntervalPreference, CollectionPreference
+from cakery.resource import IntervalResource, CollectionResource
+from cakery.algorithms import DivideAndChoose, AlternatingChoice
+
+class InstrumentTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.instrument queries
+    '''
+
+    def test_query_counter(self):
+        ''' test that the query counter works correctly '''
+        counter = QueryCounter()
+        self.assertEqual(F(1, 3), counter.query('eval', lambda: F(1, 3)))
+        self.assertEqual(1, counter.query('cut', lambda: counter.query('eval', lambda: 1)))
+        self.assertEqual([1, 2], counter.query('eval', lambda: [1, 2], count=2))
+        summary = counter.summary()
+        self.assertEqual(3, summary['eval'])
+        self.assertEqual(1, summary['cut'])
+        self.assertEqual(1, summary['internal'])
+        self.assertEqual(2, summary['max denominator bits'])
+
+    def test_instrument_continuous(self):
+        ''' test that the cut queries are counted '''
+        users = [IntervalPreference(None, [(F(0), F(1)), (F(1), F(1))]) for _ in range(2)]
+        cake  = IntervalResource((F(0), F(1)))
+        divider = instrument(DivideAndChoose(users, cake))
+        self.assertEqual(0, divider.queries.counts['cut'])
+        divider.divide()
+        self.assertEqual(1, divider.queries.counts['cut'])
+        self.assertEqual(3, divider.queries.counts['eval'])
+        self.assertTrue(divider.queries.summary()['max denominator bits'] > 0)
+        self.assertFalse('value_of' in users[0].__dict__)
+
+    def test_instrument_discrete(self):
+        ''' test that the eval queries are counted '''
+        cake  = CollectionResource(['a', 'b', 'c', 'd'])
+        users = [
+            CollectionPreference('mark', {'a':1, 'b':2, 'c':3, 'd':4}),
+            CollectionPreference('john', {'a':4, 'b':3, 'c':2, 'd':1}),
+        ]
+        divider = instrument(AlternatingChoice(users, cake))
+        divider.divide()
+        self.assertEqual(8, divider.queries.counts['eval'])
+        self.assertEqual(0, divider.queries.counts['cut'])
+
+    def test_instrument_threads(self):
+        ''' test that concurrent instrumented divisions are counted '''
+        find_piece  = IntervalResource.__dict__['find_piece']
+        find_pieces = IntervalResource.__dict__['find_pieces']
+        dividers = []
+        for _ in range(8):
+            users = [IntervalPreference(None, [(F(0), F(1)), (F(1), F(1))]) for _ in range(2)]
+            dividers.append(instrument(DivideAndChoose(users, IntervalResource((F(0), F(1))))))
+        threads = [threading.Thread(target=divider.divide) for divider in dividers]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual([1] * 8, [divider.queries.counts['cut'] for divider in dividers])
+        self.assertTrue(IntervalResource.__dict__['find_piece'] is find_piece)
+        self.assertTrue(IntervalResource.__dict__['find_pieces'] is find_pieces)
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -47,6 +47,7 @@ class InterfacesTest(unittest.TestCase):
         self.assertRaises(NotImplementedError, lambda: cake.find_piece(user, size))
         self.assertRaises(AttributeError, lambda: cake.compare(item))
         self.assertRaises(NotImplementedError, lambda: cake.as_collection())
+        self.assertRaises(NotImplementedError, lambda: cake.snapshot())
 
 #---------------------------------------------------------------------------#
 # Main
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 import os
+import shutil
+import tempfile
 import unittest
+import numpy as np
 from fractions import Fraction as F
 from cakery.resource import IntervalResource
-from cakery.preference import IntervalPreference
+from cakery.preference import IntervalPreference, load_preferences
 from cakery.algorithms.utilities import create_equal_pieces
 
 class IntervalResourceTest(unittest.TestCase):
@@ -34,6 +37,44 @@ class IntervalResourceTest(unittest.TestCase):
         for user in users:
             self.assertEqual(1.0, user.value_of(cake))
 
+    def test_preference_table(self):
+        ''' test that the preferences can be loaded from a table '''
+        path  = os.path.join(os.path.abspath('contrib'), 'data')
+        path  = os.path.join(path, 'table', 'interval.csv')
+        users = IntervalPreference.from_table(path)
+        cake  = IntervalResource((F(0,1), F(1,2)))
+        self.assertEqual(['uniform', 'triangle-hill', 'triangle-valley', 'ascending', 'descending'],
+            [user.user for user in users])
+        self.assertEqual([F(1,2), F(1,2), F(1,2), F(1,4), F(3,4)],
+            [user.value_of(cake) for user in users])
+
+        folder = tempfile.mkdtemp()
+        try:
+            table = os.path.join(folder, 'table.npz')
+            np.savez(table, user=['mark', 'mark', 'john', 'john'],
+                x=[0.0, 1.0, 0.0, 1.0], y=[1.0, 1.0, 0.0, 1.0])
+            users = load_preferences(table)
+            self.assertEqual(['mark', 'john'], [user.user for user in users])
+            self.assertEqual([F(1,2), F(1,4)], [user.value_of(cake) for user in users])
+
+            table = os.path.join(folder, 'table.npy')
+            rows  = [('mark', 0.0, 0.0), ('mark', 1.0, 1.0)]
+            np.save(table, np.array(rows, dtype=[('user', 'S8'), ('x', 'f8'), ('y', 'f8')]))
+            self.assertEqual(F(1,4), load_preferences(table)[0].value_of(cake))
+        finally: shutil.rmtree(folder)
+
+    def test_preference_value_of_many(self):
+        ''' test that the preference can value many pieces at once '''
+        user  = IntervalPreference('user', [(F(0), F(0)), (F(1), F(1))])
+        cakes = [
+            IntervalResource((F(0,1), F(1,2))),
+            IntervalResource([(F(0,1), F(1,4)), (F(1,2), F(1,1))]),
+            IntervalResource.empty(),
+        ]
+        actual = user.value_of_many(cakes)
+        self.assertEqual([F(1,4), F(13,16), 0], actual)
+        self.assertEqual([user.value_of(c) for c in cakes], actual)
+
     def test_resource_clone(self):
         ''' test that the resource clones correctly '''
         cake = IntervalResource((F(0,1), F(1,1)))
@@ -47,6 +88,14 @@ class IntervalResourceTest(unittest.TestCase):
         self.assertEqual(1, cake.actual_value(),)
         self.assertEqual(cake.actual_value(), copy.actual_value())
 
+        # clones share the ranges until one of them is modified
+        copy = cake.clone()
+        self.assertTrue(cake.value is copy.value)
+        cake.remove(IntervalResource((F(0,1), F(1,2))))
+        self.assertEqual([(F(1,2), F(1,1))], cake.value)
+        self.assertEqual([(F(0,1), F(1,1))], copy.value)
+        self.assertFalse(IntervalResource(copy.value).value is copy.value)
+
     def test_resource_remove(self):
         ''' test that the resource remove works correctly '''
         cake = IntervalResource((F(0,1), F(1,1)))
@@ -109,6 +158,23 @@ class IntervalResourceTest(unittest.TestCase):
         self.assertEqual(actual.value, cake.value)
         self.assertEqual(F(1, 2), cake.actual_value())
 
+    def test_resource_fragments(self):
+        ''' test that the resource handles many fragments '''
+        cake   = IntervalResource((F(0,1), F(1,1)))
+        pieces = [IntervalResource((F(i, 2000), F(i + 1, 2000))) for i in range(0, 2000, 2)]
+        for piece in pieces: cake.remove(piece)
+        self.assertEqual(1000, len(cake.value))
+        self.assertEqual(F(1, 2), cake.actual_value())
+        for piece in reversed(pieces): cake.append(piece)
+        self.assertEqual([(F(0,1), F(1,1))], cake.value)
+
+    def test_resource_snapshot(self):
+        ''' test that the resource snapshot works correctly '''
+        cake = IntervalResource([(F(0,1), F(1,2)), (F(1,2), F(1,1)), (F(1,1), F(1,1))])
+        self.assertEqual(IntervalResource((F(0,1), F(1,1))).snapshot(), cake.snapshot())
+        self.assertEqual(((F(0,1), F(1,1)),), cake.snapshot().value)
+        self.assertEqual(IntervalResource, cake.snapshot().kind)
+
     def test_resource_create_pieces(self):
         ''' test that we can create n pieces of the cake '''
         user = IntervalPreference('user', [(0.0, 1.0), (1.0, 1.0)])
@@ -141,6 +207,49 @@ class IntervalResourceTest(unittest.TestCase):
 
         self.assertRaises(ValueError, lambda: cake.find_piece(user, F(10)))
 
+    def test_resource_find_piece_exactly(self):
+        ''' test that piecewise linear cuts are solved exactly '''
+        user = IntervalPreference('user', [(F(0), F(0)), (F(1), F(2))])
+        cake = IntervalResource((F(0,1), F(1,1)))
+        piece = cake.find_piece(user, F(1,4))
+        self.assertEqual(piece.value, [(F(0,1), F(1,2))])
+
+        cake = IntervalResource([(F(0,1), F(1,4)), (F(1,2), F(1,1))])
+        piece = cake.find_piece(user, F(37,64))
+        self.assertEqual(piece.value, [(F(0,1), F(1,4)), (F(1,2), F(7,8))])
+        self.assertEqual(F(37,64), user.value_of(piece))
+
+    def test_resource_find_pieces(self):
+        ''' test that we can find many pieces in one walk '''
+        user = IntervalPreference('user', [(F(0), F(0)), (F(1), F(2))])
+        cake = IntervalResource([(F(0,1), F(1,4)), (F(1,2), F(1,1))])
+        pieces = cake.find_pieces(user, [F(3,8), F(7,16)])
+        self.assertEqual([p.value for p in pieces], [
+            [(F(0,1), F(1,4)), (F(1,2), F(3,4))], [(F(3,4), F(1,1))]])
+
+        pieces = cake.find_pieces(user, [F(1,16), F(5,16), F(7,16)])
+        self.assertEqual([p.value for p in pieces], [
+            [(F(0,1), F(1,4))], [(F(1,2), F(3,4))], [(F(3,4), F(1,1))]])
+        for piece in create_equal_pieces(user, cake, 3):
+            self.assertAlmostEqual(13.0 / 48, float(user.value_of(piece)))
+        self.assertRaises(ValueError, lambda: cake.find_pieces(user, [F(1,2), F(1,2)]))
+
+        user = IntervalPreference('user', [(0.0, 1.0), (1.0, 1.0)])
+        cake = IntervalResource([(0.0, 0.25), (0.5, 0.75), (0.80, 1.0)])
+        user = IntervalPreference('user', [(0.0, 1.0), (0.5, 3.0), (1.0, 2.0)])
+        cake = IntervalResource([(0.1, 0.4), (0.7, 0.9)])
+        weight = user.value_of(IntervalResource((0.1, 0.4)))
+        pieces = create_equal_pieces(user, cake, 2, weight)   # the cut is on the gap
+        self.assertEqual([(0.1, 0.4)], pieces[0].value)
+        self.assertEqual([(0.7, 0.9)], pieces[1].value)
+
+        user = IntervalPreference('user', [(0.0, 1.0), (1.0, 1.0)])
+        cake = IntervalResource([(0.0, 0.25), (0.5, 0.75), (0.80, 1.0)])
+        first, second = cake.find_pieces(user, [0.3, 0.3])
+        self.assertEqual(first, cake.find_piece(user, 0.3))
+        self.assertEqual((0.55, 0.75), second.value[0])
+        self.assertAlmostEqual(0.9, second.value[1][1])
+
     def test_resource_as_collection(self):
         ''' test that we can convert a resource to a collection '''
         cake = IntervalResource((F(0), F(1)), resolution=5)
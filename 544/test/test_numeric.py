@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import unittest
+from fractions import Fraction as F
+from cakery.numeric import ExactBackend, FloatBackend
+from cakery.numeric import get_backend, set_backend, using
+from cakery.preference import IntervalPreference, ContinuousPreference
+from cakery.resource import IntervalResource, ContinuousResource
+from cakery.algorithms import DubinsSpanier
+
+class NumericTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.numeric backends
+    '''
+
+    def test_exact_backend(self):
+        ''' test that the exact backend works correctly '''
+        numeric = ExactBackend()
+        self.assertEqual(F(1, 3), numeric.fraction(1, 3))
+        self.assertEqual(F(1, 1), numeric.number(1))
+        self.assertEqual(0.5, numeric.coerce(0.5))
+        self.assertEqual(F(2, 5), numeric.midpoint(F(1, 2), F(1, 3)))
+        self.assertTrue(numeric.is_close(F(1, 3), F(1, 3)))
+        self.assertFalse(numeric.is_close(F(1, 3), F(1, 4)))
+
+    def test_exact_search(self):
+        ''' test that the exact search methods work correctly '''
+        numeric = ExactBackend(search='dyadic')
+        self.assertEqual(F(5, 12), numeric.midpoint(F(1, 2), F(1, 3)))
+
+        numeric = ExactBackend(search='bounded', limit=10)
+        self.assertEqual(F(2, 5), numeric.midpoint(F(1, 2), F(1, 3)))
+        self.assertEqual(F(21, 200), numeric.midpoint(F(1, 10), F(11, 100)))
+        self.assertRaises(ValueError, lambda: ExactBackend(search='random'))
+
+        numeric = ExactBackend(search='dyadic', iterations=4)
+        point, value = numeric.find_point(lambda x: x, F(0), F(1), F(1), F(1, 3), F(0))
+        self.assertEqual(F(5, 16), point)
+        self.assertEqual(point, value)
+
+        with using(ExactBackend(search='dyadic')):
+            user  = ContinuousPreference('mark', lambda x: 1, resolution=100, exact=True)
+            cake  = ContinuousResource(F(0), F(1))
+            piece = cake.find_piece(user, F(1, 3))
+            self.assertTrue(abs(user.value_of(piece) - F(1, 3)) <= F(1, 100))
+            self.assertEqual(0, piece.value[1].denominator & (piece.value[1].denominator - 1))
+
+    def test_float_backend(self):
+        ''' test that the float backend works correctly '''
+        numeric = FloatBackend(epsilon=1e-6)
+        self.assertEqual(1.0 / 3, numeric.fraction(1, 3))
+        self.assertEqual(0.5, numeric.coerce(F(1, 2)))
+        self.assertEqual(0.75, numeric.midpoint(0.5, 1))
+        self.assertTrue(numeric.is_close(1.0 / 3, 0.3333333))
+        self.assertFalse(numeric.is_close(1.0 / 3, 0.3333))
+
+    def test_using_backend(self):
+        ''' test that the backend can be changed for a block '''
+        original = get_backend()
+        numeric  = FloatBackend()
+        with using(numeric):
+            self.assertEqual(numeric, get_backend())
+            self.assertEqual((0.0, 0.0), ContinuousResource.empty().value)
+        self.assertEqual(original, get_backend())
+        self.assertEqual(original, set_backend(original))
+
+    def test_float_division(self):
+        ''' test that the resources work with the float backend '''
+        with using(FloatBackend(epsilon=1e-9)):
+            user  = IntervalPreference('mark', [(F(0), F(1)), (F(1), F(1))])
+            cake  = IntervalResource((0.0, 1.0))
+            piece = cake.find_piece(user, 0.25)
+            self.assertTrue(isinstance(piece.value[0][1], float))
+            self.assertAlmostEqual(0.25, piece.value[0][1])
+
+            user  = ContinuousPreference('mark', lambda x: 2 * x, resolution=10)
+            self.assertTrue(isinstance(user.total, float))
+
+    def test_divider_tolerance(self):
+        ''' test that the fairness checks honor the tolerance '''
+        users  = [IntervalPreference(None, [(0.0, 1.0), (1.0, 1.0)]) for _ in range(2)]
+        cake   = IntervalResource((F(0), F(1)))
+        slices = {
+            users[0]: IntervalResource((F(0), F(1, 2) - F(1, 10**7))),
+            users[1]: IntervalResource((F(1, 2) - F(1, 10**7), F(1))),
+        }
+        divider = DubinsSpanier(users, cake)
+        self.assertFalse(divider.is_envy_free(slices))
+        self.assertFalse(divider.is_equitable(slices))
+
+        divider.numeric = FloatBackend(epsilon=1e-6)
+        self.assertTrue(divider.is_envy_free(slices))
+        self.assertTrue(divider.is_equitable(slices))
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+import unittest
+import numpy as np
+from fractions import Fraction as F
+from cakery.resource import RectangleResource
+from cakery.preference import GridPreference
+from cakery.algorithms import DubinsSpanier, BanachKnaster
+
+class RectangleResourceTest(unittest.TestCase):
+    '''
+    This is the unittest for the RectangleResource
+    code utilities.
+    '''
+
+    def setUp(self):
+        ''' The common test setup code '''
+        self.user = GridPreference('mark', [[1, 1], [1, 5]])
+        self.cake = RectangleResource((F(0), F(0), F(1), F(1)))
+
+    def test_preference_value_of(self):
+        ''' test that the grid preference values rectangles '''
+        self.assertEqual(1.0, self.user.value_of(self.cake))
+        self.assertEqual(0.125, self.user.value_of(RectangleResource((F(0), F(0), F(1,2), F(1,2)))))
+        self.assertEqual(0.625, self.user.value_of(RectangleResource((F(1,2), F(1,2), F(1), F(1)))))
+        self.assertEqual(0.25, self.user.value_of(RectangleResource((F(1,4), F(1,4), F(3,4), F(3,4)))))
+        self.assertEqual(0.0, self.user.value_of(RectangleResource.empty()))
+        self.assertEqual(0.875, self.user.value_of(RectangleResource(
+            [(F(0), F(0), F(1), F(1,2)), (F(1,2), F(1,2), F(1), F(1))])))
+        self.assertRaises(ValueError, lambda: GridPreference('john', [[1, -1]]))
+
+    def test_resource_clone(self):
+        ''' test that the resource clones correctly '''
+        clone = self.cake.clone()
+        self.assertEqual(self.cake, clone)
+        clone.remove(RectangleResource((F(0), F(0), F(1,2), F(1))))
+        self.assertEqual(1, self.cake.actual_value())
+        self.assertEqual(F(1,2), clone.actual_value())
+
+    def test_resource_remove(self):
+        ''' test that we can remove a piece of the resource '''
+        cake = self.cake.clone()
+        cake.remove(RectangleResource((F(1,4), F(1,4), F(3,4), F(3,4))))
+        self.assertEqual(F(3,4), cake.actual_value())
+        self.assertEqual(4, len(cake.value))
+        self.assertRaises(ValueError, lambda: cake.remove(
+            RectangleResource((F(0), F(0), F(1,2), F(1,2)))))
+
+    def test_resource_append(self):
+        ''' test that we can append a piece to the resource '''
+        cake = RectangleResource((F(0), F(0), F(1,2), F(1)))
+        cake.append(RectangleResource((F(1,4), F(0), F(1), F(1))))
+        self.assertEqual([(F(0), F(0), F(1), F(1))], cake.value)
+        cake.append(RectangleResource((F(0), F(1), F(1), F(2))))
+        self.assertEqual([(F(0), F(0), F(1), F(2))], cake.value)
+
+    def test_resource_find_piece(self):
+        ''' test that we can find a piece in the cake '''
+        piece = self.cake.find_piece(self.user, F(1,2))
+        self.assertEqual([(F(0), F(0), F(2,3), F(1))], piece.value)
+        self.assertAlmostEqual(0.5, self.user.value_of(piece))
+
+        cake  = RectangleResource([(0.0, 0.0, 1.0, 0.5), (0.0, 0.5, 0.5, 1.0)], axis=1)
+        piece = cake.find_piece(self.user, 0.3)
+        self.assertEqual([(0.0, 0.0, 1.0, 0.5), (0.0, 0.5, 0.5, 0.7)], piece.value)
+        self.assertRaises(ValueError, lambda: cake.find_piece(self.user, 0.9))
+
+    def test_resource_as_collection(self):
+        ''' test that we can convert a resource to a collection '''
+        pieces = RectangleResource((F(0), F(0), F(1), F(1)), resolution=4).as_collection()
+        self.assertEqual(4, len(pieces))
+        self.assertEqual((F(1,4), F(0), F(1,2), F(1)), pieces[1].value[0])
+
+    def test_division(self):
+        ''' test that the algorithms divide the land correctly '''
+        users = [
+            GridPreference('mark', [[1, 1], [1, 5]]),
+            GridPreference('john', [[5, 1], [1, 1]]),
+            GridPreference('anna', [[1, 2, 3], [4, 5, 6]]),
+        ]
+        for algorithm in [DubinsSpanier, BanachKnaster]:
+            divisions = algorithm(users, self.cake).divide()
+            self.assertEqual(1, sum(piece.actual_value() for piece in divisions.values()))
+            for user, piece in divisions.items():
+                self.assertTrue(user.value_of(piece) >= F(1,3) - 1e-9)
+
+    def test_division_is_valid(self):
+        ''' test that random grids see unit value on the whole land '''
+        np.random.seed(42)
+        for trial in xrange(50):
+            users = [GridPreference.random(3, 4) for _ in xrange(3)]
+            algorithm = DubinsSpanier(users, self.cake)
+            self.assertTrue(algorithm.is_valid())
+            self.assertEqual([1.0] * 3, [u.value_of(self.cake) for u in users])
+            divisions = algorithm.divide()
+            self.assertEqual(set(users), set(divisions.keys()))
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+import sys
+import unittest
+import subprocess
+from fractions import Fraction as F
+from cakery.resource import CollectionResource, IntervalResource
+import cakery.algorithms
+from cakery.algorithms.registry import registry, get_algorithm, get_capabilities
+from cakery.algorithms.registry import find_algorithms, select_algorithm
+
+class RegistryTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.algorithms.registry
+    '''
+
+    def test_capabilities(self):
+        ''' test that the capabilities match each algorithm '''
+        for name in registry:
+            factory = get_algorithm(name)
+            self.assertEqual(name, factory.__name__)
+            self.assertEqual(factory.capabilities, get_capabilities(name), name)
+            self.assertTrue(getattr(cakery.algorithms, name) is factory)
+        self.assertRaises(ValueError, lambda: get_algorithm('MissingAlgorithm'))
+        self.assertRaises(ValueError, lambda: get_capabilities('MissingAlgorithm'))
+        self.assertFalse(hasattr(cakery.algorithms, 'MissingAlgorithm'))
+
+    def test_lazy_selection(self):
+        ''' test that the selector does not import the algorithms '''
+        script = ("import sys; from cakery.algorithms import find_algorithms, registry; "
+            "find_algorithms(4, 'continuous', ['proportional']); "
+            "print [e.module for e in registry.values() if e.module in sys.modules]")
+        output = subprocess.check_output([sys.executable, '-c', script])
+        self.assertEqual('[]', output.strip())
+
+    def test_find_algorithms(self):
+        ''' test that the eligible algorithms are found correctly '''
+        self.assertEqual([], find_algorithms(5, 'continuous', ['envy-free']))
+        names = find_algorithms(2, 'continuous', ['envy-free'])
+        self.assertFalse('DubinsSpanier' in names)
+        self.assertEqual('DivideAndChoose', names[0])
+        names = find_algorithms(8, 'continuous', ['proportional'])
+        self.assertTrue(names.index('EvenPaz') < names.index('BanachKnaster'))
+        self.assertTrue('LoneChooser' in names)
+        self.assertFalse('DivideAndChoose' in names)
+
+        cake  = CollectionResource(['a', 'b', 'c', 'd'])
+        names = find_algorithms(range(2), cake, ['envy-free'])
+        self.assertEqual('DivideAndChoose', names[0])
+        self.assertFalse('EvenPaz' in find_algorithms(4, cake))
+        self.assertTrue('AlternatingChoice' in find_algorithms(4, cake))
+        self.assertFalse('AlternatingChoice' in find_algorithms(4, 'continuous'))
+        self.assertEqual([], find_algorithms(3, cake, ['optimal']))
+
+    def test_select_algorithm(self):
+        ''' test that the cheapest algorithm is selected '''
+        cake = IntervalResource((F(0), F(1)))
+        self.assertEqual('DivideAndChoose', select_algorithm(2, cake, ['envy-free']).__name__)
+        self.assertEqual('EvenPaz', select_algorithm(16, cake, ['proportional']).__name__)
+        self.assertRaises(ValueError, lambda: select_algorithm(3, cake, ['optimal']))
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
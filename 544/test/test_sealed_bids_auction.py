@@ -1,8 +1,9 @@
 #!/usr/bin/env python
 import unittest
+from fractions import Fraction as F
 from cakery.preference import CollectionPreference
 from cakery.resource import CollectionResource
-from cakery.algorithms import SealedBidsAuction
+from cakery.algorithms import SealedBidsAuction, KnasterSealedBids
 from cakery.algorithms.utilities import get_total_value
 
 class SealedBidsAuctionTest(unittest.TestCase):
@@ -37,6 +38,22 @@ class SealedBidsAuctionTest(unittest.TestCase):
         for user, pieces in divisions.items():
             self.assertEqual(30, get_total_value(user, pieces))
 
+    def test_knaster_division(self):
+        ''' test that the knaster algorithm settles correctly '''
+        cake = CollectionResource(['red', 'blue', 'green'])
+        users = []
+        users.append(CollectionPreference('mark', {'red':F(30), 'blue':F(60), 'green':F(90)}))
+        users.append(CollectionPreference('john', {'red':F(60), 'blue':F(30), 'green':F(60)}))
+        users.append(CollectionPreference('anna', {'red':F(30), 'blue':F(30), 'green':F(30)}))
+
+        algorithm = KnasterSealedBids(users, cake)
+        divisions, payments = algorithm.divide()
+        self.assertEqual(set(users), set(divisions.keys()))
+        self.assertEqual([], divisions[users[2]])
+        self.assertEqual({users[0]: 150, users[1]: 60, users[2]: 0}, payments['assignments'])
+        self.assertEqual(0, sum(payments['settlements'].values()))
+        self.assertEqual(F(70, 3), payments['surplus'])
+
 
 #---------------------------------------------------------------------------#
 # Main
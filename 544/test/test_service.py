@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from StringIO import StringIO
+from cakery.service import DivisionService, create_server
+
+class ServiceTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.service division service
+    '''
+
+    def setUp(self):
+        ''' initializes the test environment '''
+        self.path = os.path.join(os.path.abspath('contrib'), 'data')
+
+    def test_divide(self):
+        ''' test that a single request is divided correctly '''
+        service = DivisionService()
+        paths   = [os.path.join(self.path, 'collection', name) for name in ['bidding1', 'bidding2']]
+        record  = service.divide({'id': 1, 'algorithm': 'AlternatingChoice', 'users': paths})
+        self.assertEqual(None, record['error'])
+        self.assertEqual(1, record['id'])
+        self.assertEqual(set(['bidding1', 'bidding2']), set(record['shares'].keys()))
+        self.assertTrue(record['envy-free'] in (True, False))
+
+        users = service.get_users({'users': paths})
+        self.assertTrue(users[0] is service.get_users({'users': paths})[0])
+
+        record = service.divide({'algorithm': 'AlternatingChoice',
+            'table': {'user': ['a', 'b'], 'item': ['x', 'y'], 'value': [1, 2]}})
+        self.assertEqual({'a': ['x'], 'b': ['y']}, dict((k, v[0].value)
+            for k, v in record['shares'].items()))
+
+        record = service.divide({'algorithm': 'MissingAlgorithm', 'users': paths})
+        self.assertTrue(record['error'].startswith('ValueError'))
+        record = service.divide({'algorithm': 'AlternatingChoice'})
+        self.assertTrue(record['error'].startswith('ValueError'))
+        for name in ['get_algorithm', 'registry', 'utilities']:
+            record = service.divide({'algorithm': name, 'users': paths})
+            self.assertTrue(record['error'].startswith('ValueError'))
+
+    def test_divide_concurrently(self):
+        ''' test that concurrent seeded requests are repeatable '''
+        service = DivisionService()
+        table   = os.path.join(self.path, 'table', 'interval.csv')
+        request = {'algorithm': 'DubinsSpanier', 'table': table, 'seed': 42}
+        expected = service.divide(request)['shares']
+        records  = []
+        def divide(seed):
+            records.append((seed, service.divide(dict(request, seed=seed))))
+        threads = [threading.Thread(target=divide, args=(seed,)) for seed in [42, 7] * 4]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        shares = [record['shares'] for seed, record in records if seed == 42]
+        self.assertEqual([expected] * 4, shares)
+
+    def test_serve(self):
+        ''' test that the requests are streamed correctly '''
+        table   = os.path.join(self.path, 'table', 'interval.csv')
+        request = {'algorithm': 'DubinsSpanier', 'table': table, 'seed': 42}
+        lines   = [json.dumps(dict(request, id=1)), '',
+            json.dumps([dict(request, id=2), dict(request, id=3), 4]), 'invalid']
+        output  = StringIO()
+        DivisionService().serve(StringIO("\n".join(lines)), output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([1, 2, 3, None, None], [r['id'] for r in records])
+        self.assertEqual([None] * 3, [r['error'] for r in records[:3]])
+        self.assertEqual(records[0]['shares'], records[1]['shares'])
+        self.assertEqual(5, len(records[0]['shares']))
+
+    def test_create_server(self):
+        ''' test that the requests are served over a socket '''
+        directory = tempfile.mkdtemp()
+        server = create_server(os.path.join(directory, 'service.sock'))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(server.server_address)
+            stream = client.makefile('rw')
+            stream.write(json.dumps({'id': 7, 'algorithm': 'AlternatingChoice',
+                'table': os.path.join(self.path, 'table', 'bidding.csv')}) + "\n")
+            stream.flush()
+            record = json.loads(stream.readline())
+            client.close()
+            self.assertEqual(7, record['id'])
+            self.assertEqual(3, len(record['shares']))
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(directory)
+
+    def test_create_server_existing_file(self):
+        ''' test that only a stale socket is replaced '''
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'data.csv')
+            with open(path, 'w') as handle:
+                handle.write('user,item,value\n')
+            self.assertRaises(ValueError, create_server, path)
+            with open(path) as handle:
+                self.assertEqual('user,item,value\n', handle.read())
+
+            path = os.path.join(directory, 'service.sock')
+            create_server(path).server_close()      # leaves a stale socket behind
+            server = create_server(path)
+            server.server_close()
+        finally: shutil.rmtree(directory)
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
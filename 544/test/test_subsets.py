@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+import unittest
+from fractions import Fraction as F
+from cakery.subsets import methods, choose_method, find_subset
+from cakery.resource import CountedResource, CollectionResource
+from cakery.preference import CountedPreference, CollectionPreference
+
+class SubsetsTest(unittest.TestCase):
+    '''
+    This is the unittest for the cakery.subsets engine
+    '''
+
+    def setUp(self):
+        ''' The common test setup code '''
+        self.items = [('a', 10, 1), ('b', 20, 1), ('c', 30, 1), ('d', 15, 1), ('e', 25, 1)]
+
+    def test_methods(self):
+        ''' test that every method finds an exact subset '''
+        values = dict((k, v) for k, v, _ in self.items)
+        for name in ['brute', 'split', 'exact', 'approx']:
+            method = methods[name]
+            for target in [35, 50, 60, 70, 100]:
+                error, counts = method(self.items, target)
+                total = sum(values[k] * c for k, c in counts.items())
+                self.assertEqual(0, error, name)
+                self.assertEqual(target, total, name)
+
+    def test_closest(self):
+        ''' test that the closest subset is found when inexact '''
+        items = [('a', F(1, 3), 1), ('b', F(1, 3), 1), ('c', F(1, 3), 1)]
+        for method in ['brute', 'split', 'exact']:
+            error, counts = find_subset(items, F(1, 2), method)
+            self.assertEqual(F(1, 6), error)
+            self.assertEqual(1, sum(counts.values()))
+        self.assertRaises(ValueError, lambda: find_subset(items, 1, 'magic'))
+
+    def test_multiplicities(self):
+        ''' test that bounded multiplicities are honored '''
+        items = [('a', 3, 5), ('b', 7, 2)]
+        for method in ['brute', 'split', 'exact', 'approx']:
+            error, counts = find_subset(items, 29, method)
+            self.assertEqual(0, error, method)
+            self.assertTrue(counts.get('a', 0) <= 5 and counts.get('b', 0) <= 2)
+            self.assertEqual(29, 3 * counts.get('a', 0) + 7 * counts.get('b', 0))
+
+    def test_approx_improves_greedy(self):
+        ''' test that the FPTAS is used when the greedy fill is poor '''
+        items = [('a', 6, 1), ('b', 5, 1), ('c', 5, 1)]
+        self.assertEqual(1, find_subset(items, 10, 'greedy')[0])
+        self.assertEqual((0, {'b': 1, 'c': 1}), find_subset(items, 10, 'approx'))
+
+    def test_greedy(self):
+        ''' test that the greedy method stays within its bound '''
+        items = [(i, F(1, i + 1), 1) for i in range(500)]
+        error, counts = find_subset(items, F(3, 2), 'greedy')
+        self.assertTrue(error <= F(1, 500))
+        self.assertTrue(len(counts) > 0)
+
+    def test_choose_method(self):
+        ''' test that the method is chosen by input size '''
+        self.assertEqual('brute', choose_method(self.items, 50))
+        items = [(i, i, 1) for i in range(1, 30)]
+        self.assertEqual('split', choose_method(items, 50))
+        items = [(i, i, 1) for i in range(1, 200)]
+        self.assertEqual('exact', choose_method(items, 50))
+        items = [(i, i / 7.0, 1) for i in range(1, 2000)]
+        self.assertEqual('approx', choose_method(items, 5000))
+
+    def test_large_collection(self):
+        ''' test that large discrete resources can be split '''
+        keys = ['item%d' % i for i in range(200)]
+        vals = dict((k, F(i + 1, 20100)) for i, k in enumerate(keys))
+        cake = CollectionResource(keys)
+        user = CollectionPreference('mark', vals)
+        piece = cake.find_piece(user, F(1, 3))
+        self.assertEqual(F(1, 3), user.value_of(piece))
+
+    def test_counted_repeats(self):
+        ''' test that counted resources use the repeated items '''
+        cake = CountedResource({'red': 4, 'blue': 2})
+        user = CountedPreference('mark', {'red': 1, 'blue': 3}, {'red': 3, 'blue': 2})
+        piece = cake.find_piece(user, 8)
+        self.assertEqual(8, user.value_of(piece))
+        self.assertTrue(piece.value.get('red', 0) <= 3)
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
+import math
 import unittest
+import numpy as np
 from random import randint
 from fractions import Fraction
 from cakery.utilities import integrate, powerset
 from cakery.utilities import all_same, any_range
-from cakery.utilities import all_unique, memoize
+from cakery.utilities import all_unique, memoize, LRUCache
+from cakery.utilities import integer_root, square_root
 
 class UtilitiesTest(unittest.TestCase):
     '''
@@ -23,6 +26,34 @@ class UtilitiesTest(unittest.TestCase):
         self.assertEqual(25, int(integrate(lambda x: 2*x, 0.0, 5.0, 100)))
         self.assertEqual(41, int(integrate(lambda x: x*x, 0.0, 5.0, 100)))
 
+    def test_integrate_rules(self):
+        ''' test that the integrate rules work correctly '''
+        function = lambda x: 3*x*x + 2*x + 1
+        self.assertAlmostEqual(3.0, integrate(function, 0.0, 1.0, 10, 'simpson'))
+        self.assertAlmostEqual(3.0, integrate(function, 0.0, 1.0, 3, 'gauss'))
+        self.assertAlmostEqual(2.0, integrate(math.sin, 0.0, math.pi, 4, tolerance=1e-10))
+        self.assertEqual(Fraction(3), integrate(function, Fraction(0), Fraction(1), 10, 'simpson'))
+        self.assertRaises(ValueError, integrate, function, 0.0, 1.0, 10, 'unknown')
+
+    def test_integrate_scalar_fallback(self):
+        ''' test that integrate works with scalar only functions '''
+        scalar = lambda x: float(x) ** 2                    # fails on arrays
+        vector = lambda x: x ** 2
+        for rule in ['trapezoid', 'simpson', 'gauss']:
+            self.assertAlmostEqual(integrate(vector, 0.0, 2.0, 20, rule),
+                                   integrate(scalar, 0.0, 2.0, 20, rule))
+
+        reduced = lambda x: np.float64(np.sum(x))             # a scalar for any input
+        self.assertAlmostEqual(2.0, integrate(reduced, 0.0, 2.0, 20))
+
+    def test_square_root(self):
+        ''' test that the square root methods work correctly '''
+        self.assertEqual([0, 1, 1, 1, 2, 2], [integer_root(v) for v in range(6)])
+        self.assertEqual(10**200, integer_root(10**400 + 1))
+        self.assertEqual(10**200 - 1, integer_root(10**400 - 1))
+        self.assertEqual(Fraction(3, 7), square_root(Fraction(9, 49)))
+        self.assertAlmostEqual(2 ** 0.5, float(square_root(Fraction(2))))
+
     def test_any_range(self):
         ''' test that the any_range method works correctly '''
         actual = list(any_range(Fraction(0), Fraction(4,3), Fraction(1,3)))
@@ -50,6 +81,25 @@ class UtilitiesTest(unittest.TestCase):
         self.assertEqual(nextrand(3, 100), nextrand(3, 100))
         self.assertNotEqual(nextrand(3, 100), nextrand(2, 100))
 
+        nextrand = memoize(randint, size=1)
+        self.assertEqual(nextrand(2, 100), nextrand(2, 100))
+
+    def test_lru_cache(self):
+        ''' test that the lru cache works correctly '''
+        cache = LRUCache(2)
+        cache['a'], cache['b'] = 1, 2
+        self.assertEqual(1, cache.get('a'))
+        cache['c'] = 3
+        self.assertEqual(2, len(cache))
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertEqual(None, cache.get('b'))
+        self.assertRaises(KeyError, lambda: cache['b'])
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertRaises(ValueError, lambda: LRUCache(0))
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
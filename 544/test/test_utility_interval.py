@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 import unittest
 from fractions import Fraction
-from cakery.utilities import Interval
+from cakery.utilities import Interval, IntervalIndex, IntervalSet
 
 
 class IntervalTest(unittest.TestCase):
@@ -37,6 +37,70 @@ class IntervalTest(unittest.TestCase):
         interval  = Interval.create(intervals)[-1]
         self.assertEqual("(0.5, 0.5) - (1, 0)", str(interval))
 
+    def test_index(self):
+        ''' test that the cumulative index works correctly '''
+        points    = [(0, 0), (Fraction(1, 2), 1), (1, 1)]
+        intervals = Interval.create(points)
+        index     = IntervalIndex(intervals)
+        self.assertEqual(Fraction(3, 4), index.total)
+        self.assertEqual(0, index.cumulative(-1))
+        self.assertEqual(Fraction(1, 4), index.cumulative(Fraction(1, 2)))
+        self.assertEqual(Fraction(3, 4), index.cumulative(2))
+        self.assertEqual(0, index.area(Fraction(3, 4), Fraction(1, 4)))
+        for a, b in [(0, 1), (Fraction(1, 4), Fraction(3, 4)), (Fraction(3, 5), 1)]:
+            expect = sum(i.area(a, b) for i in intervals)
+            self.assertEqual(expect, index.area(a, b))
+
+    def test_inverse(self):
+        ''' test that the cumulative index can be inverted '''
+        interval = Interval((0, 0), (1, Fraction(2)))
+        self.assertEqual(Fraction(1, 2), interval.find(Fraction(1, 4)))
+        self.assertEqual(0, interval.find(0))
+        self.assertEqual(1, interval.find(2))
+
+        points    = [(0, 0), (Fraction(1, 2), 1), (1, 1)]
+        index     = IntervalIndex(Interval.create(points))
+        self.assertEqual(0, index.inverse(0))
+        self.assertEqual(1, index.inverse(1))
+        self.assertEqual(Fraction(1, 2), index.inverse(Fraction(1, 4)))
+        self.assertEqual(Fraction(3, 4), index.inverse(Fraction(1, 2)))
+        for x in [Fraction(1, 8), Fraction(1, 3), Fraction(7, 8)]:
+            self.assertEqual(x, index.inverse(index.cumulative(x)))
+
+    def test_interval_set(self):
+        ''' test that the interval set works correctly '''
+        F = Fraction
+        intervals = IntervalSet([(F(1, 2), F(3, 4)), (F(0), F(1, 4))])
+        self.assertEqual([(0, F(1, 4)), (F(1, 2), F(3, 4))], intervals)
+        self.assertTrue(intervals.covers(F(1, 8), F(1, 4)))
+        self.assertFalse(intervals.covers(F(1, 8), F(1, 2)))
+
+        intervals.add(F(1, 4), F(3, 8))
+        self.assertEqual([(0, F(3, 8)), (F(1, 2), F(3, 4))], intervals)
+        intervals.add(F(1, 3), F(7, 8))
+        self.assertEqual([(0, F(7, 8))], intervals)
+
+        intervals.discard(F(1, 4), F(1, 2))
+        self.assertEqual([(0, F(1, 4)), (F(1, 2), F(7, 8))], intervals)
+        intervals.discard(F(1, 2), F(5, 8))
+        self.assertEqual([(0, F(1, 4)), (F(5, 8), F(7, 8))], intervals)
+
+        self.assertEqual([(0, F(1, 8))], intervals.head(F(1, 8)))
+        self.assertEqual([(0, F(1, 4))], intervals.head(F(1, 2)))
+        self.assertEqual([(0, F(1, 4)), (F(5, 8), F(3, 4))], intervals.head(F(3, 4)))
+        self.assertEqual(intervals, intervals.head(1))
+
+    def test_interval_set_fragments(self):
+        ''' test that the interval set handles many fragments '''
+        intervals = IntervalSet([(0, 1000)])
+        for i in range(0, 1000, 2):
+            intervals.discard(i, i + 1)
+        self.assertEqual(500, len(intervals))
+        self.assertTrue(intervals.covers(999, 1000))
+        for i in range(0, 1000, 2):
+            intervals.add(i, i + 1)
+        self.assertEqual([(0, 1000)], intervals)
+
 
 #---------------------------------------------------------------------------#
 # Main